@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the analysis pipeline on a synthetic result catalog.
+
+The generator resamples real videos from signals_df.parquet (so the
+tier / dataset / fps / duration mix matches the study) and writes result
+JSON in the schema extract_metrics reads. Each stage is timed and its peak
+traced allocation recorded; runs are appended to a JSONL history so
+regressions between commits show up in `benchmark.py compare`.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from process_results import (
+    compute_fps_aggregates, compute_signal_stability, process_all_results, result_filename
+)
+
+HISTORY_PATH = "analysis/benchmark_results.jsonl"
+CATALOG_DIR = "data/bench"
+CHUNK_ROWS = 2000
+REGRESSION_THRESHOLD = 0.10
+
+def plan_catalog(signals: pd.DataFrame, n_files: int, seed: int = 0) -> pd.DataFrame:
+    """Rows of a synthetic catalog: whole real videos resampled until n_files (video, fps) rows"""
+    rng = np.random.default_rng(seed)
+    videos = signals.groupby('video_id', sort=False)
+    groups = [g for _, g in videos]
+    sizes = np.array([len(g) for g in groups])
+
+    # Enough draws to cover n_files on average, topped up if short
+    n_draws = int(np.ceil(n_files / sizes.mean() * 1.1)) + 1
+    draws = rng.integers(0, len(groups), size=n_draws)
+    while sizes[draws].sum() < n_files:
+        draws = np.concatenate([draws, rng.integers(0, len(groups), size=n_draws // 10 + 1)])
+
+    parts = []
+    for k, i in enumerate(draws):
+        part = groups[i].copy()
+        part['video_id'] = f"syn{k:07d}_{part['video_id'].iloc[0]}"
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True).iloc[:n_files]
+
+def synthetic_result(row: Dict[str, Any], rng: np.random.Generator) -> Dict[str, Any]:
+    """One result JSON in the extraction schema, jittered around a real row"""
+
+    def rate(value):
+        return float(value) if np.isfinite(value) and value > 0 else 0.0
+
+    def jitter(value, integer=False):
+        value = rate(value) * rng.lognormal(0, 0.05)
+        return int(round(value)) if integer else value
+
+    n = int(row['frame_count'])
+    duration = float(row['duration'])
+    transitions = int(row['transition_count'])
+
+    return {
+        'video_id': row['video_id'],
+        'fps': float(row['fps']),
+        'frame_count': n,
+        'duration': duration,
+        'scene_signals': {
+            'transitions': np.sort(rng.uniform(0, duration, transitions)).round(3).tolist(),
+            'scene_count': transitions + 1,
+            'transition_count': transitions,
+            'scene_duration_mean': jitter(row['scene_duration_mean']),
+            'scene_duration_std': jitter(row['scene_duration_std']),
+        },
+        'character_signals': {
+            'person_counts': rng.poisson(rate(row['person_count_mean']), n).tolist(),
+            'person_count_mean': jitter(row['person_count_mean']),
+            'person_count_max': int(row['person_count_max']),
+            'character_consistency': min(jitter(row['character_consistency']), 1.0),
+            'entry_exit_total': jitter(row['entry_exit_total'], integer=True),
+        },
+        'visual_signals': {
+            'objects_per_frame': rng.poisson(rate(row['objects_per_frame_mean']), n).tolist(),
+            'unique_object_count': jitter(row['unique_object_count'], integer=True),
+            'persistent_object_count': int(row['persistent_object_count']),
+        },
+        'atmosphere_signals': {
+            'brightness_mean': jitter(row['brightness_mean']),
+            'brightness_std': jitter(row['brightness_std']),
+            'contrast_mean': jitter(row['contrast_mean']),
+            'dominant_colors': ['#%06x' % c for c in rng.integers(0, 0xFFFFFF, int(row['dominant_colors']))],
+        },
+        'action_signals': {
+            'motion_intensity': rng.exponential(max(rate(row['intensity_mean']), 1e-6), n).round(4).tolist(),
+            'intensity_mean': jitter(row['intensity_mean']),
+            'intensity_max': jitter(row['intensity_max']),
+            'peak_count': jitter(row['peak_count'], integer=True),
+        },
+        'temporal_signals': {
+            'change_score_mean': jitter(row['change_score_mean']),
+            'temporal_density': jitter(row['temporal_density']),
+        },
+        'metadata': {
+            'tier': row['tier'],
+            'dataset': row['dataset'],
+            'study_type': row['study_type'],
+            'source_fps': float(row['source_fps']),
+        },
+    }
+
+def _write_chunk(args) -> List[str]:
+    rows, out_dir, seed = args
+    rng = np.random.default_rng(seed)
+    paths = []
+    for row in rows:
+        # Results are keyed by (video_id, fps, study_type), like ResultStore
+        path = Path(out_dir) / row['dataset'] / row['study_type'] / result_filename(row['video_id'], row['fps'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(synthetic_result(row, rng)))
+        paths.append(str(path))
+    return paths
+
+def generate_catalog(n_files: int, out_dir: str, seed: int = 0, workers: int = None,
+                     signals_path: str = "analysis/signals_df.parquet") -> Path:
+    """Write (or reuse) a synthetic catalog of n_files result JSONs"""
+
+    out_dir = Path(out_dir)
+    marker = out_dir / ".catalog"        # not *.json, so the catalog scan never picks it up
+    spec = {'n_files': n_files, 'seed': seed}
+    if marker.exists() and json.loads(marker.read_text()) == spec:
+        return out_dir
+    if out_dir.exists():
+        shutil.rmtree(out_dir)          # partial or older-layout catalog
+
+    plan = plan_catalog(pd.read_parquet(signals_path), n_files, seed)
+    records = plan.to_dict('records')
+    chunks = [(records[i:i + CHUNK_ROWS], str(out_dir), [seed, i])
+              for i in range(0, len(records), CHUNK_ROWS)]
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        written = {path for paths in pool.map(_write_chunk, chunks) for path in paths}
+
+    assert len(written) == n_files, f"{n_files - len(written)} catalog rows overwrote each other"
+    marker.write_text(json.dumps(spec))
+    return out_dir
+
+def measure(fn: Callable, *args, memory: bool = True) -> Dict[str, Any]:
+    """Wall time of one untraced call, then peak traced allocation of a second call"""
+    start = time.perf_counter()
+    result = fn(*args)
+    stats = {'wall_s': time.perf_counter() - start}
+    if memory:
+        tracemalloc.start()
+        fn(*args)
+        stats['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    stats['result'] = result
+    return stats
+
+def run_benchmark(catalog: Path, memory: bool = True) -> Dict[str, Dict[str, float]]:
+    """Time (and memory-profile) each analysis stage over a catalog"""
+    from statistical_analysis import analyze_fps_thresholds, run_anova_tests
+    from summary_cube import SummaryCube
+
+    stages = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        df = cube = None
+        steps = [
+            ('process_all_results', lambda: process_all_results(str(catalog))),
+            ('compute_fps_aggregates', lambda: compute_fps_aggregates(df)),
+            ('compute_signal_stability', lambda: compute_signal_stability(df)),
+            ('build_summary_cube', lambda: SummaryCube.build(df)),
+            ('run_anova_tests', lambda: run_anova_tests(cube, output_dir)),
+            ('analyze_fps_thresholds', lambda: analyze_fps_thresholds(cube, output_dir)),
+        ]
+        for name, step in steps:
+            print(f"\n--- {name} ---", flush=True)
+            stats = measure(step, memory=memory)
+            if name == 'process_all_results':
+                df = stats['result']
+            elif name == 'build_summary_cube':
+                cube = stats['result']
+            stages[name] = {k: v for k, v in stats.items() if k != 'result'}
+    return stages
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {'commit': commit, 'dirty': dirty}
+
+def load_history(path: str = HISTORY_PATH) -> List[Dict[str, Any]]:
+    if not Path(path).exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare_runs(history: List[Dict[str, Any]], threshold: float = REGRESSION_THRESHOLD) -> pd.DataFrame:
+    """Latest vs previous run at each catalog size, per stage"""
+    rows = []
+    by_size = {}
+    for run in history:
+        by_size.setdefault(run['n_files'], []).append(run)
+    for n_files, runs in sorted(by_size.items()):
+        if len(runs) < 2:
+            continue
+        prev, last = runs[-2], runs[-1]
+        for stage, stats in last['stages'].items():
+            before = prev['stages'].get(stage)
+            if before is None:
+                continue
+            change = stats['wall_s'] / before['wall_s'] - 1 if before['wall_s'] else 0.0
+            rows.append({
+                'n_files': n_files,
+                'stage': stage,
+                'before': prev.get('commit'),
+                'after': last.get('commit'),
+                'wall_before_s': before['wall_s'],
+                'wall_after_s': stats['wall_s'],
+                'change': change,
+                'peak_mb_after': stats.get('peak_mb'),
+                'regression': change > threshold,
+            })
+    return pd.DataFrame(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis stages on a synthetic catalog")
+    parser.add_argument('--history', default=HISTORY_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('run', help="Generate (or reuse) a catalog and time each stage")
+    p.add_argument('--files', type=int, default=10_000, help="Catalog size (result files)")
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--catalog-dir', default=CATALOG_DIR)
+    p.add_argument('--workers', type=int, default=None, help="Catalog generation processes")
+    p.add_argument('--no-memory', action='store_true', help="Skip the traced peak-memory pass")
+
+    sub.add_parser('compare', help="Compare the last two runs at each catalog size")
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ANALYSIS BENCHMARKS")
+    print("=" * 60)
+
+    if args.command == 'compare':
+        comparison = compare_runs(load_history(args.history))
+        if comparison.empty:
+            print("\nNeed at least two runs at the same catalog size")
+            return 0
+        print("\n" + comparison.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+        regressions = comparison[comparison['regression']]
+        if len(regressions):
+            print(f"\n⚠️  {len(regressions)} stage(s) slower by more than {REGRESSION_THRESHOLD:.0%}")
+            return 1
+        print("\n✅ No regressions")
+        return 0
+
+    catalog_dir = Path(args.catalog_dir) / f"catalog_{args.files}_{args.seed}"
+    start = time.perf_counter()
+    catalog = generate_catalog(args.files, catalog_dir, args.seed, args.workers)
+    print(f"\nCatalog: {catalog} ({args.files:,} files, ready in {time.perf_counter() - start:.1f}s)")
+
+    stages = run_benchmark(catalog, memory=not args.no_memory)
+
+    run = {
+        'timestamp': time.time(),
+        **git_revision(),
+        'n_files': args.files,
+        'seed': args.seed,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'stages': stages,
+    }
+    Path(args.history).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.history, 'a') as f:
+        f.write(json.dumps(run) + "\n")
+
+    print(f"\n{'Stage':<26} {'Wall (s)':>10} {'Peak (MB)':>10}")
+    for name, stats in stages.items():
+        peak = f"{stats['peak_mb']:.1f}" if 'peak_mb' in stats else '-'
+        print(f"{name:<26} {stats['wall_s']:>10.2f} {peak:>10}")
+    print(f"\n✅ Saved: {args.history}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Source-FPS-aware bracket analysis: SCR saturation curves and thresholds
+per native frame rate bracket, joined against video_manifest.csv
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional
+
+MANIFEST_PATH = "reproduction/video_manifest.csv"
+
+# Count-like signals that grow with extraction rate (SCR is defined on these)
+SCR_METRICS = ['scene_count', 'transition_count', 'unique_object_count', 'person_count_mean']
+
+def load_manifest(path: str = MANIFEST_PATH) -> pd.DataFrame:
+    """Load the Study 1 video manifest"""
+    return pd.read_csv(path, usecols=['video_id', 'bracket', 'native_fps', 'duration_sec'])
+
+def join_manifest(df: pd.DataFrame, manifest: pd.DataFrame,
+                  metrics: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Attach bracket and native_fps to each signal row and compute per-row SCR.
+
+    Rows without a manifest entry (Study 0) fall back to their recorded
+    source_fps, bracketed by rounded frame rate (e.g. 23.976 -> '24fps').
+    """
+
+    metrics = SCR_METRICS if metrics is None else metrics
+
+    out = df.merge(manifest[['video_id', 'bracket', 'native_fps']], on='video_id', how='left')
+    source = out['source_fps'].astype(float)
+    fallback = source.round().astype('Int64').astype(str) + 'fps'
+    out['native_fps'] = out['native_fps'].fillna(source)
+    out['bracket'] = out['bracket'].fillna(fallback)
+
+    # Theoretical capture: min(f_extraction / f_source, 1)
+    out['fps_ratio'] = out['fps'] / out['native_fps']
+    out['scr_expected'] = np.minimum(out['fps_ratio'], 1.0)
+
+    # Observed capture: each metric relative to the video's rung nearest native fps
+    keys = ['video_id', 'study_type']
+    dist = (out['fps'] - out['native_fps']).abs()
+    native_rows = out.loc[dist.groupby([out[k] for k in keys]).idxmin(), keys + metrics]
+    native = out[keys].merge(native_rows, on=keys, how='left')
+    for metric in metrics:
+        base = native[metric].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[f'scr_{metric}'] = np.where(base > 0, out[metric].to_numpy(dtype=float) / base, np.nan)
+
+    return out
+
+def compute_saturation_curves(joined: pd.DataFrame,
+                              metrics: Optional[List[str]] = None) -> pd.DataFrame:
+    """Mean expected and observed SCR per bracket x fps"""
+
+    metrics = SCR_METRICS if metrics is None else metrics
+    scr_cols = ['scr_expected'] + [f'scr_{m}' for m in metrics]
+
+    curves = joined.groupby(['bracket', 'fps']).agg(
+        native_fps=('native_fps', 'median'),
+        fps_ratio=('fps_ratio', 'median'),
+        n=('video_id', 'count'),
+        **{col: (col, 'mean') for col in scr_cols},
+    ).reset_index()
+
+    return curves
+
+def compute_bracket_thresholds(curves: pd.DataFrame, metrics: Optional[List[str]] = None,
+                               level: float = 0.9) -> pd.DataFrame:
+    """First fps (and fps ratio) at which each bracket's mean SCR reaches `level`"""
+
+    metrics = SCR_METRICS if metrics is None else metrics
+    scr_cols = [f'scr_{m}' for m in metrics]
+
+    long = curves.melt(id_vars=['bracket', 'fps', 'fps_ratio', 'native_fps'],
+                       value_vars=scr_cols, var_name='metric', value_name='scr')
+    long['metric'] = long['metric'].str.removeprefix('scr_')
+
+    reached = long[long['scr'] >= level]
+    first = reached.loc[reached.groupby(['bracket', 'metric'])['fps'].idxmin()]
+
+    thresholds = first.rename(columns={'fps': f'threshold_fps_{int(level * 100)}pct',
+                                       'fps_ratio': 'threshold_ratio', 'scr': 'scr_at_threshold'})
+    return thresholds.sort_values(['bracket', 'metric']).reset_index(drop=True)
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("BRACKET ANALYSIS (SOURCE-FPS AWARE)")
+    print("=" * 60)
+
+    output_dir = Path("analysis/figures")
+    output_dir.mkdir(exist_ok=True)
+
+    df = pd.read_parquet("analysis/signals_df.parquet")
+    manifest = load_manifest()
+
+    joined = join_manifest(df, manifest)
+    matched = joined['video_id'].isin(manifest['video_id']).sum()
+    print(f"\nLoaded {len(df)} records ({matched} matched to manifest)")
+    print(f"Brackets: {sorted(joined['bracket'].unique().tolist())}")
+
+    curves = compute_saturation_curves(joined)
+    curves.to_csv(output_dir / 'bracket_saturation_curves.csv', index=False)
+    print(f"✅ Saved: {output_dir / 'bracket_saturation_curves.csv'}")
+
+    thresholds = compute_bracket_thresholds(curves)
+    thresholds.to_csv(output_dir / 'bracket_thresholds.csv', index=False)
+    print(f"✅ Saved: {output_dir / 'bracket_thresholds.csv'}")
+
+    print("\n" + thresholds.to_string(index=False))
+
+    print("\n" + "=" * 60)
+    print("BRACKET ANALYSIS COMPLETE")
+    print("=" * 60)
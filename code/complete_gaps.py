@@ -6,16 +6,27 @@ Complete remaining analysis gaps:
 3. Dataset deviation documentation
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 
+import perf_trace
+from data_loader import load_signals
+
 plt.style.use('seaborn-v0_8-whitegrid')
 
+# Columns of signals_df.parquet this script reads
+SIGNAL_COLUMNS = [
+    'video_id', 'fps', 'tier', 'study_type', 'scene_count', 'transition_count',
+    'person_count_mean', 'unique_object_count', 'brightness_mean', 'intensity_mean',
+    'change_score_mean', 'temporal_density'
+]
+
 def load_data():
-    df = pd.read_parquet("analysis/signals_df.parquet")
+    df = load_signals(SIGNAL_COLUMNS)
     return df
 
 # =============================================================================
@@ -325,7 +336,16 @@ The dataset changes **strengthen** our conclusions:
 # MAIN
 # =============================================================================
 
+perf_trace.instrument(globals())
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AD tier mapping, validation-set analysis and dataset deviation notes")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write a Chrome trace of this run (see perf_trace.py)")
+    args = parser.parse_args()
+    if args.profile:
+        perf_trace.enable()
+
     print("=" * 60)
     print("COMPLETING ANALYSIS GAPS")
     print("=" * 60)
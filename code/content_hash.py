@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Content hashes of files and directory trees, shared by the stage runner
+and the caches that rebuild when their source data changes
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+def hash_path(path: Path) -> Optional[str]:
+    """sha256 of a file, or of every file (name and content) under a directory; None if missing"""
+    if not path.exists():
+        return None
+    files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+    h = hashlib.sha256()
+    for filepath in files:
+        if path.is_dir():
+            h.update(str(filepath.relative_to(path)).encode() + b"\0")
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared memory-lean loader for signals_df.parquet.
+
+Reads only the columns an analysis needs and compacts them on the way in:
+the smallest signed int that fits, and categoricals for the repeated string
+identifiers. Float metrics stay float64 so the ANOVA, threshold and
+validation tables match a plain read (and out_of_core.py) exactly; fps and
+source_fps are also grid keys compared by equality (e.g. 23.976 rates).
+"""
+
+import pandas as pd
+import pyarrow.parquet as pq
+from typing import List, Optional
+
+SIGNALS_PATH = "analysis/signals_df.parquet"
+CATEGORICAL_COLUMNS = ['tier', 'dataset', 'study_type', 'video_id']
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast ints to the smallest fitting int and categorise identifiers; floats are kept"""
+    out = {}
+    for column in df.columns:
+        series = df[column]
+        if column in CATEGORICAL_COLUMNS:
+            out[column] = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series):
+            out[column] = pd.to_numeric(series, downcast='integer')
+        else:
+            out[column] = series
+    return pd.DataFrame(out, index=df.index)
+
+def default_load_bytes(path: str = SIGNALS_PATH) -> int:
+    """Approximate in-memory size of a plain pd.read_parquet of every column"""
+    parquet = pq.ParquetFile(path)
+    rows = parquet.metadata.num_rows
+    numeric, strings = [], []
+    for field in parquet.schema_arrow:
+        (numeric if pd.api.types.is_numeric_dtype(field.type.to_pandas_dtype()) else strings).append(field.name)
+
+    total = rows * 8 * len(numeric)
+    if strings and rows:
+        # Extrapolate string columns from one row group rather than loading them all
+        sample = parquet.read_row_group(0, columns=strings).to_pandas()
+        total += sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1) * rows
+    return int(total)
+
+def load_signals(columns: Optional[List[str]] = None, path: str = SIGNALS_PATH,
+                 compact: bool = True, report: bool = True) -> pd.DataFrame:
+    """Load the projected columns of signals_df.parquet with compact dtypes"""
+    df = pd.read_parquet(path, columns=columns)
+    if compact:
+        df = compact_dtypes(df)
+
+    if report:
+        loaded = df.memory_usage(deep=True).sum()
+        baseline = default_load_bytes(path)
+        n_columns = len(pq.ParquetFile(path).schema_arrow)
+        print(f"Loaded {len(df)} rows x {df.shape[1]}/{n_columns} columns: "
+              f"{loaded / 1e6:.1f} MB (full default load ≈ {baseline / 1e6:.1f} MB, "
+              f"{1 - loaded / baseline:.0%} saved)")
+    return df
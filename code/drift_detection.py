@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Statistical drift detection for new extraction batches.
+
+Each (tier, fps, metric) cell is summarised by a mergeable sketch: moments
+(count, sum, sum of squares, min, max) plus a histogram over bin edges fixed
+when the baseline is created. Sketches add cell-wise, so the baseline can be
+updated batch by batch and compared in O(groups) without reloading history.
+"""
+
+import argparse
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional
+
+DRIFT_METRICS = [
+    'scene_count', 'transition_count', 'unique_object_count', 'person_count_mean',
+    'objects_per_frame_mean', 'intensity_mean', 'change_score_mean', 'temporal_density',
+]
+N_BINS = 32
+PSI_THRESHOLD = 0.2     # population stability index: > 0.2 is a major shift
+SMD_THRESHOLD = 0.5     # standardised mean difference vs baseline std
+BASELINE_PATH = "analysis/drift_baseline.npz"
+
+class SketchSet:
+    """Histogram + moment sketches for every tier x fps x metric cell"""
+
+    def __init__(self, keys: pd.DataFrame, metrics: List[str], edges: np.ndarray,
+                 counts: np.ndarray, moments: np.ndarray):
+        self.keys = keys.reset_index(drop=True)     # columns: tier, fps
+        self.metrics = list(metrics)
+        self.edges = edges          # (metrics, N_BINS + 1) interior edges
+        self.counts = counts        # (groups, metrics, N_BINS + 2) incl. under/overflow
+        self.moments = moments      # (groups, metrics, 5): n, sum, sumsq, min, max
+
+    @staticmethod
+    def fit_edges(df: pd.DataFrame, metrics: Optional[List[str]] = None, n_bins: int = N_BINS) -> np.ndarray:
+        """Quantile-spaced bin edges per metric, fixed for the life of a baseline"""
+        metrics = DRIFT_METRICS if metrics is None else metrics
+        qs = np.linspace(0, 1, n_bins + 1)
+        edges = np.vstack([np.nanquantile(df[m].to_numpy(dtype=float), qs) for m in metrics])
+        # Strictly increasing edges keep searchsorted well defined for constant metrics
+        return np.maximum.accumulate(edges + np.arange(n_bins + 1) * 1e-9, axis=1)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, edges: np.ndarray,
+                   metrics: Optional[List[str]] = None) -> 'SketchSet':
+        """Sketch a batch in one vectorised pass"""
+
+        metrics = DRIFT_METRICS if metrics is None else metrics
+        n_bins = edges.shape[1] + 1
+
+        grouper = df.groupby(['tier', 'fps'], sort=True)
+        codes = grouper.ngroup().to_numpy()
+        keys = grouper.size().index.to_frame(index=False)
+        n_groups = len(keys)
+
+        counts = np.zeros((n_groups, len(metrics), n_bins), dtype=np.int64)
+        moments = np.zeros((n_groups, len(metrics), 5))
+
+        for j, metric in enumerate(metrics):
+            values = df[metric].to_numpy(dtype=float)
+            ok = ~np.isnan(values)
+            v, g = values[ok], codes[ok]
+            bins = np.searchsorted(edges[j], v, side='right')
+            counts[:, j, :] = np.bincount(g * n_bins + bins, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+            moments[:, j, 0] = np.bincount(g, minlength=n_groups)
+            moments[:, j, 1] = np.bincount(g, weights=v, minlength=n_groups)
+            moments[:, j, 2] = np.bincount(g, weights=v * v, minlength=n_groups)
+            mins = np.full(n_groups, np.inf)
+            maxs = np.full(n_groups, -np.inf)
+            np.minimum.at(mins, g, v)
+            np.maximum.at(maxs, g, v)
+            moments[:, j, 3] = mins
+            moments[:, j, 4] = maxs
+
+        return cls(keys, metrics, edges, counts, moments)
+
+    def _align(self, other: 'SketchSet'):
+        """Union of group keys, with both sketch arrays expanded onto it"""
+        if self.metrics != other.metrics or not np.array_equal(self.edges, other.edges):
+            raise ValueError("Sketches were built with different metrics or bin edges")
+
+        keys = pd.concat([self.keys, other.keys]).drop_duplicates().sort_values(['tier', 'fps'])
+        keys = keys.reset_index(drop=True)
+        index = pd.MultiIndex.from_frame(keys)
+
+        def expand(sk):
+            pos = index.get_indexer(pd.MultiIndex.from_frame(sk.keys))
+            counts = np.zeros((len(keys),) + sk.counts.shape[1:], dtype=np.int64)
+            moments = np.zeros((len(keys),) + sk.moments.shape[1:])
+            moments[:, :, 3], moments[:, :, 4] = np.inf, -np.inf
+            counts[pos], moments[pos] = sk.counts, sk.moments
+            return counts, moments
+
+        return keys, expand(self), expand(other)
+
+    def merge(self, other: 'SketchSet') -> 'SketchSet':
+        """Combine two sketch sets cell-wise"""
+        keys, (c1, m1), (c2, m2) = self._align(other)
+        moments = m1 + m2
+        moments[:, :, 3] = np.minimum(m1[:, :, 3], m2[:, :, 3])
+        moments[:, :, 4] = np.maximum(m1[:, :, 4], m2[:, :, 4])
+        return SketchSet(keys, self.metrics, self.edges, c1 + c2, moments)
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Approximate quantile per (group, metric), interpolated within histogram bins"""
+        n = self.counts.sum(axis=2)
+        cdf = np.cumsum(self.counts, axis=2)
+        target = q * n
+        b = np.minimum((cdf < target[..., None]).sum(axis=2), self.counts.shape[2] - 1)
+
+        # Bin b spans [lo, hi]; under/overflow bins are bounded by the observed min/max
+        lo_edges = np.concatenate([np.full((len(self.metrics), 1), -np.inf), self.edges], axis=1)
+        hi_edges = np.concatenate([self.edges, np.full((len(self.metrics), 1), np.inf)], axis=1)
+        m_idx = np.arange(len(self.metrics))[None, :]
+        lo = np.maximum(lo_edges[m_idx, b], self.moments[:, :, 3])
+        hi = np.minimum(hi_edges[m_idx, b], self.moments[:, :, 4])
+
+        below = np.where(b > 0, np.take_along_axis(cdf, np.maximum(b - 1, 0)[..., None], 2)[..., 0], 0)
+        in_bin = np.take_along_axis(self.counts, b[..., None], 2)[..., 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = np.where(in_bin > 0, (target - below) / in_bin, 0.0)
+        return np.where(n > 0, lo + np.clip(frac, 0, 1) * (hi - lo), np.nan)
+
+    def save(self, path: str = BASELINE_PATH):
+        np.savez_compressed(
+            path, tier=self.keys['tier'].to_numpy(dtype=str), fps=self.keys['fps'].to_numpy(dtype=float),
+            metrics=np.array(self.metrics), edges=self.edges, counts=self.counts, moments=self.moments)
+
+    @classmethod
+    def load(cls, path: str = BASELINE_PATH) -> 'SketchSet':
+        z = np.load(path)
+        keys = pd.DataFrame({'tier': z['tier'].astype(str), 'fps': z['fps']})
+        return cls(keys, z['metrics'].tolist(), z['edges'], z['counts'], z['moments'])
+
+def compare_sketches(baseline: SketchSet, batch: SketchSet) -> pd.DataFrame:
+    """Per tier x fps x metric shift statistics between a baseline and a new batch"""
+
+    keys, (c_base, m_base), (c_new, m_new) = baseline._align(batch)
+    aligned_base = SketchSet(keys, baseline.metrics, baseline.edges, c_base, m_base)
+    aligned_new = SketchSet(keys, baseline.metrics, baseline.edges, c_new, m_new)
+
+    eps = 1e-4
+    p = c_base / np.maximum(c_base.sum(axis=2, keepdims=True), 1)
+    q = c_new / np.maximum(c_new.sum(axis=2, keepdims=True), 1)
+    psi = ((q - p) * np.log((q + eps) / (p + eps))).sum(axis=2)
+    ks = np.abs(np.cumsum(q, axis=2) - np.cumsum(p, axis=2)).max(axis=2)
+
+    n_base, n_new = m_base[:, :, 0], m_new[:, :, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_base = m_base[:, :, 1] / n_base
+        mean_new = m_new[:, :, 1] / n_new
+        std_base = np.sqrt(np.maximum(m_base[:, :, 2] / n_base - mean_base ** 2, 0))
+        smd = np.where(std_base > 0, (mean_new - mean_base) / std_base, 0.0)
+
+    n_groups, n_metrics = psi.shape
+    result = pd.DataFrame({
+        'tier': np.repeat(keys['tier'].to_numpy(), n_metrics),
+        'fps': np.repeat(keys['fps'].to_numpy(), n_metrics),
+        'metric': np.tile(baseline.metrics, n_groups),
+        'n_baseline': n_base.ravel().astype(int),
+        'n_batch': n_new.ravel().astype(int),
+        'mean_baseline': mean_base.ravel(),
+        'mean_batch': mean_new.ravel(),
+        'p50_shift': (aligned_new.quantile(0.5) - aligned_base.quantile(0.5)).ravel(),
+        'p95_shift': (aligned_new.quantile(0.95) - aligned_base.quantile(0.95)).ravel(),
+        'smd': smd.ravel(),
+        'psi': psi.ravel(),
+        'ks': ks.ravel(),
+    })
+    both = (result['n_baseline'] > 0) & (result['n_batch'] > 0)
+    result['drift'] = both & ((result['psi'] > PSI_THRESHOLD) | (result['smd'].abs() > SMD_THRESHOLD))
+
+    return result[result['n_batch'] > 0].reset_index(drop=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect distribution drift in extraction batches")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('baseline', help="Create a baseline sketch from a signals parquet")
+    p.add_argument('--input', default="analysis/signals_df.parquet")
+    p.add_argument('--out', default=BASELINE_PATH)
+
+    p = sub.add_parser('compare', help="Compare a new batch against the baseline")
+    p.add_argument('batch')
+    p.add_argument('--baseline', default=BASELINE_PATH)
+    p.add_argument('--out', default="analysis/figures/drift_report.csv")
+    p.add_argument('--update', action='store_true', help="Merge the batch into the baseline afterwards")
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("DRIFT DETECTION")
+    print("=" * 60)
+
+    if args.command == 'baseline':
+        df = pd.read_parquet(args.input)
+        sketch = SketchSet.from_frame(df, SketchSet.fit_edges(df))
+        sketch.save(args.out)
+        print(f"\n✅ Saved: {args.out} ({len(sketch.keys)} tier x fps groups)")
+        return 0
+
+    baseline = SketchSet.load(args.baseline)
+    batch = SketchSet.from_frame(pd.read_parquet(args.batch), baseline.edges, baseline.metrics)
+    report = compare_sketches(baseline, batch)
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(args.out, index=False)
+    print(f"\n✅ Saved: {args.out}")
+
+    flagged = report[report['drift']]
+    print(f"\nDrift flagged: {len(flagged)} of {len(report)} tier x fps x metric cells")
+    if len(flagged) > 0:
+        print(flagged[['tier', 'fps', 'metric', 'mean_baseline', 'mean_batch', 'p50_shift', 'p95_shift',
+                       'psi', 'smd']]
+              .round(3).to_string(index=False))
+
+    if args.update:
+        baseline.merge(batch).save(args.baseline)
+        print(f"✅ Updated: {args.baseline}")
+
+    return 1 if len(flagged) > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Asynchronous batched extraction harness.
+
+Frames for each (video, fps) job are deduplicated with the frame sampler,
+sent to a pluggable model backend in batches with a bounded number of
+requests in flight, aggregated into the result JSON schema that
+process_results.extract_metrics reads, and written one file per job.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from frame_sampler import plan_sampling
+from process_results import STUDY1_FPS_LEVELS, result_filename
+
+class MockBackend:
+    """
+    Offline stand-in for a VLM endpoint: deterministic per-frame outputs
+    after a fixed request latency plus a per-frame cost
+    """
+
+    name = "mock"
+
+    def __init__(self, latency: float = 0.05, per_frame_latency: float = 0.002,
+                 max_in_flight: int = 8):
+        self.latency = latency
+        self.per_frame_latency = per_frame_latency
+        self.max_in_flight = max_in_flight
+
+    async def extract_batch(self, video_id: str, frame_indices: Sequence[int]) -> List[Dict[str, Any]]:
+        await asyncio.sleep(self.latency + self.per_frame_latency * len(frame_indices))
+        seed = int(hashlib.sha256(video_id.encode()).hexdigest()[:8], 16)
+        return [self._frame(seed, int(i)) for i in frame_indices]
+
+    @staticmethod
+    def _frame(seed: int, index: int) -> Dict[str, Any]:
+        # Piecewise-constant "shots" of ~3s at 24fps so scene signals are realistic
+        shot = index // 72
+        rng = np.random.default_rng([seed, shot])
+        frame_rng = np.random.default_rng([seed, shot, index])
+        objects = rng.choice(['person', 'car', 'chair', 'cup', 'tv', 'dog', 'bottle'], size=rng.integers(0, 5))
+        return {
+            'person_count': int(rng.integers(0, 4) + (frame_rng.random() < 0.1)),
+            'objects': sorted(set(objects.tolist())),
+            'brightness': float(rng.uniform(20, 200) + frame_rng.normal(0, 2)),
+            'contrast': float(rng.uniform(10, 60)),
+            'motion': float(abs(frame_rng.normal(0.05, 0.05))),
+            'scene_cut': index > 0 and index % 72 == 0,
+            'colors': ['#%06x' % rng.integers(0, 0xFFFFFF) for _ in range(3)],
+        }
+
+def aggregate_frames(frames: List[Dict[str, Any]], video_id: str, fps: float,
+                     duration: float, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Aggregate per-sample backend outputs into the result JSON schema"""
+
+    n = len(frames)
+    t = np.arange(n) / fps if n else np.zeros(0)
+
+    persons = np.array([f['person_count'] for f in frames], dtype=float)
+    objects = [f['objects'] for f in frames]
+    brightness = np.array([f['brightness'] for f in frames], dtype=float)
+    contrast = np.array([f['contrast'] for f in frames], dtype=float)
+    motion = np.array([f['motion'] for f in frames], dtype=float)
+    cuts = t[[bool(f['scene_cut']) for f in frames]] if n else np.zeros(0)
+
+    bounds = np.concatenate([[0.0], cuts, [duration]])
+    scene_durations = np.diff(bounds)
+
+    class_frames = pd.Series([c for frame in objects for c in frame]).value_counts() if n else pd.Series(dtype=int)
+    person_steps = np.abs(np.diff(persons)) if n > 1 else np.zeros(0)
+    change = np.abs(np.diff(brightness)) / 255 if n > 1 else np.zeros(0)
+    inner = motion[1:-1]
+    peaks = (inner > motion[:-2]) & (inner > motion[2:]) & (inner > motion.mean() + motion.std()) if n > 2 else np.zeros(0, bool)
+
+    events = len(cuts) + person_steps.sum() + peaks.sum()
+
+    return {
+        'video_id': video_id,
+        'fps': fps,
+        'frame_count': n,
+        'duration': duration,
+        'scene_signals': {
+            'transitions': cuts.tolist(),
+            'scene_count': len(cuts) + 1,
+            'transition_count': len(cuts),
+            'scene_duration_mean': float(scene_durations.mean()),
+            'scene_duration_std': float(scene_durations.std()),
+        },
+        'character_signals': {
+            'person_counts': persons.astype(int).tolist(),
+            'person_count_mean': float(persons.mean()) if n else 0.0,
+            'person_count_max': int(persons.max()) if n else 0,
+            'character_consistency': float((person_steps == 0).mean()) if n > 1 else 0.0,
+            'entry_exit_total': int(person_steps.sum()),
+        },
+        'visual_signals': {
+            'objects_per_frame': [len(o) for o in objects],
+            'unique_object_count': int(len(class_frames)),
+            'persistent_object_count': int((class_frames >= 0.5 * n).sum()) if n else 0,
+        },
+        'atmosphere_signals': {
+            'brightness_mean': float(brightness.mean()) if n else 0.0,
+            'brightness_std': float(brightness.std()) if n else 0.0,
+            'contrast_mean': float(contrast.mean()) if n else 0.0,
+            'dominant_colors': frames[0]['colors'] if n else [],
+        },
+        'action_signals': {
+            'motion_intensity': motion.tolist(),
+            'intensity_mean': float(motion.mean()) if n else 0.0,
+            'intensity_max': float(motion.max()) if n else 0.0,
+            'peak_count': int(peaks.sum()),
+        },
+        'temporal_signals': {
+            'change_score_mean': float(change.mean()) if len(change) else 0.0,
+            'temporal_density': float(events / duration) if duration else 0.0,
+        },
+        'metadata': metadata,
+    }
+
+def job_output_path(job: Dict[str, Any], output_dir: Path) -> Path:
+    """Where a job's result JSON is written"""
+    return Path(output_dir) / job['metadata']['dataset'] / result_filename(job['video_id'], job['fps'])
+
+class ExtractionHarness:
+    """Runs (video, fps) extraction jobs against a backend with batching and bounded concurrency"""
+
+    def __init__(self, backend, batch_size: int = 16, max_in_flight: Optional[int] = None,
+                 cache=None):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.semaphore = asyncio.Semaphore(max_in_flight or getattr(backend, 'max_in_flight', 8))
+        self.cache = cache
+        self.latencies = []
+        self.frames_extracted = 0
+
+    async def _request(self, video_id: str, batch: List[int]) -> List[Dict[str, Any]]:
+        async with self.semaphore:
+            start = time.perf_counter()
+            results = await self.backend.extract_batch(video_id, batch)
+            self.latencies.append(time.perf_counter() - start)
+        self.frames_extracted += len(batch)
+        return results
+
+    async def extract_frames(self, video_id: str, frame_indices: Sequence[int]) -> List[Dict[str, Any]]:
+        """Per-frame outputs in input order, batched across concurrent requests"""
+        indices = [int(i) for i in frame_indices]
+        batches = [indices[i:i + self.batch_size] for i in range(0, len(indices), self.batch_size)]
+        results = await asyncio.gather(*(self._request(video_id, b) for b in batches))
+        return [frame for batch in results for frame in batch]
+
+    async def _extract_cached(self, video_id: str, sha256: Optional[str],
+                              frame_indices: Sequence[int]) -> List[Dict[str, Any]]:
+        if self.cache is None or not sha256:
+            return await self.extract_frames(video_id, frame_indices)
+
+        cached = await asyncio.to_thread(self.cache.get_many, sha256, frame_indices)
+        todo = [int(i) for i in frame_indices if int(i) not in cached]
+        if todo:
+            fresh = dict(zip(todo, await self.extract_frames(video_id, todo)))
+            await asyncio.to_thread(self.cache.put_many, sha256, fresh)
+            cached.update(fresh)
+        return [cached[int(i)] for i in frame_indices]
+
+    async def run_job(self, job: Dict[str, Any], output_dir: Path) -> Path:
+        """Extract one (video, fps) job and write its result JSON"""
+
+        plan = plan_sampling(job['duration'], job['native_fps'], job['fps'])
+        unique = await self._extract_cached(job['video_id'], job.get('sha256'), plan.unique)
+
+        # A cut belongs to its source frame: duplicates of an oversampled frame must not recount it
+        frames = [f if first or not f['scene_cut'] else dict(f, scene_cut=False)
+                  for f, first in zip(plan.fan_out(unique), plan.first_copy)]
+        result = aggregate_frames(frames, job['video_id'], job['fps'],
+                                  job['duration'], job['metadata'])
+
+        out_path = job_output_path(job, output_dir)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = out_path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(result))
+        tmp_path.replace(out_path)
+        return out_path
+
+    async def run(self, jobs: List[Dict[str, Any]], output_dir: Path,
+                  max_jobs_in_flight: int = 32) -> List[Path]:
+        """Run many jobs; request concurrency is still bounded by the backend semaphore"""
+        job_slots = asyncio.Semaphore(max_jobs_in_flight)
+
+        async def bounded(job):
+            async with job_slots:
+                return await self.run_job(job, output_dir)
+
+        return await asyncio.gather(*(bounded(job) for job in jobs))
+
+    def stats(self, wall_time: float) -> Dict[str, float]:
+        lat = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {
+            'requests': len(self.latencies),
+            'frames': self.frames_extracted,
+            'wall_time_s': wall_time,
+            'frames_per_s': self.frames_extracted / wall_time if wall_time else 0.0,
+            'latency_p50_ms': float(np.percentile(lat, 50) * 1000),
+            'latency_p95_ms': float(np.percentile(lat, 95) * 1000),
+            'latency_max_ms': float(lat.max() * 1000),
+        }
+
+def manifest_jobs(manifest: pd.DataFrame, fps_levels: Sequence[float],
+                  include_native: bool = True) -> List[Dict[str, Any]]:
+    """Study 1 style jobs (given rates plus native fps) for each manifest video"""
+    jobs = []
+    for video in manifest.itertuples(index=False):
+        levels = list(fps_levels) + ([video.native_fps] if include_native else [])
+        for fps in dict.fromkeys(levels):
+            jobs.append({
+                'video_id': video.video_id,
+                'fps': float(fps),
+                'duration': float(video.duration_sec),
+                'native_fps': float(video.native_fps),
+                'sha256': video.sha256,
+                'metadata': {
+                    'tier': 'hfr',
+                    'dataset': f'study1/{video.bracket}',
+                    'study_type': 'study1',
+                    'source_fps': float(video.native_fps),
+                },
+            })
+    return jobs
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extraction harness against the mock backend")
+    parser.add_argument('--manifest', default="reproduction/video_manifest.csv")
+    parser.add_argument('--videos', type=int, default=10, help="Number of manifest videos to extract")
+    parser.add_argument('--fps', type=float, nargs='+', default=STUDY1_FPS_LEVELS)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--in-flight', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--per-frame-latency', type=float, default=0.002)
+    parser.add_argument('--output', default="data/mock_results")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("EXTRACTION HARNESS (MOCK BACKEND)")
+    print("=" * 60)
+
+    manifest = pd.read_csv(args.manifest).head(args.videos)
+    jobs = manifest_jobs(manifest, args.fps)
+    print(f"\n{len(jobs)} jobs over {len(manifest)} videos")
+
+    backend = MockBackend(args.latency, args.per_frame_latency, args.in_flight)
+    harness = ExtractionHarness(backend, batch_size=args.batch_size)
+
+    start = time.perf_counter()
+    paths = asyncio.run(harness.run(jobs, Path(args.output)))
+    stats = harness.stats(time.perf_counter() - start)
+
+    print(f"✅ Wrote {len(paths)} result files to {args.output}/")
+    for key, value in stats.items():
+        print(f"  {key}: {value:,.2f}" if isinstance(value, float) else f"  {key}: {value:,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Fingerprint-based skipping for figure and table jobs.
+
+A job's fingerprint covers the exact data it is handed (cube subsets or
+projected frames, hashed by content), the source of its function plus the
+same-module helpers and UPPER_CASE constants it references, the script's
+module-level calls (style setup such as plt.style.use), the source of the
+local modules whose objects it receives (e.g. SummaryCube's lookups) and of
+the render machinery, and the plotting library versions. When the fingerprint matches the last recorded
+render and every declared output still exists, the job is skipped and its
+recorded return value is reused. Each script keeps its own manifest under
+<output_dir>/.fingerprints/, so stages running concurrently never share one.
+"""
+
+import ast
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+FORCE_ENV = "FRMP_FORCE_RENDER"
+CACHE_DIR = ".fingerprints"
+CODE_DIR = Path(__file__).resolve().parent
+RENDER_MODULES = ['figure_cache', 'render_pool']
+
+def _update(h, obj: Any):
+    """Feed a content digest of obj into h"""
+    if isinstance(obj, pd.DataFrame):
+        h.update(repr([(str(c), str(t)) for c, t in obj.dtypes.items()]).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(f"{obj.name}:{obj.dtype}".encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"{obj.dtype}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif hasattr(obj, 'arrays'):
+        _update(h, obj.arrays())
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=str):
+            h.update(str(key).encode())
+            _update(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _update(h, item)
+    else:
+        h.update(repr(obj).encode())
+
+def data_digest(*inputs: Any) -> str:
+    h = hashlib.sha256()
+    for obj in inputs:
+        _update(h, obj)
+    return h.hexdigest()
+
+def _code_objects(code):
+    yield code
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            yield from _code_objects(const)
+
+@functools.lru_cache(maxsize=None)
+def module_calls(module_name: str) -> str:
+    """A module's top-level call statements, e.g. the plt.style.use / sns.set_palette style setup"""
+    tree = ast.parse(inspect.getsource(sys.modules[module_name]))
+    return "\n".join(ast.unparse(node) for node in tree.body
+                     if isinstance(node, ast.Expr) and isinstance(node.value, ast.Call))
+
+@functools.lru_cache(maxsize=None)
+def file_digest(path: str) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def local_modules(obj: Any, found: set = None) -> set:
+    """Source files of the repo modules defining obj's type (recursing into dicts and lists)"""
+    found = set() if found is None else found
+    if isinstance(obj, dict):
+        for value in obj.values():
+            local_modules(value, found)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            local_modules(item, found)
+    else:
+        path = getattr(sys.modules.get(type(obj).__module__), '__file__', None)
+        if path and Path(path).resolve().parent == CODE_DIR:
+            found.add(str(Path(path).resolve()))
+    return found
+
+def code_digest(func: Callable) -> str:
+    """Source of func and of the same-module functions and constants it (transitively) references"""
+    h = hashlib.sha256()
+    seen = set()
+    h.update(module_calls(inspect.unwrap(func).__module__).encode())
+
+    def visit(fn):
+        fn = inspect.unwrap(fn)
+        if fn in seen:
+            return
+        seen.add(fn)
+        h.update(inspect.getsource(fn).encode())
+        for code in _code_objects(fn.__code__):
+            for name in code.co_names:
+                obj = fn.__globals__.get(name)
+                if inspect.isfunction(obj) and inspect.unwrap(obj).__module__ == fn.__module__:
+                    visit(obj)
+                elif name.isupper() and not inspect.ismodule(obj) and not callable(obj):
+                    h.update(name.encode())
+                    _update(h, obj)
+
+    visit(func)
+    h.update(f"matplotlib={matplotlib.__version__} seaborn={sns.__version__}".encode())
+    return h.hexdigest()
+
+class FigureCache:
+    """Per-script record of the fingerprint each job's outputs were rendered from"""
+
+    def __init__(self, output_dir: Path, script: str, force: bool = False):
+        self.dir = Path(output_dir) / CACHE_DIR
+        self.output_dir = Path(output_dir)
+        self.script = script
+        self.path = self.dir / f"{script}.json"
+        self.force = force or os.environ.get(FORCE_ENV, "").lower() not in ("", "0", "false", "no")
+        self.manifest = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def fingerprint(self, job: Dict[str, Any], shared: Dict[str, Any]) -> str:
+        inputs = [shared[k] for k in job['inputs']]
+        sources = local_modules(inputs) | {str(CODE_DIR / f"{m}.py") for m in RENDER_MODULES}
+        return data_digest(code_digest(job['func']), [file_digest(p) for p in sorted(sources)], inputs)
+
+    def _result_path(self, name: str) -> Path:
+        return self.dir / f"{self.script}.{name}.pkl"
+
+    def is_fresh(self, job: Dict[str, Any], fingerprint: str) -> bool:
+        entry = self.manifest.get(job['name'])
+        return (not self.force and entry is not None and entry['fingerprint'] == fingerprint
+                and all((self.output_dir / o).exists() for o in job['outputs'])
+                and self._result_path(job['name']).exists())
+
+    def result(self, name: str) -> Any:
+        with open(self._result_path(name), 'rb') as f:
+            return pickle.load(f)
+
+    def record(self, job: Dict[str, Any], fingerprint: str, result: Any):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self._result_path(job['name']), 'wb') as f:
+            pickle.dump(result, f)
+        self.manifest[job['name']] = {'fingerprint': fingerprint, 'outputs': job['outputs']}
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.manifest, indent=2))
+        tmp.replace(self.path)
@@ -5,6 +5,7 @@ Fix the gap analysis:
 2. Fix AD tier mapping logic
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -12,10 +13,21 @@ import seaborn as sns
 from pathlib import Path
 from scipy import stats
 
+import perf_trace
+from data_loader import load_signals
+from render_pool import figure_job, project, render
+
 plt.style.use('seaborn-v0_8-whitegrid')
 
+# Columns of signals_df.parquet this script reads
+SIGNAL_COLUMNS = [
+    'video_id', 'fps', 'duration', 'tier', 'study_type', 'scene_count',
+    'transition_count', 'person_count_mean', 'unique_object_count',
+    'intensity_mean', 'temporal_density'
+]
+
 def load_data():
-    df = pd.read_parquet("analysis/signals_df.parquet")
+    df = load_signals(SIGNAL_COLUMNS)
     return df
 
 # =============================================================================
@@ -256,7 +268,38 @@ def analyze_validation_normalized(df: pd.DataFrame, output_dir: Path):
 # MAIN
 # =============================================================================
 
+def render_inputs(df: pd.DataFrame) -> dict:
+    """Shared job inputs, projected to the columns each fix reads"""
+    return {
+        'ad_tiers': project(df, ['tier', 'fps', 'scene_count', 'unique_object_count',
+                                 'transition_count', 'temporal_density']),
+        'validation': project(df, ['video_id', 'fps', 'duration', 'study_type', 'scene_count',
+                                   'unique_object_count', 'transition_count', 'person_count_mean',
+                                   'intensity_mean']),
+    }
+
+def render_jobs() -> list:
+    return [
+        figure_job(map_ad_tiers_fixed, 'ad_tiers',
+                   outputs=['ad_tier_fps_requirements.png', 'ad_tier_fps_mapping.csv']),
+        figure_job(analyze_validation_normalized, 'validation',
+                   outputs=['validation_comparison_normalized.png', 'validation_comparison_normalized.csv']),
+    ]
+
+perf_trace.instrument(globals())
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plateau-based AD tier mapping and normalized validation")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Render figures in this many processes (0: one after another)")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-render every figure, even if its data and code are unchanged")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write a Chrome trace of this run (see perf_trace.py)")
+    args = parser.parse_args()
+    if args.profile:
+        perf_trace.enable()
+
     print("=" * 60)
     print("FIXING ANALYSIS GAPS")
     print("=" * 60)
@@ -264,13 +307,12 @@ if __name__ == "__main__":
     output_dir = Path("analysis/figures")
     df = load_data()
     
-    # Fix 1: AD Tier Mapping
-    print("\n--- FIX 1: AD Tier Mapping (using plateau-based thresholds) ---")
-    ad_mapping = map_ad_tiers_fixed(df, output_dir)
-    
-    # Fix 2: Validation with normalization
-    print("\n--- FIX 2: Validation Analysis (duration-normalized) ---")
-    validation = analyze_validation_normalized(df, output_dir)
+    # Fix 1: AD Tier Mapping (using plateau-based thresholds)
+    # Fix 2: Validation Analysis (duration-normalized)
+    print("\n--- FIX 1: AD Tier Mapping / FIX 2: Validation Analysis ---")
+    results = render(render_jobs(), render_inputs(df), output_dir, workers=args.workers, force=args.force)
+    ad_mapping = results['map_ad_tiers_fixed']
+    validation = results['analyze_validation_normalized']
     
     print("\n" + "=" * 60)
     print("GAPS ANALYSIS COMPLETE")
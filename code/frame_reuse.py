@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Cross-ladder frame reuse: extract each distinct source frame once per video
+and assemble every requested rate from a shared per-frame store
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from frame_sampler import SamplingPlan, plan_sampling
+from process_results import FPS_LADDER, STUDY1_FPS_LEVELS
+
+class VideoPlan:
+    """Sampling plans for every requested rate of one video, plus their frame union"""
+
+    def __init__(self, video_id: str, plans: Dict[float, SamplingPlan]):
+        self.video_id = video_id
+        self.plans = plans
+        if plans:
+            self.union = np.unique(np.concatenate([p.unique for p in plans.values()]))
+        else:
+            self.union = np.zeros(0, dtype=np.int64)
+
+    def savings(self) -> Dict[str, Any]:
+        requested = sum(p.n_requested for p in self.plans.values())
+        per_rung = sum(p.n_unique for p in self.plans.values())
+        shared = len(self.union)
+        return {
+            'video_id': self.video_id,
+            'rates': len(self.plans),
+            'frames_requested': requested,     # one extraction per rung, no dedup
+            'frames_per_rung_dedup': per_rung,  # per-rung ceiling dedup only
+            'frames_shared': shared,           # union across all rungs
+            'saved_pct': (1 - shared / requested) * 100 if requested else 0.0,
+        }
+
+def plan_video(video_id: str, duration: float, native_fps: float, fps_levels: Sequence[float],
+               frame_times: Optional[Sequence[float]] = None) -> VideoPlan:
+    """Plan all rates for one video"""
+    plans = {fps: plan_sampling(duration, native_fps, fps, frame_times) for fps in fps_levels}
+    return VideoPlan(video_id, plans)
+
+class FrameStore:
+    """Per-frame VLM signal outputs for one video, keyed by source frame index"""
+
+    def __init__(self):
+        self.frames = {}
+
+    def missing(self, indices: Sequence[int]) -> List[int]:
+        return [int(i) for i in indices if int(i) not in self.frames]
+
+    def put(self, indices: Sequence[int], results: Sequence[Any]):
+        for i, result in zip(indices, results):
+            self.frames[int(i)] = result
+
+    def assemble(self, plan: SamplingPlan) -> List[Any]:
+        """Per-sample results for one rate, fanned out from the shared store"""
+        return plan.fan_out([self.frames[int(i)] for i in plan.unique])
+
+def extract_shared(video_plan: VideoPlan, extract_fn: Callable[[List[int]], Sequence[Any]],
+                   store: Optional[FrameStore] = None) -> Dict[float, List[Any]]:
+    """
+    Run extract_fn once over the frames not yet in the store, then assemble
+    the per-sample results of every planned rate
+    """
+
+    store = FrameStore() if store is None else store
+    todo = store.missing(video_plan.union)
+    if todo:
+        store.put(todo, extract_fn(todo))
+
+    return {fps: store.assemble(plan) for fps, plan in video_plan.plans.items()}
+
+def plan_catalog(manifest: pd.DataFrame, fps_levels: Optional[Sequence[float]] = None,
+                 include_native: bool = False) -> pd.DataFrame:
+    """Per-video frame reuse savings for every video in a manifest"""
+
+    fps_levels = FPS_LADDER if fps_levels is None else fps_levels
+
+    rows = []
+    for video in manifest.itertuples(index=False):
+        levels = list(fps_levels)
+        if include_native and video.native_fps not in levels:
+            levels.append(video.native_fps)
+        plan = plan_video(video.video_id, video.duration_sec, video.native_fps, levels)
+        rows.append({**plan.savings(), 'native_fps': video.native_fps})
+
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("CROSS-LADDER FRAME REUSE PLAN")
+    print("=" * 60)
+
+    manifest = pd.read_csv("reproduction/video_manifest.csv")
+    print(f"\nLoaded {len(manifest)} videos from manifest")
+
+    for name, levels, native in [("Study 1 rates + native", STUDY1_FPS_LEVELS, True),
+                                 ("Full ladder", FPS_LADDER, False)]:
+        savings = plan_catalog(manifest, levels, include_native=native)
+        requested = savings['frames_requested'].sum()
+        per_rung = savings['frames_per_rung_dedup'].sum()
+        shared = savings['frames_shared'].sum()
+
+        print(f"\n--- {name} ---")
+        print(f"Frames requested (independent rungs): {requested:,}")
+        print(f"Frames with per-rung dedup:           {per_rung:,}")
+        print(f"Frames with cross-ladder reuse:       {shared:,} ({(1 - shared / requested):.1%} saved)")
+
+    print("\n" + "=" * 60)
+    print("PLAN COMPLETE")
+    print("=" * 60)
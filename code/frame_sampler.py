@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Ceiling-aware frame sampler: maps a target extraction fps onto the exact
+source frame indices it hits, so oversampled rates (target > native fps)
+decode and process each unique frame only once
+"""
+
+import numpy as np
+from fractions import Fraction
+from typing import Any, List, Optional, Sequence
+
+# Broadcast rates stored as rounded floats in metadata (e.g. 29.97) -> exact rational
+NTSC_NOMINAL = {24, 30, 48, 60, 120}
+NTSC_DENOMINATOR = 1001
+
+def exact_rate(fps: float) -> Fraction:
+    """Exact rational frame rate, snapping NTSC-style values like 29.97 to 30000/1001"""
+    nominal = round(fps)
+    if nominal in NTSC_NOMINAL:
+        ntsc = Fraction(nominal * 1000, NTSC_DENOMINATOR)
+        if abs(float(ntsc) - fps) < 0.01:
+            return ntsc
+    return Fraction(fps).limit_denominator(1001)
+
+def source_frame_indices(duration: float, native_fps: float, target_fps: float,
+                         frame_times: Optional[Sequence[float]] = None) -> np.ndarray:
+    """
+    Source frame index for every sample a target_fps extraction takes.
+
+    Constant frame rate sources use exact rational arithmetic (sample k at
+    t = k / target maps to round(t * native)). Variable frame rate sources
+    pass their decoded frame timestamps and each sample maps to the nearest.
+    """
+
+    target = exact_rate(target_fps)
+    n_samples = int(Fraction(duration) * target)
+    k = np.arange(n_samples, dtype=np.int64)
+
+    if frame_times is not None:
+        pts = np.asarray(frame_times, dtype=float)
+        if len(pts) == 0:
+            return np.zeros(0, dtype=np.int64)
+        t = k * (target.denominator / target.numerator)
+        right = np.clip(np.searchsorted(pts, t), 1, len(pts) - 1) if len(pts) > 1 else np.zeros_like(k)
+        left = np.maximum(right - 1, 0)
+        nearest = np.where(np.abs(pts[right] - t) < np.abs(t - pts[left]), right, left)
+        return nearest.astype(np.int64)
+
+    # index = round(k * native / target), in integers: ratio a/b, round half up
+    ratio = exact_rate(native_fps) / target
+    a, b = ratio.numerator, ratio.denominator
+    idx = (2 * k * a + b) // (2 * b)
+    n_frames = max(int(Fraction(duration) * exact_rate(native_fps)), 1)
+    return np.minimum(idx, n_frames - 1)
+
+class SamplingPlan:
+    """Requested samples for one (video, target fps), deduplicated to unique source frames"""
+
+    def __init__(self, target_fps: float, native_fps: float, indices: np.ndarray):
+        self.target_fps = target_fps
+        self.native_fps = native_fps
+        self.indices = indices
+        self.unique, first, self.inverse = np.unique(indices, return_index=True, return_inverse=True)
+        # True for the first sample that hits each source frame, False for its duplicates
+        self.first_copy = np.zeros(len(indices), dtype=bool)
+        self.first_copy[first] = True
+
+    @property
+    def n_requested(self) -> int:
+        return len(self.indices)
+
+    @property
+    def n_unique(self) -> int:
+        return len(self.unique)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fraction of requested samples served by an already-processed frame"""
+        return 1 - self.n_unique / self.n_requested if self.n_requested else 0.0
+
+    def fan_out(self, unique_results: Sequence[Any]) -> List[Any]:
+        """Expand per-unique-frame results back to one result per requested sample"""
+        if len(unique_results) != self.n_unique:
+            raise ValueError(f"Expected {self.n_unique} results, got {len(unique_results)}")
+        return [unique_results[i] for i in self.inverse]
+
+def plan_sampling(duration: float, native_fps: float, target_fps: float,
+                  frame_times: Optional[Sequence[float]] = None) -> SamplingPlan:
+    """Build the deduplicated sampling plan for one video at one target fps"""
+    indices = source_frame_indices(duration, native_fps, target_fps, frame_times)
+    return SamplingPlan(target_fps, native_fps, indices)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Resumable extraction job queue on local SQLite.
+
+One row per (video_id, fps) cell. Workers claim jobs under a lease, run them
+with a per-job timeout, and checkpoint completion; failures and timeouts are
+retried with exponential backoff and a growing timeout, so long high-fps
+cells that hit the limit once get another, longer attempt automatically.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+QUEUE_PATH = "data/extraction_queue.sqlite"
+DEFAULT_TIMEOUT = 3600          # seconds per extraction job (as in the Modal runs)
+TIMEOUT_GROWTH = 2.0            # timeout multiplier per previous attempt
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 30               # seconds before the first retry
+BACKOFF_MAX = 3600
+LEASE_MARGIN = 60               # extra lease time beyond the job timeout
+
+class JobQueue:
+    """SQLite-backed (video_id, fps) job queue"""
+
+    def __init__(self, path: str = QUEUE_PATH, timeout: float = DEFAULT_TIMEOUT,
+                 max_attempts: int = MAX_ATTEMPTS):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # run_workers drives the connection from a single DB thread, never two at once
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.row_factory = sqlite3.Row
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                video_id TEXT NOT NULL,
+                fps REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_run_at REAL NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                last_error TEXT,
+                result_path TEXT,
+                payload TEXT,
+                updated_at REAL,
+                PRIMARY KEY (video_id, fps)
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, next_run_at)")
+
+    def enqueue(self, jobs: List[Dict[str, Any]]) -> int:
+        """Add jobs; cells already queued (including completed ones) are left untouched"""
+        before = self.conn.total_changes
+        self.conn.execute("BEGIN")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO jobs (video_id, fps, payload, updated_at) VALUES (?, ?, ?, ?)",
+            [(job['video_id'], float(job['fps']), json.dumps(job), time.time()) for job in jobs])
+        self.conn.execute("COMMIT")
+        return self.conn.total_changes - before
+
+    def job_timeout(self, attempts: int) -> float:
+        return self.timeout * TIMEOUT_GROWTH ** attempts
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically lease the next ready job, or return None"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT video_id, fps, attempts, payload FROM jobs "
+                "WHERE status = 'pending' AND next_run_at <= ? "
+                "ORDER BY next_run_at, fps LIMIT 1", (now,)).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            timeout = self.job_timeout(row['attempts'])
+            self.conn.execute(
+                "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE video_id = ? AND fps = ?",
+                (self.worker_id, now + timeout + LEASE_MARGIN, now, row['video_id'], row['fps']))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        job = json.loads(row['payload'])
+        job['attempts'] = row['attempts']
+        job['timeout'] = timeout
+        return job
+
+    def complete(self, job: Dict[str, Any], result_path: Optional[str] = None):
+        """Checkpoint a finished cell"""
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', result_path = ?, lease_owner = NULL, lease_expires = NULL, "
+            "last_error = NULL, updated_at = ? WHERE video_id = ? AND fps = ?",
+            (result_path, time.time(), job['video_id'], float(job['fps'])))
+
+    def fail(self, job: Dict[str, Any], error: str):
+        """Record a failed attempt and schedule a retry with exponential backoff"""
+        attempts = job['attempts'] + 1
+        status = 'failed' if attempts >= self.max_attempts else 'pending'
+        delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, attempts = ?, next_run_at = ?, last_error = ?, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE video_id = ? AND fps = ?",
+            (status, attempts, time.time() + delay, error[:1000], time.time(),
+             job['video_id'], float(job['fps'])))
+
+    def recover_stale(self, all_running: bool = False) -> int:
+        """Return expired (or, for a single-host resume, all) running jobs to pending"""
+        if all_running:
+            cur = self.conn.execute("UPDATE jobs SET status = 'pending', lease_owner = NULL WHERE status = 'running'")
+        else:
+            cur = self.conn.execute(
+                "UPDATE jobs SET status = 'pending', lease_owner = NULL "
+                "WHERE status = 'running' AND lease_expires < ?", (time.time(),))
+        return cur.rowcount
+
+    def retry_failed(self) -> int:
+        """Give permanently failed cells a fresh set of attempts"""
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'pending', attempts = 0, next_run_at = 0 WHERE status = 'failed'")
+        return cur.rowcount
+
+    def next_ready_in(self) -> Optional[float]:
+        """Seconds until the next pending job becomes ready, or None if nothing is pending"""
+        row = self.conn.execute("SELECT MIN(next_run_at) FROM jobs WHERE status = 'pending'").fetchone()
+        return None if row[0] is None else max(row[0] - time.time(), 0.0)
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+async def run_workers(queue: JobQueue, run_fn: Callable[[Dict[str, Any]], Awaitable[Any]],
+                      n_workers: int = 4, poll_interval: float = 1.0) -> Dict[str, int]:
+    """Drain the queue with n_workers concurrent workers, each job under its timeout"""
+
+    # SQLite calls can wait up to the busy timeout on another process's lock, so they run
+    # on one DB thread (serialising use of the connection) rather than on the event loop
+    loop = asyncio.get_running_loop()
+    db = ThreadPoolExecutor(max_workers=1, thread_name_prefix='job-queue')
+
+    def call(fn, *args):
+        return loop.run_in_executor(db, fn, *args)
+
+    async def worker():
+        while True:
+            job = await call(queue.claim)
+            if job is None:
+                await call(queue.recover_stale)
+                wait = await call(queue.next_ready_in)
+                if wait is None and not (await call(queue.counts)).get('running'):
+                    return
+                await asyncio.sleep(min(wait if wait is not None else poll_interval, poll_interval))
+                continue
+            try:
+                result = await asyncio.wait_for(run_fn(job), timeout=job['timeout'])
+                await call(queue.complete, job, str(result) if result is not None else None)
+            except asyncio.TimeoutError:
+                await call(queue.fail, job, f"timeout after {job['timeout']:.0f}s")
+            except Exception as e:
+                await call(queue.fail, job, f"{type(e).__name__}: {e}")
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(n_workers)))
+        return await call(queue.counts)
+    finally:
+        db.shutdown(wait=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable (video_id, fps) extraction queue")
+    parser.add_argument('--queue', default=QUEUE_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('enqueue', help="Queue Study 1 cells from the video manifest")
+    p.add_argument('--manifest', default="reproduction/video_manifest.csv")
+    p.add_argument('--fps', type=float, nargs='+', default=None)
+    p.add_argument('--cells', default=None,
+                   help="Only queue the (video_id, fps) cells in this CSV, e.g. a verify_completion work queue")
+
+    p = sub.add_parser('run', help="Drain the queue with the mock backend")
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    p.add_argument('--output', default="data/mock_results")
+    p.add_argument('--resume', action='store_true', help="Reclaim all running jobs (single-host restart)")
+    p.add_argument('--retry-failed', action='store_true')
+
+    sub.add_parser('status', help="Show job counts by status")
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("EXTRACTION JOB QUEUE")
+    print("=" * 60)
+
+    if args.command == 'enqueue':
+        from extraction_harness import manifest_jobs
+        from process_results import STUDY1_FPS_LEVELS
+
+        queue = JobQueue(args.queue)
+        jobs = manifest_jobs(pd.read_csv(args.manifest), args.fps or STUDY1_FPS_LEVELS)
+        if args.cells:
+            cells = pd.read_csv(args.cells)
+            wanted = set(zip(cells['video_id'], cells['fps'].astype(float).round(3)))
+            jobs = [job for job in jobs if (job['video_id'], round(job['fps'], 3)) in wanted]
+        added = queue.enqueue(jobs)
+        print(f"\n✅ Queued {added} new jobs ({len(jobs) - added} already present)")
+
+    elif args.command == 'run':
+        from extraction_harness import ExtractionHarness, MockBackend, job_output_path
+
+        queue = JobQueue(args.queue, timeout=args.timeout)
+        reclaimed = queue.recover_stale(all_running=args.resume)
+        if args.retry_failed:
+            reclaimed += queue.retry_failed()
+        print(f"\nReclaimed {reclaimed} jobs")
+
+        harness = ExtractionHarness(MockBackend())
+        output_dir = Path(args.output)
+
+        async def run_fn(job):
+            # A result written just before a crash is checkpointed, not re-extracted
+            out_path = job_output_path(job, output_dir)
+            if out_path.exists():
+                return out_path
+            return await harness.run_job(job, output_dir)
+
+        start = time.perf_counter()
+        counts = asyncio.run(run_workers(queue, run_fn, args.workers))
+        print(f"✅ Queue drained in {time.perf_counter() - start:.1f}s: {counts}")
+
+    queue = JobQueue(args.queue)
+    print(f"\nStatus: {queue.counts()}")
+    return 0 if not queue.counts().get('failed') else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Early-stopping FPS ladder controller for extraction jobs
+"""
+
+import pandas as pd
+from typing import Callable, Dict, List, Optional
+
+from process_results import FPS_LADDER, STABILITY_METRICS, is_stable_step
+
+class LadderController:
+    """
+    Walk the FPS ladder for one video from the lowest rung upwards, stopping
+    once every stability metric has saturated or the source fps is reached
+    """
+
+    def __init__(self, source_fps: float, fps_levels: Optional[List[float]] = None,
+                 metrics: Optional[List[str]] = None):
+        self.source_fps = source_fps
+        self.fps_levels = sorted(FPS_LADDER if fps_levels is None else fps_levels)
+        self.metrics = STABILITY_METRICS if metrics is None else metrics
+        self.history = []       # (fps, metrics) in extraction order
+        self.stable_fps = {}    # metric -> first rung where change < 5%
+        self.stop_reason = None
+        self._next = 0
+
+    @property
+    def done(self) -> bool:
+        return self.stop_reason is not None
+
+    def next_fps(self) -> Optional[float]:
+        """Next rung to extract, or None once the controller has stopped"""
+        if self.done:
+            return None
+        if self._next >= len(self.fps_levels):
+            self.stop_reason = 'ladder_exhausted'
+            return None
+        return self.fps_levels[self._next]
+
+    def skip(self, fps: float):
+        """Move past a rung whose extraction failed, without recording metrics"""
+        self._next = self.fps_levels.index(fps) + 1
+
+    def record(self, fps: float, metrics: Dict[str, float]):
+        """Record a rung's metrics and decide whether to keep climbing"""
+
+        if self.history:
+            prev = self.history[-1][1]
+            for metric in self.metrics:
+                if metric not in self.stable_fps and is_stable_step(prev.get(metric, 0), metrics.get(metric, 0)):
+                    self.stable_fps[metric] = fps
+
+        self.history.append((fps, metrics))
+        self._next = self.fps_levels.index(fps) + 1
+
+        if len(self.stable_fps) == len(self.metrics):
+            self.stop_reason = 'saturated'
+        elif self.source_fps and fps >= self.source_fps:
+            self.stop_reason = 'source_fps'
+
+def walk_ladder(source_fps: float, extract_fn: Callable[[float], Optional[Dict]],
+                fps_levels: Optional[List[float]] = None) -> LadderController:
+    """
+    Drive extract_fn(fps) up the ladder until the controller stops.
+    extract_fn returns an extract_metrics record, or None if the rung failed.
+    """
+
+    controller = LadderController(source_fps, fps_levels)
+
+    while True:
+        fps = controller.next_fps()
+        if fps is None:
+            break
+        metrics = extract_fn(fps)
+        if metrics is None:
+            controller.skip(fps)
+        else:
+            controller.record(fps, metrics)
+
+    return controller
+
+def replay_ladder(df: pd.DataFrame, fps_levels: Optional[List[float]] = None) -> pd.DataFrame:
+    """Replay the controller over existing full-ladder results to estimate savings"""
+
+    results = []
+
+    for (tier, video_id, study_type), video_df in df.groupby(['tier', 'video_id', 'study_type']):
+        by_fps = {row['fps']: row for row in video_df.to_dict('records')}
+        source_fps = float(video_df['source_fps'].max())
+        duration = float(video_df['duration'].max())
+
+        controller = walk_ladder(source_fps, by_fps.get, fps_levels)
+        run = [fps for fps, _ in controller.history]
+
+        results.append({
+            'tier': tier,
+            'video_id': video_id,
+            'study_type': study_type,
+            'source_fps': source_fps,
+            'stop_fps': run[-1] if run else None,
+            'stop_reason': controller.stop_reason,
+            'rungs_run': len(run),
+            'rungs_total': len(by_fps),
+            'frames_run': sum(fps * duration for fps in run),
+            'frames_total': sum(fps * duration for fps in by_fps),
+        })
+
+    results_df = pd.DataFrame(results)
+    results_df['frames_saved_pct'] = (1 - results_df['frames_run'] / results_df['frames_total']) * 100
+
+    return results_df
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("EARLY-STOPPING LADDER REPLAY")
+    print("=" * 60)
+
+    df = pd.read_parquet("analysis/signals_df.parquet")
+    replay_df = replay_ladder(df)
+
+    replay_df.to_parquet("analysis/ladder_replay.parquet", index=False)
+    print(f"\n✅ Saved: analysis/ladder_replay.parquet")
+
+    print(f"\nStop reasons:")
+    print(replay_df['stop_reason'].value_counts().to_string())
+    print(f"\nMedian stop FPS by tier:")
+    print(replay_df.groupby('tier')['stop_fps'].median().to_string())
+    total_saved = 1 - replay_df['frames_run'].sum() / replay_df['frames_total'].sum()
+    print(f"\nRungs run: {replay_df['rungs_run'].sum()} / {replay_df['rungs_total'].sum()}")
+    print(f"Frames saved: {total_saved:.1%}")
+
+    print("\n" + "=" * 60)
+    print("REPLAY COMPLETE")
+    print("=" * 60)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Out-of-core analysis mode for catalogs larger than RAM.
+
+signals_df.parquet is scanned once in fixed-size record batches. Each batch
+is reduced to per-group sufficient statistics (count, mean, sum of squared
+deviations), which are merged across batches with Chan et al.'s parallel
+update. The FPS aggregates, tier ANOVA, FPS thresholds and summary tables
+are then computed from those statistics alone, so peak memory depends on
+the batch size and the number of groups, not the number of rows.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from pathlib import Path
+from scipy import stats
+from typing import Dict, Iterator, List, Sequence
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from process_results import FPS_AGG_FUNCS
+from statistical_analysis import (
+    ANOVA_METRICS, ANOVA_TIERS, THRESHOLD_METRICS, effect_size_label, fps_threshold_row,
+    save_anova_results, save_fps_thresholds
+)
+from visualize_results import FPS_SUMMARY_AGG, TIER_SUMMARY_AGG, save_summary_stats
+
+BATCH_ROWS = 250_000
+
+class GroupedMoments:
+    """Mergeable per-group count / mean / M2 for several metrics (NaNs ignored)"""
+
+    def __init__(self, keys: Sequence[str], metrics: Sequence[str]):
+        self.keys = list(keys)
+        self.metrics = list(dict.fromkeys(metrics))
+        self.n = self.mean = self.m2 = None
+
+    def update(self, batch: pd.DataFrame):
+        values = batch[self.metrics].astype(np.float64)
+        grouped = values.groupby([batch[k] for k in self.keys], observed=True, sort=False)
+        n = grouped.count().astype(np.float64)
+        mean = grouped.mean().fillna(0.0)
+        m2 = (grouped.var(ddof=0) * n).fillna(0.0)
+        self._merge(n, mean, m2)
+
+    def _merge(self, n_b: pd.DataFrame, mean_b: pd.DataFrame, m2_b: pd.DataFrame):
+        if self.n is None:
+            self.n, self.mean, self.m2 = n_b, mean_b, m2_b
+            return
+        index = self.n.index.union(n_b.index)
+        n_a, mean_a, m2_a = (f.reindex(index, fill_value=0.0) for f in (self.n, self.mean, self.m2))
+        n_b, mean_b, m2_b = (f.reindex(index, fill_value=0.0) for f in (n_b, mean_b, m2_b))
+
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        weight = (n_b / n.where(n > 0)).fillna(0.0)
+        self.mean = mean_a + delta * weight
+        self.m2 = m2_a + m2_b + delta ** 2 * n_a * weight
+        self.n = n
+
+    def merge(self, other: "GroupedMoments") -> "GroupedMoments":
+        """Fold in moments computed elsewhere (another batch, process or host)"""
+        if other.n is not None:
+            self._merge(other.n, other.mean, other.m2)
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        """Flat frame (keys + <metric>__n/__mean/__m2) for storing partial state"""
+        parts = {f"{m}__{stat}": frame[m] for stat, frame in
+                 (('n', self.n), ('mean', self.mean), ('m2', self.m2)) for m in self.metrics}
+        return pd.DataFrame(parts).reset_index()
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, keys: Sequence[str], metrics: Sequence[str]) -> "GroupedMoments":
+        moments = cls(keys, metrics)
+        indexed = frame.set_index(list(keys))
+        if len(indexed):
+            moments.n, moments.mean, moments.m2 = (
+                indexed[[f"{m}__{stat}" for m in moments.metrics]].set_axis(moments.metrics, axis=1)
+                for stat in ('n', 'mean', 'm2'))
+        return moments
+
+    def counts(self) -> pd.DataFrame:
+        return self.n
+
+    def means(self) -> pd.DataFrame:
+        return self.mean.where(self.n > 0)
+
+    def var(self, ddof: int = 1) -> pd.DataFrame:
+        return self.m2 / (self.n - ddof).where(self.n - ddof > 0)
+
+    def std(self, ddof: int = 1) -> pd.DataFrame:
+        return np.sqrt(self.var(ddof))
+
+class GroupedDistinct:
+    """Distinct values of one column per group (memory grows with distinct values, not rows)"""
+
+    def __init__(self, keys: Sequence[str], column: str):
+        self.keys = list(keys)
+        self.column = column
+        self.pairs = pd.DataFrame(columns=self.keys + [column])
+
+    def update(self, batch: pd.DataFrame):
+        pairs = batch[self.keys + [self.column]].dropna().drop_duplicates()
+        self.pairs = pd.concat([self.pairs, pairs], ignore_index=True).drop_duplicates()
+
+    def nunique(self) -> pd.Series:
+        return self.pairs.groupby(self.keys)[self.column].size()
+
+def iter_batches(path: str, columns: List[str], batch_rows: int = BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    """Record batches of the projected columns, one bounded DataFrame at a time"""
+    parquet = pq.ParquetFile(path)
+    for batch in parquet.iter_batches(batch_size=batch_rows, columns=columns):
+        yield batch.to_pandas()
+
+def _agg_columns(spec: Dict[str, object]) -> List[str]:
+    return [c for c in spec if c != 'video_id']
+
+class OutOfCoreAnalysis:
+    """One batched scan feeding every accumulator the chunked analyses need"""
+
+    def __init__(self):
+        self.fps_agg = GroupedMoments(['tier', 'fps'], _agg_columns(FPS_AGG_FUNCS) + THRESHOLD_METRICS)
+        self.anova = GroupedMoments(['fps', 'tier'], ANOVA_METRICS)
+        self.tier_summary = GroupedMoments(['tier'], _agg_columns(TIER_SUMMARY_AGG))
+        self.tier_videos = GroupedDistinct(['tier'], 'video_id')
+        self.fps_summary = GroupedMoments(['fps'], _agg_columns(FPS_SUMMARY_AGG))
+        self.row_counts = {}    # grouping keys -> Series of non-null video_id counts
+        self.tier_order = []    # first-appearance order, as df['tier'].unique() gives
+        self.rows = 0
+        self.batches = 0
+
+    @property
+    def columns(self) -> List[str]:
+        metrics = set(self.fps_agg.metrics + self.anova.metrics + self.tier_summary.metrics)
+        return ['video_id', 'tier', 'fps'] + sorted(metrics)
+
+    def _count_rows(self, batch: pd.DataFrame, keys: Sequence[str]):
+        counts = batch.groupby(list(keys), sort=False)['video_id'].count()
+        prev = self.row_counts.get(tuple(keys))
+        self.row_counts[tuple(keys)] = counts if prev is None else prev.add(counts, fill_value=0)
+
+    def update(self, batch: pd.DataFrame):
+        for tier in batch['tier'].dropna().unique():
+            if tier not in self.tier_order:
+                self.tier_order.append(tier)
+        self.fps_agg.update(batch)
+        self.anova.update(batch[batch['tier'].isin(ANOVA_TIERS)])
+        self.tier_summary.update(batch)
+        self.tier_videos.update(batch)
+        self.fps_summary.update(batch)
+        self._count_rows(batch, ['tier', 'fps'])
+        self._count_rows(batch, ['fps'])
+        self.rows += len(batch)
+        self.batches += 1
+
+    def scan(self, path: str, batch_rows: int = BATCH_ROWS) -> "OutOfCoreAnalysis":
+        for batch in iter_batches(path, self.columns, batch_rows):
+            self.update(batch)
+        return self
+
+    def fps_aggregates(self) -> pd.DataFrame:
+        """Same frame as process_results.compute_fps_aggregates"""
+        means = self.fps_agg.means()[_agg_columns(FPS_AGG_FUNCS)]
+        means['video_count'] = self.row_counts[('tier', 'fps')].reindex(means.index).astype(int)
+        return means.sort_index().reset_index()
+
+    def anova_results(self) -> pd.DataFrame:
+        """Same table as statistical_analysis.run_anova_tests, from group moments"""
+        n, mean, m2 = self.anova.counts(), self.anova.means(), self.anova.m2
+        results = []
+        for fps in sorted(n.index.get_level_values('fps').unique()):
+            for metric in ANOVA_METRICS:
+                groups = [(t, n.at[(fps, t), metric]) for t in ANOVA_TIERS if (fps, t) in n.index]
+                groups = [t for t, count in groups if count > 0]
+                if len(groups) < 2:
+                    continue
+                ns = np.array([n.at[(fps, t), metric] for t in groups])
+                means = np.array([mean.at[(fps, t), metric] for t in groups])
+                ss_within = sum(m2.at[(fps, t), metric] for t in groups)
+
+                total = ns.sum()
+                grand_mean = (ns * means).sum() / total
+                ss_between = (ns * (means - grand_mean) ** 2).sum()
+                df_between, df_within = len(groups) - 1, total - len(groups)
+
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    f_stat = (ss_between / df_between) / (ss_within / df_within) if df_within > 0 else np.nan
+                p_value = stats.f.sf(f_stat, df_between, df_within) if df_within > 0 else np.nan
+                ss_total = ss_between + ss_within
+                eta_squared = ss_between / ss_total if ss_total > 0 else 0
+
+                results.append({
+                    'fps': fps,
+                    'metric': metric,
+                    'f_statistic': f_stat,
+                    'p_value': p_value,
+                    'eta_squared': eta_squared,
+                    'significant': p_value < 0.05,
+                    'effect_size': effect_size_label(eta_squared),
+                })
+        return pd.DataFrame(results)
+
+    def fps_thresholds(self) -> pd.DataFrame:
+        """Same table as statistical_analysis.analyze_fps_thresholds, from tier x fps means"""
+        means = self.fps_agg.means()
+        results = []
+        for tier in self.tier_order:
+            tier_means = means.xs(tier, level='tier').sort_index()
+            for metric in THRESHOLD_METRICS:
+                fps_means = tier_means[metric]
+                if len(fps_means) < 2:
+                    continue
+                results.append(fps_threshold_row(tier, metric, fps_means))
+        return pd.DataFrame(results)
+
+    def _summary(self, spec: Dict[str, object], moments: GroupedMoments, video_stat: pd.Series) -> pd.DataFrame:
+        multi = any(isinstance(funcs, list) for funcs in spec.values())
+        columns = {}
+        for column, funcs in spec.items():
+            for func in (funcs if isinstance(funcs, list) else [funcs]):
+                if column == 'video_id':
+                    values = video_stat
+                elif func == 'mean':
+                    values = moments.means()[column]
+                elif func == 'std':
+                    values = moments.std()[column]
+                else:
+                    raise ValueError(f"Unsupported out-of-core aggregation: {func}")
+                columns[(column, func) if multi else column] = values
+        summary = pd.DataFrame(columns).sort_index()
+        if multi:
+            summary.columns = pd.MultiIndex.from_tuples(summary.columns)
+        return summary.round(2)
+
+    def summary_stats(self) -> tuple:
+        """Same tables as visualize_results.generate_summary_stats"""
+        tier_summary = self._summary(TIER_SUMMARY_AGG, self.tier_summary, self.tier_videos.nunique())
+        fps_summary = self._summary(FPS_SUMMARY_AGG, self.fps_summary,
+                                    self.row_counts[('fps',)].astype(int))
+        return tier_summary, fps_summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched, bounded-memory versions of the grouped analyses")
+    parser.add_argument('--input', default="analysis/signals_df.parquet")
+    parser.add_argument('--output-dir', default="analysis/figures")
+    parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("OUT-OF-CORE ANALYSIS")
+    print("=" * 60)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    analysis = OutOfCoreAnalysis().scan(args.input, args.batch_rows)
+    print(f"\nScanned {analysis.rows:,} rows in {analysis.batches} batches "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    agg_path = output_dir / 'metrics_by_fps.parquet'
+    analysis.fps_aggregates().to_parquet(agg_path, index=False)
+    print(f"✅ Saved: {agg_path}")
+
+    save_anova_results(analysis.anova_results(), output_dir)
+    save_fps_thresholds(analysis.fps_thresholds(), output_dir)
+    save_summary_stats(*analysis.summary_stats(), output_dir)
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nPeak RSS: {peak_mb:.0f} MB (batch size {args.batch_rows:,} rows)")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling hooks for the analysis scripts.
+
+Enable with FRMP_PROFILE=1 (or FRMP_PROFILE=<output dir>) or by passing
+--profile to any instrumented script, whose main calls enable(). Every
+top-level function in the script is wrapped to record wall time, CPU
+time and peak traced allocation per call, along with parquet loads,
+scipy tests and figure saves. One Chrome trace (open in chrome://tracing
+or Perfetto) is written per run. When profiling is off, instrument()
+leaves the functions untouched.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+ENV_VAR = "FRMP_PROFILE"
+DEFAULT_DIR = "analysis/profiles"
+
+# Library calls worth separating from the functions that make them
+LIBRARY_HOOKS = [
+    ('pandas', 'read_parquet', 'io'),
+    ('matplotlib.pyplot', 'savefig', 'render'),
+    ('scipy.stats', 'f_oneway', 'stats'),
+    ('scipy.stats', 'ttest_ind', 'stats'),
+]
+
+class Tracer:
+    """Collects one complete ('X') trace event per instrumented call"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = Path(output_dir)
+        self.events: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+        self._stack = threading.local()
+        tracemalloc.start()
+        atexit.register(self.write)
+
+    def _frames(self) -> list:
+        if not hasattr(self._stack, 'frames'):
+            self._stack.frames = []
+        return self._stack.frames
+
+    def wrap(self, fn, name: str, category: str):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            frames = self._frames()
+            current, peak = tracemalloc.get_traced_memory()
+            if frames:
+                # Fold the caller's peak so far in before resetting it for this call
+                frames[-1]['peak'] = max(frames[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame = {'base': current, 'peak': current}
+            frames.append(frame)
+
+            start, cpu_start = time.perf_counter(), time.process_time()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+                frames.pop()
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                if frames:
+                    frames[-1]['peak'] = max(frames[-1]['peak'], peak)
+                self.events.append({
+                    'name': name,
+                    'cat': category,
+                    'ph': 'X',
+                    'ts': (start - self.origin) * 1e6,
+                    'dur': wall * 1e6,
+                    'pid': os.getpid(),
+                    'tid': threading.get_ident(),
+                    'args': {'cpu_ms': cpu * 1e3, 'peak_alloc_mb': (peak - frame['base']) / 1e6},
+                })
+        wrapper.__wrapped_by_perf_trace__ = True
+        return wrapper
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-function totals, slowest first"""
+        totals = defaultdict(lambda: {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'peak_alloc_mb': 0.0})
+        for event in self.events:
+            t = totals[event['name']]
+            t['calls'] += 1
+            t['wall_s'] += event['dur'] / 1e6
+            t['cpu_s'] += event['args']['cpu_ms'] / 1e3
+            t['peak_alloc_mb'] = max(t['peak_alloc_mb'], event['args']['peak_alloc_mb'])
+        return sorted(({'name': k, **v} for k, v in totals.items()), key=lambda r: -r['wall_s'])
+
+    def write(self) -> Optional[Path]:
+        if not self.events:
+            return None
+        script = Path(sys.argv[0]).stem or 'python'
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{script}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.trace.json"
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms',
+                       'otherData': {'argv': sys.argv, 'summary': self.summary()}}, f)
+
+        print(f"\n{'Function':<40} {'Calls':>6} {'Wall (s)':>9} {'CPU (s)':>9} {'Peak (MB)':>10}")
+        for row in self.summary()[:20]:
+            print(f"{row['name'][:40]:<40} {row['calls']:>6} {row['wall_s']:>9.2f} "
+                  f"{row['cpu_s']:>9.2f} {row['peak_alloc_mb']:>10.1f}")
+        print(f"✅ Saved: {path}")
+        return path
+
+_tracer: Optional[Tracer] = None
+_namespaces: List[tuple] = []     # (namespace, skip) passed to instrument(), for enable()
+
+def enabled() -> bool:
+    """True if profiling was requested via the environment"""
+    return os.environ.get(ENV_VAR, "").lower() not in ("", "0", "false", "no")
+
+def enable():
+    """Turn profiling on from a script's --profile flag (worker processes inherit it)"""
+    os.environ.setdefault(ENV_VAR, "1")
+    for namespace, skip in _namespaces:
+        instrument(namespace, skip)
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        value = os.environ.get(ENV_VAR, "1")
+        _tracer = Tracer(DEFAULT_DIR if value.lower() in ("1", "true", "yes") else value)
+        _hook_libraries(_tracer)
+    return _tracer
+
+def _hook_libraries(tracer: Tracer):
+    import importlib
+    for module_name, attr, category in LIBRARY_HOOKS:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        fn = getattr(module, attr, None)
+        if fn is not None and not getattr(fn, '__wrapped_by_perf_trace__', False):
+            setattr(module, attr, tracer.wrap(fn, f"{module_name}.{attr}", category))
+
+def instrument(namespace: Dict[str, Any], skip: Iterable[str] = ()) -> None:
+    """
+    Wrap the top-level functions defined in a module namespace (pass globals()).
+    Per-item helpers called thousands of times should be listed in skip.
+    The namespace is remembered so a later enable() can still wrap it.
+    """
+    skip = set(skip)
+    if not any(ns is namespace for ns, _ in _namespaces):
+        _namespaces.append((namespace, skip))
+    if not enabled():
+        return
+    tracer = get_tracer()
+    module = namespace.get('__name__', '')
+    category = Path(namespace.get('__file__', module)).stem
+    for name, obj in list(namespace.items()):
+        if (inspect.isfunction(obj) and obj.__module__ == module and name not in skip
+                and not inspect.isgeneratorfunction(obj)
+                and not getattr(obj, '__wrapped_by_perf_trace__', False)):
+            namespace[name] = tracer.wrap(obj, f"{category}.{name}", category)
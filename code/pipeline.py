@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Dependency-tracked runner for the analysis stages.
+
+Each stage declares the files it reads and writes. A stage is skipped when
+its script, the local modules it (transitively) imports and the content
+hashes of its inputs match the last successful run and all of its outputs
+still exist. Stages whose dependencies are
+satisfied run concurrently, each in its own process.
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from content_hash import hash_path
+
+STATE_PATH = "analysis/.pipeline_state.json"
+FIGURES = "analysis/figures"
+
+# Inputs may be files or directories (hashed over every file beneath them)
+STAGES = [
+    {
+        'name': 'process_results',
+        'script': 'code/process_results.py',
+        'inputs': ['data/clean_results'],
+        'outputs': ['analysis/signals_df.parquet', 'analysis/metrics_by_fps.parquet',
+                    'analysis/signal_stability.parquet'],
+    },
+    {
+        'name': 'statistical_analysis',
+        'script': 'code/statistical_analysis.py',
+        'inputs': ['analysis/signals_df.parquet'],
+        'outputs': [f'{FIGURES}/{name}' for name in [
+            'temporal_analysis.png', 'frame_level_patterns.png', 'anova_results.csv',
+            'anova_effect_sizes.png', 'pairwise_comparisons.csv', 'fps_thresholds.csv',
+            'fps_thresholds.png', 'variance_analysis.png', 'correlation_matrix.png',
+            'box_comparisons.png', 'publication_summary.csv']],
+    },
+    {
+        'name': 'complete_gaps',
+        'script': 'code/complete_gaps.py',
+        'inputs': ['analysis/signals_df.parquet'],
+        'outputs': [f'{FIGURES}/{name}' for name in [
+            'validation_comparison.png', 'validation_comparison.csv', 'dataset_deviation.md']],
+    },
+    {
+        # Overwrites complete_gaps' AD tier mapping with the plateau-based version
+        'name': 'fix_gaps',
+        'script': 'code/fix_gaps.py',
+        'inputs': ['analysis/signals_df.parquet'],
+        'outputs': [f'{FIGURES}/{name}' for name in [
+            'ad_tier_fps_mapping.csv', 'ad_tier_fps_requirements.png',
+            'validation_comparison_normalized.png', 'validation_comparison_normalized.csv']],
+        'after': ['complete_gaps'],
+    },
+    {
+        'name': 'visualize_results',
+        'script': 'code/visualize_results.py',
+        'inputs': ['analysis/signals_df.parquet', 'analysis/metrics_by_fps.parquet',
+                   'analysis/signal_stability.parquet'],
+        'outputs': [f'{FIGURES}/{name}' for name in [
+            'signal_by_fps.png', 'diminishing_returns.png', 'stability_heatmap.png',
+            'tier_comparison.png', 'tier_summary.csv', 'fps_summary.csv']],
+    },
+    {
+        'name': 'bracket_analysis',
+        'script': 'code/bracket_analysis.py',
+        'inputs': ['analysis/signals_df.parquet', 'reproduction/video_manifest.csv'],
+        'outputs': [f'{FIGURES}/bracket_saturation_curves.csv', f'{FIGURES}/bracket_thresholds.csv'],
+    },
+]
+
+def local_imports(script: Path) -> List[Path]:
+    """Sibling modules a script imports, directly or through other siblings (lazy imports included)"""
+    found, todo = set(), [script]
+    while todo:
+        tree = ast.parse(todo.pop().read_text())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module = script.parent / f"{name.split('.')[0]}.py"
+                if module.is_file() and module != script and module not in found:
+                    found.add(module)
+                    todo.append(module)
+    return sorted(found)
+
+def stage_dependencies(stages: List[Dict[str, Any]]) -> Dict[str, set]:
+    """Stage name -> names of stages that produce its inputs or must precede it"""
+    producers = {out: s['name'] for s in stages for out in s['outputs']}
+    return {
+        s['name']: {producers[i] for i in s['inputs'] if i in producers} | set(s.get('after', []))
+        for s in stages
+    }
+
+class Pipeline:
+    """Runs stages in dependency order, skipping those whose inputs are unchanged"""
+
+    def __init__(self, stages: List[Dict[str, Any]] = STAGES, root: str = ".",
+                 state_path: str = STATE_PATH, workers: int = 4):
+        self.stages = {s['name']: s for s in stages}
+        self.deps = stage_dependencies(stages)
+        self.root = Path(root)
+        self.state_path = self.root / state_path
+        self.workers = workers
+        self.state = json.loads(self.state_path.read_text()) if self.state_path.exists() else {}
+
+    def fingerprint(self, stage: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        script = self.root / stage['script']
+        modules = [str(m.relative_to(self.root)) for m in local_imports(script)] if script.exists() else []
+        paths = [stage['script']] + modules + stage['inputs']
+        return {p: hash_path(self.root / p) for p in paths}
+
+    def status(self, stage: Dict[str, Any]) -> str:
+        """'fresh', 'stale', 'unavailable' (inputs missing, outputs kept) or 'blocked'"""
+        fingerprint = self.fingerprint(stage)
+        outputs_exist = all((self.root / p).exists() for p in stage['outputs'])
+        if any(h is None for h in fingerprint.values()):
+            # e.g. raw results not unpacked: keep the committed outputs
+            return 'unavailable' if outputs_exist else 'blocked'
+        recorded = self.state.get(stage['name'], {}).get('fingerprint')
+        return 'fresh' if outputs_exist and recorded == fingerprint else 'stale'
+
+    def _run_stage(self, name: str) -> Dict[str, Any]:
+        stage = self.stages[name]
+        env = {**os.environ, 'MPLBACKEND': 'Agg'}
+        (self.root / FIGURES).mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, stage['script']], cwd=self.root, env=env,
+                              capture_output=True, text=True)
+        return {'returncode': proc.returncode, 'wall_time_s': time.perf_counter() - start,
+                'output': proc.stdout + proc.stderr}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.state, indent=2))
+        tmp.replace(self.state_path)
+
+    def run(self, targets: Optional[List[str]] = None, force: bool = False,
+            verbose: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Run the targets (default: all stages) plus anything upstream of them"""
+
+        wanted = set(targets or self.stages)
+        pending = set()
+        while wanted - pending:
+            name = (wanted - pending).pop()
+            pending.add(name)
+            wanted |= self.deps[name]
+        scheduled = set(pending)
+        report, done, failed = {}, set(), set()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                for name in sorted(pending):
+                    deps = self.deps[name] & scheduled
+                    if deps & failed:
+                        pending.discard(name)
+                        failed.add(name)
+                        report[name] = {'status': 'skipped (upstream failed)', 'wall_time_s': 0.0}
+                    elif deps <= done:
+                        pending.discard(name)
+                        # checked only now, so fingerprints see what upstream just wrote
+                        status = self.status(self.stages[name])
+                        if status == 'blocked':
+                            failed.add(name)
+                            report[name] = {'status': 'blocked (inputs missing)', 'wall_time_s': 0.0}
+                        elif status == 'unavailable':
+                            done.add(name)
+                            report[name] = {'status': 'kept (inputs missing)', 'wall_time_s': 0.0}
+                        elif status == 'fresh' and not force:
+                            done.add(name)
+                            report[name] = {'status': 'up to date', 'wall_time_s': 0.0}
+                        else:
+                            running[pool.submit(self._run_stage, name)] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    result = future.result()
+                    if verbose or result['returncode'] != 0:
+                        print(f"\n--- {name} ---\n{result['output'].rstrip()}")
+                    if result['returncode'] == 0:
+                        done.add(name)
+                        self.state[name] = {'fingerprint': self.fingerprint(self.stages[name]),
+                                            'wall_time_s': result['wall_time_s'],
+                                            'finished_at': time.time()}
+                        self._save_state()
+                        report[name] = {'status': 'ran', 'wall_time_s': result['wall_time_s']}
+                    else:
+                        failed.add(name)
+                        report[name] = {'status': f"failed (exit {result['returncode']})",
+                                        'wall_time_s': result['wall_time_s']}
+                    print(f"  {name}: {report[name]['status']} in {result['wall_time_s']:.1f}s", flush=True)
+
+        return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the analysis stages, skipping unchanged ones")
+    parser.add_argument('stages', nargs='*', help="Stages to bring up to date (default: all)")
+    parser.add_argument('--force', action='store_true', help="Rerun stages even if their inputs are unchanged")
+    parser.add_argument('--workers', type=int, default=4, help="Stages run concurrently")
+    parser.add_argument('--dry-run', action='store_true', help="Only show which stages are stale")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Print each stage's output")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write a Chrome trace per stage (see perf_trace.py)")
+    args = parser.parse_args()
+
+    if args.profile:
+        os.environ['FRMP_PROFILE'] = '1'
+    if args.force:
+        os.environ['FRMP_FORCE_RENDER'] = '1'     # also re-render unchanged figures (figure_cache.py)
+
+    pipeline = Pipeline(workers=args.workers)
+    unknown = set(args.stages) - set(pipeline.stages)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    print("=" * 60)
+    print("ANALYSIS PIPELINE")
+    print("=" * 60)
+
+    if args.dry_run:
+        print()
+        for name, stage in pipeline.stages.items():
+            deps = ', '.join(sorted(pipeline.deps[name])) or '-'
+            print(f"  {name:<22} {pipeline.status(stage):<8} (after: {deps})")
+        return 0
+
+    print()
+    start = time.perf_counter()
+    report = pipeline.run(args.stages or None, force=args.force, verbose=args.verbose)
+    total = time.perf_counter() - start
+
+    print(f"\n{'Stage':<22} {'Status':<26} {'Wall (s)':>8}")
+    for name in pipeline.stages:
+        if name in report:
+            print(f"{name:<22} {report[name]['status']:<26} {report[name]['wall_time_s']:>8.1f}")
+    print(f"\nTotal wall time: {total:.1f}s")
+
+    failed = [n for n, r in report.items()
+              if r['status'] not in ('ran', 'up to date', 'kept (inputs missing)')]
+    if failed:
+        print(f"⚠️  Not completed: {', '.join(failed)}")
+        return 1
+    print("✅ Pipeline up to date")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@
 Process raw JSON results into analysis-ready DataFrames
 """
 
+import argparse
+import contextlib
 import json
 import pandas as pd
 import numpy as np
@@ -10,6 +12,8 @@ from pathlib import Path
 from tqdm import tqdm
 from typing import Dict, List, Any
 
+import perf_trace
+
 # Tier mapping
 TIER_MAP = {
     "ave": "cinema",
@@ -18,6 +22,36 @@ TIER_MAP = {
     "produced_digital/musicvideos": "produced_digital",
 }
 
+# Study 0 extraction ladder (fps)
+FPS_LADDER = [0.5, 1, 2, 3, 5, 8, 10, 12, 15, 24, 30, 45, 60, 120, 240]
+
+# Study 1 extraction rates; each clip is also extracted at its native fps
+STUDY1_FPS_LEVELS = [15, 24, 30]
+
+# Signal stability rules (a metric is stable once a rung changes it < 5%)
+STABILITY_METRICS = [
+    'scene_count', 'transition_count', 'unique_object_count',
+    'person_count_mean', 'intensity_mean'
+]
+STABILITY_THRESHOLD = 0.05
+
+# Per tier x fps aggregates written to metrics_by_fps.parquet
+FPS_AGG_FUNCS = {
+    'frame_count': 'mean',
+    'scene_count': 'mean',
+    'transition_count': 'mean',
+    'person_count_mean': 'mean',
+    'unique_object_count': 'mean',
+    'objects_per_frame_mean': 'mean',
+    'intensity_mean': 'mean',
+    'character_consistency': 'mean',
+    'video_id': 'count',  # count of videos
+}
+
+def result_filename(video_id: str, fps: float) -> str:
+    """Canonical result file name for one (video, fps) extraction"""
+    return f"{video_id}_{fps:g}fps.json"
+
 def load_result(filepath: Path) -> Dict[str, Any]:
     """Load a single result JSON file"""
     with open(filepath) as f:
@@ -32,6 +66,14 @@ def safe_mean(lst):
     except:
         return 0.0
 
+def _load_files(files):
+    """Yield loaded result files, with None in place of any that fail to load"""
+    for filepath in files:
+        try:
+            yield load_result(filepath)
+        except Exception:
+            yield None
+
 def extract_metrics(data: Dict) -> Dict[str, Any]:
     """Extract key metrics from a result file"""
     
@@ -94,26 +136,37 @@ def extract_metrics(data: Dict) -> Dict[str, Any]:
     }
 
 def process_all_results(base_path: str = "data/clean_results") -> pd.DataFrame:
-    """Process all result files into a DataFrame"""
-    
-    base = Path(base_path)
-    all_files = list(base.rglob("*.json"))
-    
-    print(f"Processing {len(all_files)} result files...")
+    """Process all result files (or a packed result store) into a DataFrame"""
     
-    records = []
-    skipped = 0
+    from result_store import ResultStore, is_store
     
-    for filepath in tqdm(all_files):
-        try:
-            data = load_result(filepath)
-            metrics = extract_metrics(data)
-            if metrics:
-                records.append(metrics)
-            else:
+    with contextlib.ExitStack() as stack:
+        if is_store(base_path):
+            store = stack.enter_context(ResultStore(base_path))
+            print(f"Processing {len(store)} results from packed store...")
+            results = store.scan()
+            total = len(store)
+        else:
+            all_files = list(Path(base_path).rglob("*.json"))
+            print(f"Processing {len(all_files)} result files...")
+            results = _load_files(all_files)
+            total = len(all_files)
+        
+        records = []
+        skipped = 0
+        
+        for data in tqdm(results, total=total):
+            if data is None:
+                skipped += 1
+                continue
+            try:
+                metrics = extract_metrics(data)
+                if metrics:
+                    records.append(metrics)
+                else:
+                    skipped += 1
+            except Exception as e:
                 skipped += 1
-        except Exception as e:
-            skipped += 1
     
     print(f"  Processed: {len(records)}, Skipped: {skipped}")
     
@@ -123,32 +176,23 @@ def process_all_results(base_path: str = "data/clean_results") -> pd.DataFrame:
 def compute_fps_aggregates(df: pd.DataFrame) -> pd.DataFrame:
     """Compute aggregate metrics by FPS level and tier"""
     
-    agg_funcs = {
-        'frame_count': 'mean',
-        'scene_count': 'mean',
-        'transition_count': 'mean',
-        'person_count_mean': 'mean',
-        'unique_object_count': 'mean',
-        'objects_per_frame_mean': 'mean',
-        'intensity_mean': 'mean',
-        'character_consistency': 'mean',
-        'video_id': 'count',  # count of videos
-    }
-    
-    grouped = df.groupby(['tier', 'fps']).agg(agg_funcs).reset_index()
+    grouped = df.groupby(['tier', 'fps']).agg(FPS_AGG_FUNCS).reset_index()
     grouped = grouped.rename(columns={'video_id': 'video_count'})
     
     return grouped
 
+def is_stable_step(prev: float, curr: float) -> bool:
+    """True if moving up one FPS rung changed a metric by less than the threshold"""
+    if prev > 0:
+        return abs(curr - prev) / prev < STABILITY_THRESHOLD
+    return False
+
 def compute_signal_stability(df: pd.DataFrame) -> pd.DataFrame:
     """
     Compute signal stability across FPS levels
     """
     
-    metrics = [
-        'scene_count', 'transition_count', 'unique_object_count',
-        'person_count_mean', 'intensity_mean'
-    ]
+    metrics = STABILITY_METRICS
     
     results = []
     
@@ -174,11 +218,9 @@ def compute_signal_stability(df: pd.DataFrame) -> pd.DataFrame:
                 # Find stabilization point (where change < 5%)
                 stable_fps = fps_levels[-1]
                 for i in range(1, len(values)):
-                    if values[i-1] > 0:
-                        change = abs(values[i] - values[i-1]) / values[i-1]
-                        if change < 0.05:
-                            stable_fps = fps_levels[i]
-                            break
+                    if is_stable_step(values[i-1], values[i]):
+                        stable_fps = fps_levels[i]
+                        break
                 
                 results.append({
                     'tier': tier,
@@ -192,7 +234,16 @@ def compute_signal_stability(df: pd.DataFrame) -> pd.DataFrame:
     
     return pd.DataFrame(results)
 
+perf_trace.instrument(globals(), skip={'load_result', 'safe_mean', 'extract_metrics', 'is_stable_step', 'result_filename'})
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process raw result JSONs into the analysis parquet files")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write a Chrome trace of this run (see perf_trace.py)")
+    args = parser.parse_args()
+    if args.profile:
+        perf_trace.enable()
+
     print("=" * 60)
     print("PROCESSING RESULTS")
     print("=" * 60)
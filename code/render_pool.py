@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Parallel figure rendering for the analysis scripts.
+
+A figure job names a plotting function and the shared inputs it reads. The
+inputs are computed once in the parent (already projected to the columns
+each figure needs) and handed to every worker at start-up, so jobs carry
+only keys rather than pickled DataFrames. Workers render with the Agg
+backend; their console output is collected and replayed in the parent.
+Jobs whose fingerprint is unchanged are skipped (see figure_cache.py).
+"""
+
+import contextlib
+import inspect
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+from figure_cache import FigureCache
+
+_shared: Dict[str, Any] = {}
+
+def figure_job(func: Callable, *inputs: str, outputs: List[str] = ()) -> Dict[str, Any]:
+    """A render job: func(*shared[inputs], output_dir), writing outputs (relative to output_dir)"""
+    return {'name': func.__name__, 'func': func, 'inputs': list(inputs), 'outputs': list(outputs)}
+
+def project(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Only the columns one figure reads (categoricals stay categoricals)"""
+    return df[[c for c in dict.fromkeys(columns) if c in df.columns]]
+
+def _init_worker(shared: Dict[str, Any]):
+    global _shared
+    import matplotlib
+    matplotlib.use('Agg')
+    _shared = shared
+
+def _render(job: Dict[str, Any], output_dir: Path) -> Dict[str, Any]:
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        result = job['func'](*[_shared[k] for k in job['inputs']], output_dir)
+    return {'name': job['name'], 'result': result, 'output': out.getvalue(),
+            'wall_time_s': time.perf_counter() - start}
+
+def render_parallel(jobs: List[Dict[str, Any]], shared: Dict[str, Any], output_dir: Path,
+                    workers: int = None) -> Dict[str, Any]:
+    """Run independent figure jobs in a process pool; returns each job's return value by name"""
+
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    results = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(shared,)) as pool:
+        futures = [pool.submit(_render, job, output_dir) for job in jobs]
+        for future in as_completed(futures):
+            done = future.result()
+            print(done['output'], end='')
+            print(f"   ({done['name']}: {done['wall_time_s']:.1f}s)")
+            results[done['name']] = done['result']
+
+    print(f"Rendered {len(jobs)} jobs on {workers} workers in {time.perf_counter() - start:.1f}s")
+    return results
+
+def render(jobs: List[Dict[str, Any]], shared: Dict[str, Any], output_dir: Path,
+           workers: int = 0, force: bool = False) -> Dict[str, Any]:
+    """Run the jobs whose fingerprint changed (serially, or on workers); reuse the rest"""
+
+    script = Path(inspect.getsourcefile(inspect.unwrap(jobs[0]['func']))).stem if jobs else ''
+    cache = FigureCache(output_dir, script, force)
+    fingerprints = {job['name']: cache.fingerprint(job, shared) for job in jobs}
+    stale = [job for job in jobs if not cache.is_fresh(job, fingerprints[job['name']])]
+
+    results = {}
+    for job in jobs:
+        if job not in stale:
+            results[job['name']] = cache.result(job['name'])
+            print(f"⏭️  Up to date: {', '.join(job['outputs'])}")
+
+    if workers and stale:
+        rendered = render_parallel(stale, shared, output_dir, workers)
+    else:
+        rendered = {job['name']: job['func'](*[shared[k] for k in job['inputs']], output_dir)
+                    for job in stale}
+    for job in stale:
+        cache.record(job, fingerprints[job['name']], rendered[job['name']])
+    results.update(rendered)
+    return results
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Disk-backed cache of per-frame VLM signal outputs, keyed by
+(video sha256, source frame index, prompt/model version)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+CACHE_PATH = "data/cache/vlm_responses.sqlite"
+DEFAULT_MAX_BYTES = 20 * 1024 ** 3
+SQLITE_BATCH = 500  # stay under SQLite's bound-parameter limit
+BUSY_TIMEOUT_S = 60     # writers wait this long for the write lock
+BUMP_TIMEOUT_MS = 50    # access-time bumps give up almost at once instead
+
+def cache_key(video_sha256: str, frame_index: int, model_version: str) -> str:
+    return f"{video_sha256}:{int(frame_index)}:{model_version}"
+
+def encode_value(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(',', ':')).encode())
+
+def decode_value(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+def load_video_hashes(manifest_path: str = "reproduction/video_manifest.csv") -> Dict[str, str]:
+    """video_id -> sha256 from the video manifest"""
+    manifest = pd.read_csv(manifest_path, usecols=['video_id', 'sha256'])
+    return dict(zip(manifest['video_id'], manifest['sha256']))
+
+class MemoryCacheBackend:
+    """In-process LRU backend; the local stub used for tests and dry runs"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, bytes]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    found[key] = self.entries[key]
+        return found
+
+    def put_many(self, items: Dict[str, bytes]):
+        with self._lock:
+            for key, blob in items.items():
+                if key in self.entries:
+                    self.total_bytes -= len(self.entries.pop(key))
+                self.entries[key] = blob
+                self.total_bytes += len(blob)
+            while self.total_bytes > self.max_bytes and self.entries:
+                _, blob = self.entries.popitem(last=False)
+                self.total_bytes -= len(blob)
+                self.evictions += 1
+
+    def size_bytes(self) -> int:
+        return self.total_bytes
+
+class SQLiteCacheBackend:
+    """
+    Size-bounded LRU on a single SQLite file. WAL mode lets readers run
+    alongside one writer; writes take an immediate lock so concurrent
+    processes and threads serialise cleanly.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        # Running byte total, kept in step with entries by triggers so every process sees it
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute("""
+            INSERT OR IGNORE INTO meta (key, value)
+            SELECT 'total_size', COALESCE(SUM(size), 0) FROM entries""")
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+                UPDATE meta SET value = value + NEW.size WHERE key = 'total_size';
+            END""")
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+                UPDATE meta SET value = value + NEW.size - OLD.size WHERE key = 'total_size';
+            END""")
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+                UPDATE meta SET value = value - OLD.size WHERE key = 'total_size';
+            END""")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_S, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, bytes]:
+        conn = self._conn()
+        found = {}
+        for i in range(0, len(keys), SQLITE_BATCH):
+            chunk = list(keys[i:i + SQLITE_BATCH])
+            marks = ','.join('?' * len(chunk))
+            rows = conn.execute(f"SELECT key, value FROM entries WHERE key IN ({marks})", chunk).fetchall()
+            found.update(rows)
+            if rows:
+                # Access-time bumps are best effort; a busy writer just means stale LRU order
+                conn.execute(f"PRAGMA busy_timeout = {BUMP_TIMEOUT_MS}")
+                try:
+                    conn.execute(f"UPDATE entries SET last_access = ? WHERE key IN ({marks})",
+                                 [time.time()] + chunk)
+                except sqlite3.OperationalError:
+                    pass
+                finally:
+                    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_S * 1000}")
+        return found
+
+    def put_many(self, items: Dict[str, bytes]):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "last_access = excluded.last_access",
+                [(key, blob, len(blob), now) for key, blob in items.items()])
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = self._total(conn)
+        if total <= self.max_bytes:
+            return
+        # Walk from least recently used until enough bytes are freed
+        excess = total - self.max_bytes
+        victims, freed = [], 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    @staticmethod
+    def _total(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT value FROM meta WHERE key = 'total_size'").fetchone()[0]
+
+    def size_bytes(self) -> int:
+        return self._total(self._conn())
+
+class ResponseCache:
+    """Per-frame response cache for one prompt/model version, with hit/miss metrics"""
+
+    def __init__(self, backend=None, model_version: str = "v1"):
+        self.backend = SQLiteCacheBackend() if backend is None else backend
+        self.model_version = model_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, video_sha256: str, frame_indices: Sequence[int]) -> Dict[int, Any]:
+        keys = {cache_key(video_sha256, i, self.model_version): int(i) for i in frame_indices}
+        found = self.backend.get_many(list(keys))
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return {keys[k]: decode_value(blob) for k, blob in found.items()}
+
+    def put_many(self, video_sha256: str, results: Dict[int, Any]):
+        self.backend.put_many({
+            cache_key(video_sha256, i, self.model_version): encode_value(value)
+            for i, value in results.items()
+        })
+
+    def get_or_extract(self, video_sha256: str, frame_indices: Sequence[int],
+                       extract_fn: Callable[[List[int]], Sequence[Any]]) -> List[Any]:
+        """Per-frame results in input order, calling extract_fn only for cache misses"""
+        cached = self.get_many(video_sha256, frame_indices)
+        todo = [int(i) for i in frame_indices if int(i) not in cached]
+        if todo:
+            fresh = dict(zip(todo, extract_fn(todo)))
+            self.put_many(video_sha256, fresh)
+            cached.update(fresh)
+        return [cached[int(i)] for i in frame_indices]
+
+    def cached_extractor(self, video_sha256: str,
+                         extract_fn: Callable[[List[int]], Sequence[Any]]) -> Callable[[List[int]], List[Any]]:
+        """Wrap a per-video extract_fn (as used by frame_reuse.extract_shared)"""
+        return lambda indices: self.get_or_extract(video_sha256, indices, extract_fn)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.backend.evictions,
+            'size_bytes': self.backend.size_bytes(),
+        }
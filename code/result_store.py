@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Packed, content-addressed store for extraction results.
+
+Results are appended to large segment files as compressed records and
+deduplicated by the sha256 of their canonical JSON. A SQLite index maps
+(video_id, fps, study_type) to a record for random access, and bulk scans
+read segments sequentially in offset order.
+
+Layout of a store directory:
+    index.sqlite          blobs(hash -> segment, offset, length), results(key -> hash)
+    seg-00000.pack ...    records: MAGIC | u32 length | 32-byte sha256 | zlib(JSON)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import sys
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from tqdm import tqdm
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: stores open read-only, writers need flock
+    fcntl = None
+
+MAGIC = b"FRR1"
+HEADER = struct.Struct("<4sI32s")
+SEGMENT_MAX_BYTES = 1024 ** 3
+INDEX_NAME = "index.sqlite"
+STORE_PATH = "data/results.frstore"
+
+def canonical_bytes(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+
+def is_store(path) -> bool:
+    return (Path(path) / INDEX_NAME).exists()
+
+# Same rules as reproduction/verify_completion.validate_result_file: the fields
+# process_results.extract_metrics relies on
+SIGNAL_SECTIONS = ["scene_signals", "character_signals", "visual_signals",
+                   "atmosphere_signals", "action_signals", "temporal_signals"]
+
+def schema_errors(data: Any) -> list:
+    """Reasons a parsed result cannot be stored (empty if it matches the schema)"""
+    if not isinstance(data, dict):
+        return ["not a JSON object"]
+    errors = []
+    if not isinstance(data.get('video_id'), str):
+        errors.append("bad video_id")
+    if isinstance(data.get('fps'), bool) or not isinstance(data.get('fps'), (int, float)):
+        errors.append("bad fps")
+    meta = data.get('metadata')
+    if not isinstance(meta, dict) or not meta.get('tier') or not meta.get('dataset'):
+        errors.append("missing metadata.tier/dataset")
+    for section in SIGNAL_SECTIONS:
+        if data.get(section) is not None and not isinstance(data[section], dict):
+            errors.append(f"bad {section}")
+    return errors
+
+class ResultStore:
+    """Append-only packed result store (single writer, many readers)"""
+
+    def __init__(self, path: str = STORE_PATH, writable: bool = False):
+        self.path = Path(path)
+        self.writable = writable
+        self._lock = None
+        self._segment = None
+
+        if writable:
+            if fcntl is None:
+                raise OSError("Writable result stores need POSIX file locking (fcntl)")
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._lock = open(self.path / ".lock", "w")
+            fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif not is_store(self.path):
+            raise FileNotFoundError(f"No result store at {self.path}")
+
+        self.conn = sqlite3.connect(self.path / INDEX_NAME)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash BLOB PRIMARY KEY,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                video_id TEXT NOT NULL,
+                fps REAL NOT NULL,
+                study_type TEXT NOT NULL,
+                dataset TEXT,
+                hash BLOB NOT NULL REFERENCES blobs(hash),
+                PRIMARY KEY (video_id, fps, study_type)
+            );
+            CREATE INDEX IF NOT EXISTS idx_blobs_location ON blobs(segment, offset);
+        """)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+        if self._segment is not None:
+            self._segment.close()
+        if self._lock is not None:
+            self._lock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path / f"seg-{segment:05d}.pack"
+
+    def _open_segment(self):
+        """Current segment for appending, rolling over once it is full"""
+        if self._segment is None or self._segment.tell() >= SEGMENT_MAX_BYTES:
+            if self._segment is not None:
+                self._segment.close()
+            last = self.conn.execute("SELECT MAX(segment) FROM blobs").fetchone()[0]
+            segment = 0 if last is None else last
+            if self._segment_path(segment).exists() and self._segment_path(segment).stat().st_size >= SEGMENT_MAX_BYTES:
+                segment += 1
+            self._segment_id = segment
+            self._segment = open(self._segment_path(segment), "ab")
+        return self._segment_id, self._segment
+
+    def put(self, data: Dict[str, Any]) -> bool:
+        """Add one result; returns False if its content was already stored"""
+        errors = schema_errors(data)
+        if errors:
+            raise ValueError(f"Result does not match the schema: {'; '.join(errors)}")
+        meta = data['metadata']
+        raw = canonical_bytes(data)
+        digest = hashlib.sha256(raw).digest()
+
+        new_blob = self.conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None
+        if new_blob:
+            payload = zlib.compress(raw)
+            segment, f = self._open_segment()
+            offset = f.tell()
+            f.write(HEADER.pack(MAGIC, len(payload), digest) + payload)
+            self.conn.execute("INSERT INTO blobs VALUES (?, ?, ?, ?)",
+                              (digest, segment, offset, HEADER.size + len(payload)))
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+            (data['video_id'], float(data['fps']), meta.get('study_type', 'core'), meta.get('dataset'), digest))
+        return new_blob
+
+    def commit(self):
+        """Make appended records durable before the index points at them"""
+        if self._segment is not None:
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+        self.conn.commit()
+
+    def _read(self, f, offset: int, length: int) -> Dict[str, Any]:
+        f.seek(offset)
+        record = f.read(length)
+        magic, size, digest = HEADER.unpack_from(record)
+        if magic != MAGIC:
+            raise ValueError(f"Corrupt record at offset {offset}")
+        return json.loads(zlib.decompress(record[HEADER.size:HEADER.size + size]))
+
+    def get(self, video_id: str, fps: float, study_type: str = 'core') -> Optional[Dict[str, Any]]:
+        """Random access to one (video_id, fps) result"""
+        row = self.conn.execute(
+            "SELECT b.segment, b.offset, b.length FROM results r JOIN blobs b ON r.hash = b.hash "
+            "WHERE r.video_id = ? AND r.fps = ? AND r.study_type = ?",
+            (video_id, float(fps), study_type)).fetchone()
+        if row is None:
+            return None
+        with open(self._segment_path(row[0]), "rb") as f:
+            return self._read(f, row[1], row[2])
+
+    def keys(self) -> Iterator[Tuple[str, float, str, str]]:
+        """(video_id, fps, study_type, dataset) for every stored result, from the index only"""
+        return iter(self.conn.execute("SELECT video_id, fps, study_type, dataset FROM results"))
+
+    def scan(self) -> Iterator[Dict[str, Any]]:
+        """Every stored result, read sequentially segment by segment"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT b.segment, b.offset, b.length FROM results r JOIN blobs b ON r.hash = b.hash "
+            "ORDER BY b.segment, b.offset").fetchall()
+        f, current = None, None
+        try:
+            for segment, offset, length in rows:
+                if segment != current:
+                    if f is not None:
+                        f.close()
+                    f, current = open(self._segment_path(segment), "rb", buffering=8 * 1024 * 1024), segment
+                yield self._read(f, offset, length)
+        finally:
+            if f is not None:
+                f.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+def _iter_source(source: Path) -> Iterator[Tuple[str, bytes]]:
+    """(name, raw JSON bytes) from a results directory tree or a zip archive"""
+    if source.is_dir():
+        for filepath in source.rglob("*.json"):
+            yield str(filepath), filepath.read_bytes()
+    else:
+        with zipfile.ZipFile(source) as z:
+            for name in z.namelist():
+                if name.endswith(".json") and not name.startswith("__MACOSX"):
+                    yield name, z.read(name)
+
+def convert(sources, store_path: str = STORE_PATH, commit_every: int = 1000) -> Dict[str, int]:
+    """Import result JSON trees and/or zips into a packed store"""
+
+    stats = {'imported': 0, 'deduplicated': 0, 'rejected': 0}
+
+    with ResultStore(store_path, writable=True) as store:
+        for source in sources:
+            for i, (name, raw) in enumerate(tqdm(_iter_source(Path(source)), desc=str(source))):
+                try:
+                    new = store.put(json.loads(raw))
+                except ValueError:
+                    stats['rejected'] += 1
+                    continue
+                stats['imported' if new else 'deduplicated'] += 1
+                if i % commit_every == 0:
+                    store.commit()
+            store.commit()
+
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert result trees/zips into a packed result store")
+    parser.add_argument('sources', nargs='+', help="Result directories or zip archives")
+    parser.add_argument('--store', default=STORE_PATH)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PACKING RESULTS")
+    print("=" * 60)
+
+    stats = convert(args.sources, args.store)
+
+    with ResultStore(args.store) as store:
+        total = len(store)
+    size = sum(p.stat().st_size for p in Path(args.store).glob("seg-*.pack"))
+
+    print(f"\n✅ Store: {args.store} ({total} results, {size / 1e6:.1f} MB packed)")
+    print(f"  Imported: {stats['imported']}, Deduplicated: {stats['deduplicated']}, Rejected: {stats['rejected']}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Sharded ingestion of large result trees.
+
+Files are assigned to one of N shards by a hash of their path relative to
+the results root, so every host computes the same partition without
+coordination. Each shard writes a partial signals parquet plus its tier x
+fps aggregate state (mergeable moments); `merge` combines all shards into
+the usual signals_df / metrics_by_fps / signal_stability outputs.
+
+Locally, `local --num-shards N` runs N worker processes in place of nodes.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from out_of_core import GroupedMoments
+from process_results import (
+    FPS_AGG_FUNCS, compute_signal_stability, extract_metrics, load_result
+)
+
+SHARD_DIR = "data/shards"
+AGG_KEYS = ['tier', 'fps']
+AGG_METRICS = [c for c in FPS_AGG_FUNCS if c != 'video_id']
+
+def shard_of(rel_path: str, num_shards: int) -> int:
+    """Deterministic shard for a results-relative path (stable across hosts and runs)"""
+    digest = hashlib.sha1(rel_path.replace(os.sep, '/').encode()).digest()
+    return int.from_bytes(digest[:8], 'big') % num_shards
+
+def shard_files(base_path: str, shard: int, num_shards: int) -> List[Path]:
+    """Result files under base_path that belong to this shard"""
+    base = Path(base_path)
+    return sorted(p for p in base.rglob("*.json")
+                  if shard_of(str(p.relative_to(base)), num_shards) == shard)
+
+def part_name(shard: int, num_shards: int) -> str:
+    return f"part-{shard:05d}-of-{num_shards:05d}"
+
+def ingest_shard(base_path: str, shard: int, num_shards: int,
+                 output_dir: str = SHARD_DIR) -> Dict[str, Any]:
+    """Ingest one shard into a partial parquet, its aggregate state and a completion marker"""
+
+    start = time.perf_counter()
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    name = part_name(shard, num_shards)
+
+    files = shard_files(base_path, shard, num_shards)
+    records, skipped = [], 0
+    for filepath in files:
+        try:
+            metrics = extract_metrics(load_result(filepath))
+        except Exception:
+            metrics = None
+        if metrics:
+            records.append(metrics)
+        else:
+            skipped += 1
+
+    df = pd.DataFrame(records)
+    moments = GroupedMoments(AGG_KEYS, AGG_METRICS)
+    state = pd.DataFrame(columns=AGG_KEYS + ['video_count'])
+    if len(df):
+        moments.update(df)
+        state = moments.to_frame().merge(
+            df.groupby(AGG_KEYS)['video_id'].count().rename('video_count').reset_index(), on=AGG_KEYS)
+
+    # Data first, marker last: a shard only counts as done once its marker exists
+    for frame, suffix in ((df, '.parquet'), (state, '.state.parquet')):
+        tmp = out / f"{name}{suffix}.tmp"
+        frame.to_parquet(tmp, index=False)
+        tmp.replace(out / f"{name}{suffix}")
+
+    summary = {
+        'shard': shard,
+        'num_shards': num_shards,
+        'base_path': str(Path(base_path).resolve()),
+        'files': len(files),
+        'processed': len(records),
+        'skipped': skipped,
+        'elapsed_s': time.perf_counter() - start,
+        'host': os.uname().nodename,
+    }
+    (out / f"{name}.json").write_text(json.dumps(summary, indent=2))
+    return summary
+
+def merge_shards(num_shards: int, base_path: str, shard_dir: str = SHARD_DIR,
+                 output_dir: str = "analysis") -> Dict[str, Any]:
+    """Combine every completed shard of base_path into signals_df, metrics_by_fps and signal_stability"""
+
+    shard_dir, output_dir = Path(shard_dir), Path(output_dir)
+    names = [part_name(i, num_shards) for i in range(num_shards)]
+    missing = [n for n in names if not (shard_dir / f"{n}.json").exists()]
+    if missing:
+        raise FileNotFoundError(f"{len(missing)} of {num_shards} shards not finished: {', '.join(missing[:5])}")
+
+    summaries = [json.loads((shard_dir / f"{n}.json").read_text()) for n in names]
+    root = str(Path(base_path).resolve())
+    stale = [n for n, s in zip(names, summaries) if s.get('base_path') != root]
+    if stale:
+        raise ValueError(f"{len(stale)} shards in {shard_dir} were not ingested from {root} "
+                         f"(stale markers from another --input?): {', '.join(stale[:5])}")
+
+    parts = [pd.read_parquet(shard_dir / f"{n}.parquet") for n in names]
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        # Refuse rather than overwrite the analysis outputs with empty tables
+        raise ValueError(f"No results to merge: all {num_shards} shards of {root} are empty")
+    df = pd.concat(parts, ignore_index=True)
+
+    moments = GroupedMoments(AGG_KEYS, AGG_METRICS)
+    video_count = None
+    for n in names:
+        state = pd.read_parquet(shard_dir / f"{n}.state.parquet")
+        if not len(state):
+            continue
+        moments.merge(GroupedMoments.from_frame(state, AGG_KEYS, AGG_METRICS))
+        counts = state.set_index(AGG_KEYS)['video_count']
+        video_count = counts if video_count is None else video_count.add(counts, fill_value=0)
+
+    agg_df = moments.means()[AGG_METRICS]
+    agg_df['video_count'] = video_count.reindex(agg_df.index).astype(int)
+    agg_df = agg_df.sort_index().reset_index()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(output_dir / "signals_df.parquet", index=False)
+    agg_df.to_parquet(output_dir / "metrics_by_fps.parquet", index=False)
+    compute_signal_stability(df).to_parquet(output_dir / "signal_stability.parquet", index=False)
+
+    return {
+        'shards': num_shards,
+        'files': sum(s['files'] for s in summaries),
+        'processed': sum(s['processed'] for s in summaries),
+        'skipped': sum(s['skipped'] for s in summaries),
+        'slowest_shard_s': max(s['elapsed_s'] for s in summaries),
+        'rows': len(df),
+    }
+
+def _ingest(args):
+    return ingest_shard(*args)
+
+def run_local(base_path: str, num_shards: int, shard_dir: str = SHARD_DIR,
+              output_dir: str = "analysis", workers: int = None) -> Dict[str, Any]:
+    """Ingest every shard in local worker processes, then merge"""
+    jobs = [(base_path, i, num_shards, shard_dir) for i in range(num_shards)]
+    with ProcessPoolExecutor(max_workers=workers or num_shards) as pool:
+        for summary in pool.map(_ingest, jobs):
+            print(f"  shard {summary['shard']}: {summary['processed']} processed, "
+                  f"{summary['skipped']} skipped in {summary['elapsed_s']:.1f}s")
+    return merge_shards(num_shards, base_path, shard_dir, output_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded result ingestion with a merge step")
+    parser.add_argument('--input', default="data/clean_results", help="Results root")
+    parser.add_argument('--shard-dir', default=SHARD_DIR)
+    parser.add_argument('--num-shards', type=int, required=True)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('ingest', help="Ingest one shard (run once per node)")
+    p.add_argument('--shard', type=int, required=True)
+
+    p = sub.add_parser('merge', help="Combine all shards into the analysis outputs")
+    p.add_argument('--output-dir', default="analysis")
+
+    p = sub.add_parser('local', help="Ingest all shards in local processes, then merge")
+    p.add_argument('--output-dir', default="analysis")
+    p.add_argument('--workers', type=int, default=None)
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SHARDED INGESTION")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    if args.command == 'ingest':
+        if not 0 <= args.shard < args.num_shards:
+            parser.error("--shard must be in [0, --num-shards)")
+        summary = ingest_shard(args.input, args.shard, args.num_shards, args.shard_dir)
+        print(f"\n✅ Shard {args.shard}/{args.num_shards}: {summary['processed']} processed, "
+              f"{summary['skipped']} skipped -> {args.shard_dir}/")
+        return 0
+
+    try:
+        if args.command == 'local':
+            print(f"\n{args.num_shards} shards over {args.input}")
+            summary = run_local(args.input, args.num_shards, args.shard_dir, args.output_dir, args.workers)
+        else:
+            summary = merge_shards(args.num_shards, args.input, args.shard_dir, args.output_dir)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"\n⚠️  Merge failed: {e}")
+        return 1
+
+    print(f"\n✅ Merged {summary['shards']} shards: {summary['rows']} rows "
+          f"({summary['skipped']} files skipped) in {time.perf_counter() - start:.1f}s")
+    for name in ("signals_df.parquet", "metrics_by_fps.parquet", "signal_stability.parquet"):
+        print(f"✅ Saved: {Path(args.output_dir) / name}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
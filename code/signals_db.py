@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Embedded SQLite query layer over signals_df.parquet.
+
+The ingestion output is loaded into one indexed `signals` table so ad-hoc
+questions ("unique_object_count for cinema at 24 vs 30fps, videos longer
+than 60s") touch only the matching rows instead of the whole parquet.
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+DB_PATH = "analysis/signals.sqlite"
+TABLE = "signals"
+INDEXED_COLUMNS = ['tier', 'fps', 'video_id', 'study_type']
+FILTER_COLUMNS = {'tier', 'fps', 'video_id', 'study_type', 'dataset'}
+
+def build_db(parquet_path: str = "analysis/signals_df.parquet", db_path: str = DB_PATH,
+             chunksize: int = 5000) -> int:
+    """(Re)build the signals table and its indexes from the ingestion output"""
+
+    df = pd.read_parquet(parquet_path)
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(db_path).with_suffix('.sqlite.tmp')
+    tmp_path.unlink(missing_ok=True)
+
+    with sqlite3.connect(tmp_path) as conn:
+        df.to_sql(TABLE, conn, index=False, chunksize=chunksize)
+        for column in INDEXED_COLUMNS:
+            conn.execute(f"CREATE INDEX idx_{TABLE}_{column} ON {TABLE}({column})")
+        # Most questions pin a tier and a handful of fps levels
+        conn.execute(f"CREATE INDEX idx_{TABLE}_tier_fps ON {TABLE}(tier, fps)")
+        conn.execute("ANALYZE")
+    conn.close()
+
+    tmp_path.replace(db_path)
+    return len(df)
+
+class SignalsDB:
+    """Read-only query API over a built signals database"""
+
+    def __init__(self, db_path: str = DB_PATH):
+        if not Path(db_path).exists():
+            raise FileNotFoundError(f"No signals database at {db_path}; run `signals_db.py build` first")
+        self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self.columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({TABLE})")]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def sql(self, query: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        """Run arbitrary read-only SQL"""
+        return pd.read_sql_query(query, self.conn, params=list(params))
+
+    def _where(self, filters: Dict[str, Any], min_duration: Optional[float]) -> tuple:
+        clauses, params = [], []
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter on {column!r}; expected one of {sorted(FILTER_COLUMNS)}")
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(float(v) if column == 'fps' else v for v in values)
+        if min_duration is not None:
+            clauses.append("duration > ?")
+            params.append(float(min_duration))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _check_metrics(self, metrics: Sequence[str]):
+        unknown = [m for m in metrics if m not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+
+    def select(self, metrics: Sequence[str], min_duration: Optional[float] = None,
+               **filters) -> pd.DataFrame:
+        """Rows matching the filters (tier=, fps=, video_id=, study_type=, dataset=)"""
+        self._check_metrics(metrics)
+        where, params = self._where(filters, min_duration)
+        columns = ', '.join(dict.fromkeys(['video_id', 'tier', 'fps', *metrics]))
+        return self.sql(f"SELECT {columns} FROM {TABLE}{where}", params)
+
+    def aggregate(self, metrics: Sequence[str], group_by: Sequence[str] = ('tier', 'fps'),
+                  min_duration: Optional[float] = None, **filters) -> pd.DataFrame:
+        """Per-group count and mean of each metric, computed inside SQLite"""
+        self._check_metrics(list(metrics) + list(group_by))
+        where, params = self._where(filters, min_duration)
+        groups = ', '.join(group_by)
+        means = ', '.join(f"AVG({m}) AS {m}_mean" for m in metrics)
+        return self.sql(f"SELECT {groups}, COUNT(*) AS n, {means} FROM {TABLE}{where} "
+                        f"GROUP BY {groups} ORDER BY {groups}", params)
+
+    def explain(self, query: str, params: Sequence[Any] = ()) -> List[str]:
+        """SQLite query plan, to confirm a query is served by an index"""
+        return [row[-1] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {query}", list(params))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed SQLite query layer over signals_df.parquet")
+    parser.add_argument('--db', default=DB_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('build', help="Load signals_df.parquet into the database")
+    p.add_argument('--input', default="analysis/signals_df.parquet")
+
+    p = sub.add_parser('select', help="Filter rows, or aggregate them with --agg")
+    p.add_argument('--metric', nargs='+', required=True)
+    p.add_argument('--tier', nargs='+')
+    p.add_argument('--fps', type=float, nargs='+')
+    p.add_argument('--video-id', nargs='+')
+    p.add_argument('--study-type', nargs='+')
+    p.add_argument('--dataset', nargs='+')
+    p.add_argument('--min-duration', type=float, default=None, help="Only videos longer than this (seconds)")
+    p.add_argument('--agg', action='store_true', help="Count and mean per tier x fps")
+    p.add_argument('--output', default=None, help="Write the result to this CSV")
+
+    p = sub.add_parser('sql', help="Run a read-only SQL query")
+    p.add_argument('query')
+    p.add_argument('--explain', action='store_true')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        print("=" * 60)
+        print("BUILDING SIGNALS DATABASE")
+        print("=" * 60)
+        start = time.perf_counter()
+        n = build_db(args.input, args.db)
+        print(f"\n✅ Saved: {args.db} ({n} rows, indexed on {', '.join(INDEXED_COLUMNS)}) "
+              f"in {time.perf_counter() - start:.1f}s")
+        return 0
+
+    with SignalsDB(args.db) as db:
+        if args.command == 'sql':
+            if args.explain:
+                print("\n".join(db.explain(args.query)))
+                return 0
+            result = db.sql(args.query)
+        else:
+            filters = dict(tier=args.tier, fps=args.fps, video_id=args.video_id,
+                           study_type=args.study_type, dataset=args.dataset)
+            if args.agg:
+                result = db.aggregate(args.metric, min_duration=args.min_duration, **filters)
+            else:
+                result = db.select(args.metric, min_duration=args.min_duration, **filters)
+
+    if getattr(args, 'output', None):
+        result.to_csv(args.output, index=False)
+        print(f"✅ Saved: {args.output} ({len(result)} rows)")
+    else:
+        print(result.to_string(index=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
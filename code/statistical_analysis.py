@@ -3,6 +3,7 @@
 Statistical Analysis and Temporal Signal Analysis
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -11,19 +12,31 @@ from pathlib import Path
 from scipy import stats
 from itertools import combinations
 
+import perf_trace
+from data_loader import load_signals
+from render_pool import figure_job, project, render
+from summary_cube import SummaryCube, density_grids, load_cube
+
 # Set style
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
+# Columns of signals_df.parquet read row by row (everything else comes from the summary cube)
+SIGNAL_COLUMNS = [
+    'frame_count', 'tier', 'scene_count', 'transition_count',
+    'person_count_mean', 'unique_object_count', 'brightness_mean',
+    'intensity_mean', 'change_score_mean', 'temporal_density'
+]
+
 def load_data():
-    df = pd.read_parquet("analysis/signals_df.parquet")
+    df = load_signals(SIGNAL_COLUMNS)
     return df
 
 # =============================================================================
 # TEMPORAL ANALYSIS
 # =============================================================================
 
-def analyze_temporal_signals(df: pd.DataFrame, output_dir: Path):
+def analyze_temporal_signals(cube: SummaryCube, output_dir: Path):
     """Analyze temporal signals across FPS levels"""
     
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
@@ -31,7 +44,7 @@ def analyze_temporal_signals(df: pd.DataFrame, output_dir: Path):
     # 1. Change Score Mean (frame-to-frame visual change)
     ax = axes[0, 0]
     for tier in ['web_ugc', 'produced_digital', 'cinema']:
-        tier_data = df[df['tier'] == tier].groupby('fps')['change_score_mean'].mean()
+        tier_data = cube.series('mean', tier, 'change_score_mean')
         ax.plot(tier_data.index, tier_data.values, marker='o', label=tier.replace('_', ' ').title())
     ax.set_xlabel('FPS')
     ax.set_ylabel('Mean Change Score')
@@ -42,7 +55,7 @@ def analyze_temporal_signals(df: pd.DataFrame, output_dir: Path):
     # 2. Temporal Density
     ax = axes[0, 1]
     for tier in ['web_ugc', 'produced_digital', 'cinema']:
-        tier_data = df[df['tier'] == tier].groupby('fps')['temporal_density'].mean()
+        tier_data = cube.series('mean', tier, 'temporal_density')
         ax.plot(tier_data.index, tier_data.values, marker='o', label=tier.replace('_', ' ').title())
     ax.set_xlabel('FPS')
     ax.set_ylabel('Temporal Density')
@@ -53,7 +66,7 @@ def analyze_temporal_signals(df: pd.DataFrame, output_dir: Path):
     # 3. Scene Duration Mean
     ax = axes[1, 0]
     for tier in ['web_ugc', 'produced_digital', 'cinema']:
-        tier_data = df[df['tier'] == tier].groupby('fps')['scene_duration_mean'].mean()
+        tier_data = cube.series('mean', tier, 'scene_duration_mean')
         ax.plot(tier_data.index, tier_data.values, marker='o', label=tier.replace('_', ' ').title())
     ax.set_xlabel('FPS')
     ax.set_ylabel('Mean Scene Duration (sec)')
@@ -64,7 +77,7 @@ def analyze_temporal_signals(df: pd.DataFrame, output_dir: Path):
     # 4. Transition Count
     ax = axes[1, 1]
     for tier in ['web_ugc', 'produced_digital', 'cinema']:
-        tier_data = df[df['tier'] == tier].groupby('fps')['transition_count'].mean()
+        tier_data = cube.series('mean', tier, 'transition_count')
         ax.plot(tier_data.index, tier_data.values, marker='o', label=tier.replace('_', ' ').title())
     ax.set_xlabel('FPS')
     ax.set_ylabel('Transition Count')
@@ -78,8 +91,8 @@ def analyze_temporal_signals(df: pd.DataFrame, output_dir: Path):
     plt.close()
     print(f"✅ Saved: {output_dir / 'temporal_analysis.png'}")
 
-def analyze_frame_level_patterns(df: pd.DataFrame, output_dir: Path):
-    """Analyze how signals change with frame count"""
+def analyze_frame_level_patterns(grids: dict, output_dir: Path):
+    """Analyze how signals change with frame count (from binned 2D histograms)"""
     
     fig, axes = plt.subplots(1, 3, figsize=(15, 5))
     
@@ -91,9 +104,20 @@ def analyze_frame_level_patterns(df: pd.DataFrame, output_dir: Path):
     ]
     
     for ax, (x_col, y_col, title) in zip(axes, metrics):
-        for tier in ['web_ugc', 'produced_digital', 'cinema']:
-            tier_df = df[df['tier'] == tier]
-            ax.scatter(tier_df[x_col], tier_df[y_col], alpha=0.3, label=tier.replace('_', ' ').title(), s=10)
+        grid = grids.get(y_col)
+        if grid is not None:
+            x_centers = (grid['x_edges'][:-1] + grid['x_edges'][1:]) / 2
+            y_centers = (grid['y_edges'][:-1] + grid['y_edges'][1:]) / 2
+            peak = max(c.max() for c in grid['counts'].values()) or 1
+            for tier in ['web_ugc', 'produced_digital', 'cinema']:
+                counts = grid['counts'].get(tier)
+                if counts is None:
+                    continue
+                # One marker per occupied bin, area growing with the number of rows in it
+                i, j = np.nonzero(counts)
+                sizes = 10 + 90 * np.sqrt(counts[i, j] / peak)
+                ax.scatter(x_centers[i], y_centers[j], s=sizes, alpha=0.3,
+                           label=tier.replace('_', ' ').title())
         ax.set_xlabel('Frame Count')
         ax.set_ylabel(y_col.replace('_', ' ').title())
         ax.set_title(title, fontweight='bold')
@@ -109,50 +133,65 @@ def analyze_frame_level_patterns(df: pd.DataFrame, output_dir: Path):
 # STATISTICAL TESTS
 # =============================================================================
 
-def run_anova_tests(df: pd.DataFrame, output_dir: Path):
+# Metrics and tiers compared by the tier ANOVA and the FPS threshold analysis
+ANOVA_METRICS = ['scene_count', 'unique_object_count', 'person_count_mean',
+                 'intensity_mean', 'change_score_mean', 'temporal_density']
+ANOVA_TIERS = ['cinema', 'produced_digital', 'web_ugc']
+THRESHOLD_METRICS = ['scene_count', 'unique_object_count', 'person_count_mean',
+                     'intensity_mean', 'change_score_mean']
+
+def effect_size_label(eta_squared: float) -> str:
+    return 'large' if eta_squared > 0.14 else ('medium' if eta_squared > 0.06 else 'small')
+
+def run_anova_tests(cube: SummaryCube, output_dir: Path):
     """Run ANOVA tests comparing tiers at each FPS level"""
     
-    metrics = ['scene_count', 'unique_object_count', 'person_count_mean', 
-               'intensity_mean', 'change_score_mean', 'temporal_density']
-    
-    fps_levels = sorted(df['fps'].unique())
+    metrics = ANOVA_METRICS
     
     results = []
     
-    for fps in fps_levels:
-        fps_df = df[df['fps'] == fps]
-        
+    for fps in cube.fps:
         for metric in metrics:
-            groups = [fps_df[fps_df['tier'] == t][metric].dropna().values 
-                     for t in ['cinema', 'produced_digital', 'web_ugc']]
+            groups = [[cube.value(stat, t, fps, metric) for stat in ('count', 'mean', 'std')]
+                      for t in ANOVA_TIERS]
             
             # Filter out empty groups
-            groups = [g for g in groups if len(g) > 0]
+            groups = [g for g in groups if g[0] > 0]
             
             if len(groups) >= 2:
-                try:
-                    f_stat, p_value = stats.f_oneway(*groups)
-                    
-                    # Effect size (eta-squared)
-                    all_values = np.concatenate(groups)
-                    grand_mean = np.mean(all_values)
-                    ss_between = sum(len(g) * (np.mean(g) - grand_mean)**2 for g in groups)
-                    ss_total = sum((v - grand_mean)**2 for v in all_values)
-                    eta_squared = ss_between / ss_total if ss_total > 0 else 0
-                    
-                    results.append({
-                        'fps': fps,
-                        'metric': metric,
-                        'f_statistic': f_stat,
-                        'p_value': p_value,
-                        'eta_squared': eta_squared,
-                        'significant': p_value < 0.05,
-                        'effect_size': 'large' if eta_squared > 0.14 else ('medium' if eta_squared > 0.06 else 'small')
-                    })
-                except Exception as e:
-                    pass
+                # One-way ANOVA from each tier's count, mean and std
+                ns, means, stds = (np.array(col) for col in zip(*groups))
+                total = ns.sum()
+                grand_mean = (ns * means).sum() / total
+                ss_between = (ns * (means - grand_mean)**2).sum()
+                ss_within = (np.nan_to_num(stds)**2 * (ns - 1)).sum()
+                df_between, df_within = len(groups) - 1, total - len(groups)
+                
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    f_stat = (ss_between / df_between) / (ss_within / df_within)
+                p_value = stats.f.sf(f_stat, df_between, df_within)
+                
+                # Effect size (eta-squared)
+                ss_total = ss_between + ss_within
+                eta_squared = ss_between / ss_total if ss_total > 0 else 0
+                
+                results.append({
+                    'fps': fps,
+                    'metric': metric,
+                    'f_statistic': f_stat,
+                    'p_value': p_value,
+                    'eta_squared': eta_squared,
+                    'significant': p_value < 0.05,
+                    'effect_size': effect_size_label(eta_squared)
+                })
     
     results_df = pd.DataFrame(results)
+    save_anova_results(results_df, output_dir)
+    
+    return results_df
+
+def save_anova_results(results_df: pd.DataFrame, output_dir: Path):
+    """Write the ANOVA table and its effect-size heatmap"""
     results_df.to_csv(output_dir / 'anova_results.csv', index=False)
     print(f"✅ Saved: {output_dir / 'anova_results.csv'}")
     
@@ -170,10 +209,8 @@ def run_anova_tests(df: pd.DataFrame, output_dir: Path):
     plt.savefig(output_dir / 'anova_effect_sizes.png', dpi=150, bbox_inches='tight')
     plt.close()
     print(f"✅ Saved: {output_dir / 'anova_effect_sizes.png'}")
-    
-    return results_df
 
-def run_pairwise_comparisons(df: pd.DataFrame, output_dir: Path):
+def run_pairwise_comparisons(cube: SummaryCube, output_dir: Path):
     """Run pairwise t-tests between tiers"""
     
     metrics = ['scene_count', 'unique_object_count', 'person_count_mean', 'intensity_mean']
@@ -185,19 +222,18 @@ def run_pairwise_comparisons(df: pd.DataFrame, output_dir: Path):
     results = []
     
     for fps in key_fps:
-        fps_df = df[df['fps'] == fps]
-        
         for metric in metrics:
             for tier1, tier2 in tier_pairs:
-                g1 = fps_df[fps_df['tier'] == tier1][metric].dropna().values
-                g2 = fps_df[fps_df['tier'] == tier2][metric].dropna().values
+                n1, m1, s1 = (cube.value(stat, tier1, fps, metric) for stat in ('count', 'mean', 'std'))
+                n2, m2, s2 = (cube.value(stat, tier2, fps, metric) for stat in ('count', 'mean', 'std'))
                 
-                if len(g1) > 1 and len(g2) > 1:
-                    t_stat, p_value = stats.ttest_ind(g1, g2)
+                if n1 > 1 and n2 > 1:
+                    t_stat, p_value = stats.ttest_ind_from_stats(m1, s1, n1, m2, s2, n2)
                     
-                    # Cohen's d effect size
-                    pooled_std = np.sqrt(((len(g1)-1)*np.std(g1)**2 + (len(g2)-1)*np.std(g2)**2) / (len(g1)+len(g2)-2))
-                    cohens_d = (np.mean(g1) - np.mean(g2)) / pooled_std if pooled_std > 0 else 0
+                    # Cohen's d effect size (from population variances)
+                    var1, var2 = s1**2 * (n1-1) / n1, s2**2 * (n2-1) / n2
+                    pooled_std = np.sqrt(((n1-1)*var1 + (n2-1)*var2) / (n1+n2-2))
+                    cohens_d = (m1 - m2) / pooled_std if pooled_std > 0 else 0
                     
                     results.append({
                         'fps': fps,
@@ -207,7 +243,7 @@ def run_pairwise_comparisons(df: pd.DataFrame, output_dir: Path):
                         'p_value': p_value,
                         'cohens_d': cohens_d,
                         'significant': p_value < 0.05,
-                        'mean_diff': np.mean(g1) - np.mean(g2)
+                        'mean_diff': m1 - m2
                     })
     
     results_df = pd.DataFrame(results)
@@ -216,66 +252,74 @@ def run_pairwise_comparisons(df: pd.DataFrame, output_dir: Path):
     
     return results_df
 
-def analyze_fps_thresholds(df: pd.DataFrame, output_dir: Path):
+def fps_threshold_row(tier: str, metric: str, fps_means: pd.Series) -> dict:
+    """Threshold summary for one tier x metric from its mean value at each FPS"""
+    
+    # Find the FPS where 90% of max value is reached
+    max_val = fps_means.max()
+    min_val = fps_means.min()
+    
+    if max_val > min_val:
+        threshold_90 = min_val + 0.9 * (max_val - min_val)
+        
+        # Find first FPS that exceeds threshold
+        for fps, val in fps_means.items():
+            if val >= threshold_90:
+                optimal_fps_90 = fps
+                break
+        else:
+            optimal_fps_90 = fps_means.index[-1]
+    else:
+        optimal_fps_90 = fps_means.index[0]
+    
+    # Find FPS where gains drop below 5%
+    fps_list = list(fps_means.index)
+    optimal_fps_diminishing = fps_list[-1]
+    
+    for i in range(1, len(fps_list)):
+        prev_val = fps_means[fps_list[i-1]]
+        curr_val = fps_means[fps_list[i]]
+        
+        if prev_val > 0:
+            pct_change = abs(curr_val - prev_val) / prev_val
+            if pct_change < 0.05:
+                optimal_fps_diminishing = fps_list[i]
+                break
+    
+    return {
+        'tier': tier,
+        'metric': metric,
+        'optimal_fps_90pct': optimal_fps_90,
+        'optimal_fps_diminishing': optimal_fps_diminishing,
+        'max_value': max_val,
+        'min_value': min_val,
+        'range': max_val - min_val
+    }
+
+def analyze_fps_thresholds(cube: SummaryCube, output_dir: Path):
     """Determine optimal FPS thresholds for each metric and tier"""
     
-    metrics = ['scene_count', 'unique_object_count', 'person_count_mean', 
-               'intensity_mean', 'change_score_mean']
+    metrics = THRESHOLD_METRICS
     
     results = []
     
-    for tier in df['tier'].unique():
-        tier_df = df[df['tier'] == tier]
-        
+    for tier in cube.tiers:
         for metric in metrics:
             # Get mean values by FPS
-            fps_means = tier_df.groupby('fps')[metric].mean().sort_index()
+            fps_means = cube.series('mean', tier, metric)
             
             if len(fps_means) < 2:
                 continue
             
-            # Find the FPS where 90% of max value is reached
-            max_val = fps_means.max()
-            min_val = fps_means.min()
-            
-            if max_val > min_val:
-                threshold_90 = min_val + 0.9 * (max_val - min_val)
-                
-                # Find first FPS that exceeds threshold
-                for fps, val in fps_means.items():
-                    if val >= threshold_90:
-                        optimal_fps_90 = fps
-                        break
-                else:
-                    optimal_fps_90 = fps_means.index[-1]
-            else:
-                optimal_fps_90 = fps_means.index[0]
-            
-            # Find FPS where gains drop below 5%
-            fps_list = list(fps_means.index)
-            optimal_fps_diminishing = fps_list[-1]
-            
-            for i in range(1, len(fps_list)):
-                prev_val = fps_means[fps_list[i-1]]
-                curr_val = fps_means[fps_list[i]]
-                
-                if prev_val > 0:
-                    pct_change = abs(curr_val - prev_val) / prev_val
-                    if pct_change < 0.05:
-                        optimal_fps_diminishing = fps_list[i]
-                        break
-            
-            results.append({
-                'tier': tier,
-                'metric': metric,
-                'optimal_fps_90pct': optimal_fps_90,
-                'optimal_fps_diminishing': optimal_fps_diminishing,
-                'max_value': max_val,
-                'min_value': min_val,
-                'range': max_val - min_val
-            })
+            results.append(fps_threshold_row(tier, metric, fps_means))
     
     results_df = pd.DataFrame(results)
+    save_fps_thresholds(results_df, output_dir)
+    
+    return results_df
+
+def save_fps_thresholds(results_df: pd.DataFrame, output_dir: Path):
+    """Write the FPS threshold table and its heatmaps"""
     results_df.to_csv(output_dir / 'fps_thresholds.csv', index=False)
     print(f"✅ Saved: {output_dir / 'fps_thresholds.csv'}")
     
@@ -299,14 +343,12 @@ def analyze_fps_thresholds(df: pd.DataFrame, output_dir: Path):
     plt.savefig(output_dir / 'fps_thresholds.png', dpi=150, bbox_inches='tight')
     plt.close()
     print(f"✅ Saved: {output_dir / 'fps_thresholds.png'}")
-    
-    return results_df
 
 # =============================================================================
 # ADDITIONAL VISUALIZATIONS
 # =============================================================================
 
-def plot_variance_analysis(df: pd.DataFrame, output_dir: Path):
+def plot_variance_analysis(cube: SummaryCube, output_dir: Path):
     """Analyze within-tier variance at different FPS levels"""
     
     metrics = ['scene_count', 'unique_object_count', 'intensity_mean']
@@ -314,11 +356,9 @@ def plot_variance_analysis(df: pd.DataFrame, output_dir: Path):
     fig, axes = plt.subplots(1, 3, figsize=(15, 5))
     
     for ax, metric in zip(axes, metrics):
-        variance_data = df.groupby(['tier', 'fps'])[metric].std().reset_index()
-        
         for tier in ['web_ugc', 'produced_digital', 'cinema']:
-            tier_data = variance_data[variance_data['tier'] == tier]
-            ax.plot(tier_data['fps'], tier_data[metric], marker='o', 
+            tier_data = cube.series('std', tier, metric)
+            ax.plot(tier_data.index, tier_data.values, marker='o', 
                    label=tier.replace('_', ' ').title())
         
         ax.set_xlabel('FPS')
@@ -360,21 +400,31 @@ def plot_correlation_matrix(df: pd.DataFrame, output_dir: Path):
     plt.close()
     print(f"✅ Saved: {output_dir / 'correlation_matrix.png'}")
 
-def plot_box_comparisons(df: pd.DataFrame, output_dir: Path):
-    """Box plots comparing distributions at key FPS levels"""
+def plot_box_comparisons(cube: SummaryCube, output_dir: Path):
+    """Box plots comparing distributions at key FPS levels (from the cube's quantiles)"""
     
     key_fps = [1, 10, 24, 60]
     metrics = ['scene_count', 'unique_object_count', 'intensity_mean']
+    tiers = ['cinema', 'produced_digital', 'web_ugc']
+    colors = sns.color_palette(n_colors=len(tiers))
     
     fig, axes = plt.subplots(len(metrics), len(key_fps), figsize=(16, 12))
     
     for i, metric in enumerate(metrics):
         for j, fps in enumerate(key_fps):
             ax = axes[i, j]
-            fps_df = df[df['fps'] == fps]
+            boxes = [(k, cube.box_stats(tier, fps, metric)) for k, tier in enumerate(tiers)]
+            boxes = [(k, b) for k, b in boxes if b is not None]
             
-            sns.boxplot(data=fps_df, x='tier', y=metric, ax=ax, 
-                       order=['cinema', 'produced_digital', 'web_ugc'])
+            if boxes:
+                artists = ax.bxp([b for _, b in boxes], positions=[k for k, _ in boxes], widths=0.8,
+                                 patch_artist=True, medianprops={'color': '0.25'},
+                                 flierprops={'marker': 'd', 'markerfacecolor': '0.25', 'markersize': 5})
+                for patch, (k, _) in zip(artists['boxes'], boxes):
+                    patch.set_facecolor(colors[k])
+            ax.set_xticks(range(len(tiers)))
+            ax.set_xticklabels(tiers)
+            ax.set_xlim(-0.5, len(tiers) - 0.5)
             ax.set_xlabel('')
             ax.set_ylabel(metric.replace('_', ' ').title() if j == 0 else '')
             ax.set_title(f'{fps} FPS' if i == 0 else '')
@@ -386,7 +436,7 @@ def plot_box_comparisons(df: pd.DataFrame, output_dir: Path):
     plt.close()
     print(f"✅ Saved: {output_dir / 'box_comparisons.png'}")
 
-def generate_summary_table(df: pd.DataFrame, anova_df: pd.DataFrame, threshold_df: pd.DataFrame, output_dir: Path):
+def generate_summary_table(cube: SummaryCube, anova_df: pd.DataFrame, threshold_df: pd.DataFrame, output_dir: Path):
     """Generate a publication-ready summary table"""
     
     # Key findings summary
@@ -398,9 +448,9 @@ def generate_summary_table(df: pd.DataFrame, anova_df: pd.DataFrame, threshold_d
         avg_90pct = tier_thresholds['optimal_fps_90pct'].mean()
         avg_diminishing = tier_thresholds['optimal_fps_diminishing'].mean()
         
-        tier_df = df[df['tier'] == tier]
-        n_videos = tier_df['video_id'].nunique()
-        n_records = len(tier_df)
+        t = cube.tier_index(tier)
+        n_videos = int(cube.tier_videos[t]) if t is not None else 0
+        n_records = int(cube.rows[t].sum()) if t is not None else 0
         
         summary.append({
             'Tier': tier.replace('_', ' ').title(),
@@ -423,7 +473,51 @@ def generate_summary_table(df: pd.DataFrame, anova_df: pd.DataFrame, threshold_d
     
     return summary_df
 
+def render_inputs(df: pd.DataFrame, cube: SummaryCube) -> dict:
+    """Shared job inputs: cube subsets and row projections of just what each job reads"""
+    return {
+        'temporal': cube.subset(['change_score_mean', 'temporal_density', 'scene_duration_mean',
+                                 'transition_count']),
+        'frame_level': density_grids(df, 'frame_count', ['unique_object_count', 'scene_count',
+                                                         'change_score_mean'], ANOVA_TIERS),
+        'anova': cube.subset(ANOVA_METRICS),
+        'pairwise': cube.subset(['scene_count', 'unique_object_count', 'person_count_mean',
+                                 'intensity_mean']),
+        'thresholds': cube.subset(THRESHOLD_METRICS),
+        'variance': cube.subset(['scene_count', 'unique_object_count', 'intensity_mean']),
+        'correlation': project(df, ['tier', 'scene_count', 'transition_count', 'unique_object_count',
+                                    'person_count_mean', 'intensity_mean', 'change_score_mean',
+                                    'temporal_density', 'brightness_mean']),
+        'box': cube.subset(['scene_count', 'unique_object_count', 'intensity_mean']),
+        'tiers': cube.subset([]),
+    }
+
+def render_jobs() -> list:
+    return [
+        figure_job(analyze_temporal_signals, 'temporal', outputs=['temporal_analysis.png']),
+        figure_job(analyze_frame_level_patterns, 'frame_level', outputs=['frame_level_patterns.png']),
+        figure_job(run_anova_tests, 'anova', outputs=['anova_results.csv', 'anova_effect_sizes.png']),
+        figure_job(run_pairwise_comparisons, 'pairwise', outputs=['pairwise_comparisons.csv']),
+        figure_job(analyze_fps_thresholds, 'thresholds', outputs=['fps_thresholds.csv', 'fps_thresholds.png']),
+        figure_job(plot_variance_analysis, 'variance', outputs=['variance_analysis.png']),
+        figure_job(plot_correlation_matrix, 'correlation', outputs=['correlation_matrix.png']),
+        figure_job(plot_box_comparisons, 'box', outputs=['box_comparisons.png']),
+    ]
+
+perf_trace.instrument(globals())
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Statistical tests and additional figures")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Render figures in this many processes (0: one after another)")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-render every figure, even if its data and code are unchanged")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write a Chrome trace of this run (see perf_trace.py)")
+    args = parser.parse_args()
+    if args.profile:
+        perf_trace.enable()
+
     print("=" * 60)
     print("STATISTICAL ANALYSIS & ADDITIONAL VISUALIZATIONS")
     print("=" * 60)
@@ -432,28 +526,19 @@ if __name__ == "__main__":
     output_dir.mkdir(exist_ok=True)
     
     df = load_data()
+    cube = load_cube()
     print(f"\nLoaded {len(df)} records")
     
-    # Temporal Analysis
-    print("\n--- Temporal Signal Analysis ---")
-    analyze_temporal_signals(df, output_dir)
-    analyze_frame_level_patterns(df, output_dir)
-    
-    # Statistical Tests
-    print("\n--- Statistical Tests ---")
-    anova_df = run_anova_tests(df, output_dir)
-    pairwise_df = run_pairwise_comparisons(df, output_dir)
-    threshold_df = analyze_fps_thresholds(df, output_dir)
-    
-    # Additional Visualizations
-    print("\n--- Additional Visualizations ---")
-    plot_variance_analysis(df, output_dir)
-    plot_correlation_matrix(df, output_dir)
-    plot_box_comparisons(df, output_dir)
+    print("\n--- Temporal Analysis, Statistical Tests and Visualizations ---")
+    shared = render_inputs(df, cube)
+    results = render(render_jobs(), shared, output_dir, workers=args.workers, force=args.force)
     
     # Summary
     print("\n--- Generating Summary ---")
-    summary_df = generate_summary_table(df, anova_df, threshold_df, output_dir)
+    shared.update(anova_results=results['run_anova_tests'], thresholds_results=results['analyze_fps_thresholds'])
+    summary_job = figure_job(generate_summary_table, 'tiers', 'anova_results', 'thresholds_results',
+                             outputs=['publication_summary.csv'])
+    summary_df = render([summary_job], shared, output_dir, force=args.force)['generate_summary_table']
     
     print("\n" + "=" * 60)
     print("ANALYSIS COMPLETE")
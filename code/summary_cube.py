@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Tier x fps x metric summary cube.
+
+One pass over signals_df groups every row into its tier x fps cell and
+computes, per metric, the non-null count, mean, standard deviation, a
+fixed set of quantiles and the box-plot whisker ends. The result is a
+handful of dense NumPy arrays (a few KB) saved as
+analysis/summary_cube.npz; the plotting and table functions read the cube
+instead of filtering and regrouping the raw rows. The cube is rebuilt
+automatically when signals_df.parquet changes.
+
+density_grids() does the same for scatter plots: per-tier 2D histograms
+on shared bin edges, so drawing them costs the same at any row count.
+"""
+
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional
+
+from content_hash import hash_path
+from data_loader import SIGNALS_PATH, load_signals
+
+CUBE_PATH = "analysis/summary_cube.npz"
+CUBE_METRICS = [
+    'scene_count', 'transition_count', 'scene_duration_mean', 'person_count_mean',
+    'unique_object_count', 'brightness_mean', 'intensity_mean', 'change_score_mean',
+    'temporal_density'
+]
+QUANTILES = [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]
+WHISKER_IQR = 1.5         # whiskers reach the furthest value within 1.5 IQR of the box
+SCATTER_BINS = 60
+CUBE_VERSION = 3          # bump when the stored arrays change
+
+class SummaryCube:
+    """Dense per-cell statistics; arrays are indexed [tier, fps, metric(, quantile)]"""
+
+    def __init__(self, tiers, fps, metrics, levels, rows, tier_videos, count, mean, std, quantiles,
+                 whiskers=None, source: str = ""):
+        self.tiers = [str(t) for t in tiers]      # order of first appearance in signals_df
+        self.fps = np.asarray(fps, dtype=np.float64)
+        self.metrics = [str(m) for m in metrics]
+        self.levels = np.asarray(levels, dtype=np.float64)
+        self.rows = np.asarray(rows)              # [tier, fps] rows per cell
+        self.tier_videos = np.asarray(tier_videos)
+        self.count = np.asarray(count)
+        self.mean = np.asarray(mean)
+        self.std = np.asarray(std)
+        self.quantiles = np.asarray(quantiles)
+        self.whiskers = (np.asarray(whiskers) if whiskers is not None
+                         else np.full(self.mean.shape + (2,), np.nan))
+        self.source = str(source)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, metrics: List[str] = CUBE_METRICS,
+              levels: List[float] = QUANTILES, source: str = "") -> "SummaryCube":
+        metrics = [m for m in metrics if m in df.columns]
+        df = df[df['tier'].notna() & df['fps'].notna()]
+        tiers = pd.unique(df['tier'].astype(str))
+        fps = np.sort(df['fps'].astype(np.float64).unique())
+        levels = np.asarray(levels, dtype=np.float64)
+
+        n_tiers, n_fps, n_cells = len(tiers), len(fps), len(tiers) * len(fps)
+        tier_code = pd.Categorical(df['tier'].astype(str), categories=tiers).codes
+        fps_code = np.searchsorted(fps, df['fps'].to_numpy(np.float64))
+        cell = tier_code.astype(np.int64) * n_fps + fps_code
+
+        rows = np.bincount(cell, minlength=n_cells).reshape(n_tiers, n_fps)
+        tier_videos = (df[['tier', 'video_id']].astype(str).drop_duplicates()['tier']
+                       .value_counts().reindex(tiers, fill_value=0).to_numpy())
+
+        shape = (n_tiers, n_fps, len(metrics))
+        count = np.zeros(shape, dtype=np.int64)
+        mean, std = np.full(shape, np.nan), np.full(shape, np.nan)
+        quantiles = np.full(shape + (len(levels),), np.nan)
+        whiskers = np.full(shape + (2,), np.nan)
+        quartiles = [list(levels).index(q) for q in (0.25, 0.75)] if {0.25, 0.75} <= set(levels) else None
+
+        for j, metric in enumerate(metrics):
+            values = df[metric].to_numpy(np.float64)
+            present = ~np.isnan(values)
+            x, c = values[present], cell[present]
+            n = np.bincount(c, minlength=n_cells)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                m = np.bincount(c, weights=x, minlength=n_cells) / n
+                m2 = np.bincount(c, weights=(x - m[c]) ** 2, minlength=n_cells)
+                s = np.sqrt(m2 / (n - 1))
+            s[n < 2] = np.nan
+
+            # Linear-interpolated quantiles from one sort by (cell, value)
+            xs = x[np.lexsort((x, c))]
+            start = np.cumsum(n) - n
+            pos = start[:, None] + levels[None, :] * np.maximum(n - 1, 0)[:, None]
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.minimum(lo + 1, start[:, None] + np.maximum(n - 1, 0)[:, None])
+            occupied = n > 0
+            q = np.full((n_cells, len(levels)), np.nan)
+            if occupied.any():
+                q[occupied] = xs[lo[occupied]] + (xs[hi[occupied]] - xs[lo[occupied]]) * (pos - lo)[occupied]
+
+            if quartiles is not None and len(x):
+                q1, q3 = q[:, quartiles[0]], q[:, quartiles[1]]
+                low, high = q1 - WHISKER_IQR * (q3 - q1), q3 + WHISKER_IQR * (q3 - q1)
+                inside = (x >= low[c]) & (x <= high[c])
+                lo_end, hi_end = np.full(n_cells, np.inf), np.full(n_cells, -np.inf)
+                np.minimum.at(lo_end, c[inside], x[inside])
+                np.maximum.at(hi_end, c[inside], x[inside])
+                ends = np.stack([lo_end, hi_end], axis=1)
+                ends[~np.isfinite(ends)] = np.nan
+                whiskers[..., j, :] = ends.reshape(n_tiers, n_fps, 2)
+
+            count[..., j] = n.reshape(n_tiers, n_fps)
+            mean[..., j] = m.reshape(n_tiers, n_fps)
+            std[..., j] = s.reshape(n_tiers, n_fps)
+            quantiles[..., j, :] = q.reshape(n_tiers, n_fps, len(levels))
+
+        return cls(tiers, fps, metrics, levels, rows, tier_videos, count, mean, std, quantiles,
+                   whiskers, source)
+
+    def arrays(self) -> dict:
+        """The cube's contents (without its source hash)"""
+        return {'tiers': np.array(self.tiers), 'fps': self.fps, 'metrics': np.array(self.metrics),
+                'levels': self.levels, 'rows': self.rows.astype(np.int32),
+                'tier_videos': self.tier_videos.astype(np.int32), 'count': self.count.astype(np.int32),
+                'mean': self.mean, 'std': self.std, 'quantiles': self.quantiles, 'whiskers': self.whiskers}
+
+    def save(self, path: str = CUBE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(path).with_suffix(f'.{os.getpid()}.tmp.npz')     # scripts may rebuild concurrently
+        np.savez_compressed(tmp, source=np.array(self.source), **self.arrays())
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str = CUBE_PATH) -> "SummaryCube":
+        with np.load(path) as z:
+            return cls(z['tiers'], z['fps'], z['metrics'], z['levels'], z['rows'], z['tier_videos'],
+                       z['count'], z['mean'], z['std'], z['quantiles'],
+                       z['whiskers'] if 'whiskers' in z.files else None, z['source'].item())
+
+    def subset(self, metrics: List[str]) -> "SummaryCube":
+        """The same cells restricted to some metrics (what a single figure reads)"""
+        j = [self.metrics.index(m) for m in metrics]
+        return SummaryCube(self.tiers, self.fps, metrics, self.levels, self.rows, self.tier_videos,
+                           self.count[..., j], self.mean[..., j], self.std[..., j],
+                           self.quantiles[..., j, :], self.whiskers[..., j, :], self.source)
+
+    # -- lookups ------------------------------------------------------------
+
+    def _stat(self, stat: str) -> np.ndarray:
+        return {'count': self.count, 'mean': self.mean, 'std': self.std}[stat]
+
+    def tier_index(self, tier: str) -> Optional[int]:
+        return self.tiers.index(tier) if tier in self.tiers else None
+
+    def series(self, stat: str, tier: str, metric: str) -> pd.Series:
+        """stat by fps for one tier, over the fps levels that tier has rows at"""
+        t = self.tier_index(tier)
+        if t is None:
+            return pd.Series(dtype=np.float64, name=metric).rename_axis('fps')
+        present = self.rows[t] > 0
+        values = self._stat(stat)[t, present, self.metrics.index(metric)]
+        return pd.Series(values, index=pd.Index(self.fps[present], name='fps'), name=metric)
+
+    def value(self, stat: str, tier: str, fps: float, metric: str) -> float:
+        """One cell's stat; NaN if the cell is empty"""
+        t = self.tier_index(tier)
+        f = np.flatnonzero(self.fps == fps)
+        if t is None or not len(f) or not self.rows[t, f[0]]:
+            return np.nan
+        return float(self._stat(stat)[t, f[0], self.metrics.index(metric)])
+
+    def table(self, stat: str, metric: str) -> pd.DataFrame:
+        """tier x fps table of a stat (tiers sorted, empty cells NaN)"""
+        values = np.where(self.rows > 0, self._stat(stat)[..., self.metrics.index(metric)], np.nan)
+        frame = pd.DataFrame(values, index=pd.Index(self.tiers, name='tier'),
+                             columns=pd.Index(self.fps, name='fps'))
+        return frame.sort_index().dropna(how='all').dropna(axis=1, how='all')
+
+    def quantile(self, tier: str, fps: float, metric: str) -> pd.Series:
+        """Quantiles of one cell, indexed by level"""
+        t, f = self.tier_index(tier), np.flatnonzero(self.fps == fps)
+        if t is None or not len(f):
+            return pd.Series(np.nan, index=self.levels)
+        return pd.Series(self.quantiles[t, f[0], self.metrics.index(metric)], index=self.levels)
+
+    def box_stats(self, tier: str, fps: float, metric: str) -> Optional[dict]:
+        """One cell as a matplotlib Axes.bxp entry; fliers reduced to the cell min/max beyond the whiskers"""
+        t, f = self.tier_index(tier), np.flatnonzero(self.fps == fps)
+        if t is None or not len(f) or not self.count[t, f[0], self.metrics.index(metric)]:
+            return None
+        q = self.quantile(tier, fps, metric)
+        whislo, whishi = self.whiskers[t, f[0], self.metrics.index(metric)]
+        fliers = [v for v in (q[0.0], q[1.0]) if v < whislo or v > whishi]
+        return {'med': q[0.5], 'q1': q[0.25], 'q3': q[0.75], 'whislo': whislo, 'whishi': whishi,
+                'fliers': np.array(fliers), 'label': tier}
+
+    def pooled(self, by: str, metrics: List[str]) -> dict:
+        """count / mean / std per tier or per fps, combining the cells along the other axis"""
+        axis = 1 if by == 'tier' else 0
+        j = [self.metrics.index(m) for m in metrics]
+        n, m, s = self.count[..., j].astype(np.float64), self.mean[..., j], self.std[..., j]
+        total = n.sum(axis=axis)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grand = np.nansum(n * np.nan_to_num(m), axis=axis) / total
+            m2 = (np.nansum(np.nan_to_num(s) ** 2 * np.maximum(n - 1, 0), axis=axis)
+                  + np.nansum(n * (np.nan_to_num(m) - np.expand_dims(grand, axis)) ** 2, axis=axis))
+            std = np.sqrt(m2 / (total - 1))
+        std[total < 2] = np.nan
+        grand[total == 0] = np.nan
+
+        index = pd.Index(self.tiers, name='tier') if by == 'tier' else pd.Index(self.fps, name='fps')
+        rows = self.rows.sum(axis=axis)
+        frames = {name: pd.DataFrame(values, index=index, columns=metrics).sort_index()
+                  for name, values in (('count', total), ('mean', grand), ('std', std))}
+        frames['rows'] = pd.Series(rows, index=index).sort_index()
+        return frames
+
+def density_grids(df: pd.DataFrame, x: str, ys: List[str], tiers: List[str],
+                  bins: int = SCATTER_BINS) -> dict:
+    """Per-tier 2D histograms of each y against x, on edges shared by all tiers"""
+    grids = {'x': x, 'tiers': list(tiers)}
+    for y in ys:
+        data = df[['tier', x, y]].dropna()
+        xs, ys_ = data[x].to_numpy(np.float64), data[y].to_numpy(np.float64)
+        if not len(data):
+            continue
+        x_edges = np.histogram_bin_edges(xs, bins)
+        y_edges = np.histogram_bin_edges(ys_, bins)
+        counts = {}
+        for tier in tiers:
+            mask = (data['tier'] == tier).to_numpy()
+            counts[tier] = np.histogram2d(xs[mask], ys_[mask], bins=[x_edges, y_edges])[0].astype(np.int64)
+        grids[y] = {'x_edges': x_edges, 'y_edges': y_edges, 'counts': counts}
+    return grids
+
+def load_cube(signals_path: str = SIGNALS_PATH, cube_path: str = CUBE_PATH) -> SummaryCube:
+    """The cached cube, rebuilt (and re-saved) if signals_df has changed since it was built"""
+    source = f"v{CUBE_VERSION}:{hash_path(Path(signals_path))}"
+    if Path(cube_path).exists():
+        cube = SummaryCube.load(cube_path)
+        if cube.source == source:
+            return cube
+    df = load_signals(['video_id', 'tier', 'fps'] + CUBE_METRICS, signals_path, report=False)
+    cube = SummaryCube.build(df, source=source)
+    cube.save(cube_path)
+    print(f"✅ Saved: {cube_path}")
+    return cube
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the tier x fps x metric summary cube")
+    parser.add_argument('--input', default=SIGNALS_PATH)
+    parser.add_argument('--output', default=CUBE_PATH)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SUMMARY CUBE")
+    print("=" * 60)
+
+    df = load_signals(['video_id', 'tier', 'fps'] + CUBE_METRICS, args.input)
+    cube = SummaryCube.build(df, source=f"v{CUBE_VERSION}:{hash_path(Path(args.input))}")
+    cube.save(args.output)
+    print(f"\n{len(cube.tiers)} tiers x {len(cube.fps)} fps x {len(cube.metrics)} metrics, "
+          f"{len(cube.levels)} quantiles ({Path(args.output).stat().st_size / 1024:.1f} KB)")
+    print(f"✅ Saved: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,24 +3,29 @@
 Visualize FPS signal extraction results
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 
+import perf_trace
+from render_pool import figure_job, render
+from summary_cube import SummaryCube, load_cube
+
 # Set style
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
 def load_data():
     """Load processed data"""
-    df = pd.read_parquet("analysis/signals_df.parquet")
+    cube = load_cube()
     agg_df = pd.read_parquet("analysis/metrics_by_fps.parquet")
     stability_df = pd.read_parquet("analysis/signal_stability.parquet")
-    return df, agg_df, stability_df
+    return cube, agg_df, stability_df
 
-def plot_signal_by_fps(df: pd.DataFrame, output_dir: Path):
+def plot_signal_by_fps(cube: SummaryCube, output_dir: Path):
     """Plot signal metrics across FPS levels by tier"""
     
     metrics = [
@@ -34,12 +39,9 @@ def plot_signal_by_fps(df: pd.DataFrame, output_dir: Path):
     axes = axes.flatten()
     
     for ax, (metric, title) in zip(axes, metrics):
-        # Aggregate by tier and fps
-        agg = df.groupby(['tier', 'fps'])[metric].mean().reset_index()
-        
         for tier in ['web_ugc', 'produced_digital', 'cinema']:
-            tier_data = agg[agg['tier'] == tier]
-            ax.plot(tier_data['fps'], tier_data[metric], 
+            tier_data = cube.series('mean', tier, metric)
+            ax.plot(tier_data.index, tier_data.values, 
                    marker='o', linewidth=2, markersize=6, label=tier.replace('_', ' ').title())
         
         ax.set_xlabel('FPS', fontsize=11)
@@ -56,7 +58,7 @@ def plot_signal_by_fps(df: pd.DataFrame, output_dir: Path):
     plt.close()
     print(f"✅ Saved: {output_dir / 'signal_by_fps.png'}")
 
-def plot_diminishing_returns(df: pd.DataFrame, output_dir: Path):
+def plot_diminishing_returns(cube: SummaryCube, output_dir: Path):
     """Plot diminishing returns analysis"""
     
     metrics = ['scene_count', 'unique_object_count', 'person_count_mean']
@@ -67,13 +69,12 @@ def plot_diminishing_returns(df: pd.DataFrame, output_dir: Path):
     
     for ax, metric in zip(axes, metrics):
         for tier in ['web_ugc', 'produced_digital', 'cinema']:
-            tier_df = df[df['tier'] == tier]
             gains = []
             labels = []
             
             for fps_low, fps_high in fps_pairs:
-                low_val = tier_df[tier_df['fps'] == fps_low][metric].mean()
-                high_val = tier_df[tier_df['fps'] == fps_high][metric].mean()
+                low_val = cube.value('mean', tier, fps_low, metric)
+                high_val = cube.value('mean', tier, fps_high, metric)
                 
                 if low_val > 0:
                     pct_gain = (high_val - low_val) / low_val * 100
@@ -117,7 +118,7 @@ def plot_stability_heatmap(stability_df: pd.DataFrame, output_dir: Path):
     plt.close()
     print(f"✅ Saved: {output_dir / 'stability_heatmap.png'}")
 
-def plot_tier_comparison(df: pd.DataFrame, output_dir: Path):
+def plot_tier_comparison(cube: SummaryCube, output_dir: Path):
     """Compare tiers at key FPS thresholds"""
     
     key_fps = [1, 10, 24, 60, 120]
@@ -126,7 +127,8 @@ def plot_tier_comparison(df: pd.DataFrame, output_dir: Path):
     fig, axes = plt.subplots(1, 3, figsize=(15, 5))
     
     for ax, metric in zip(axes, metrics):
-        plot_data = df[df['fps'].isin(key_fps)].groupby(['tier', 'fps'])[metric].mean().unstack()
+        plot_data = cube.table('mean', metric)
+        plot_data = plot_data[[f for f in plot_data.columns if f in key_fps]].dropna(how='all')
         plot_data.plot(kind='bar', ax=ax, width=0.8)
         ax.set_title(metric.replace('_', ' ').title())
         ax.set_xlabel('Content Tier')
@@ -140,35 +142,92 @@ def plot_tier_comparison(df: pd.DataFrame, output_dir: Path):
     plt.close()
     print(f"✅ Saved: {output_dir / 'tier_comparison.png'}")
 
-def generate_summary_stats(df: pd.DataFrame, output_dir: Path):
+# Summary tables: column -> aggregation(s), as passed to DataFrame.agg
+TIER_SUMMARY_AGG = {
+    'video_id': 'nunique',
+    'scene_count': ['mean', 'std'],
+    'unique_object_count': ['mean', 'std'],
+    'person_count_mean': ['mean', 'std'],
+    'intensity_mean': ['mean', 'std'],
+}
+FPS_SUMMARY_AGG = {
+    'video_id': 'count',
+    'scene_count': 'mean',
+    'unique_object_count': 'mean',
+    'person_count_mean': 'mean',
+}
+
+def summary_table(spec: dict, pooled: dict, videos: pd.Series) -> pd.DataFrame:
+    """A summary table in DataFrame.agg(spec) layout from pooled cube statistics"""
+    multi = any(isinstance(funcs, list) for funcs in spec.values())
+    columns = {}
+    for column, funcs in spec.items():
+        for func in (funcs if isinstance(funcs, list) else [funcs]):
+            values = videos if column == 'video_id' else pooled[func][column]
+            columns[(column, func) if multi else column] = values
+    summary = pd.DataFrame(columns)
+    if multi:
+        summary.columns = pd.MultiIndex.from_tuples(summary.columns)
+    return summary.round(2)
+
+def generate_summary_stats(cube: SummaryCube, output_dir: Path):
     """Generate summary statistics table"""
     
-    # Summary by tier
-    tier_summary = df.groupby('tier').agg({
-        'video_id': 'nunique',
-        'scene_count': ['mean', 'std'],
-        'unique_object_count': ['mean', 'std'],
-        'person_count_mean': ['mean', 'std'],
-        'intensity_mean': ['mean', 'std'],
-    }).round(2)
+    # Summary by tier (distinct videos) and by FPS (records)
+    tier_metrics = [c for c in TIER_SUMMARY_AGG if c != 'video_id']
+    tier_videos = pd.Series(cube.tier_videos, index=pd.Index(cube.tiers, name='tier')).sort_index()
+    tier_summary = summary_table(TIER_SUMMARY_AGG, cube.pooled('tier', tier_metrics), tier_videos)
+    
+    fps_pooled = cube.pooled('fps', [c for c in FPS_SUMMARY_AGG if c != 'video_id'])
+    fps_summary = summary_table(FPS_SUMMARY_AGG, fps_pooled, fps_pooled['rows'])
+    
+    save_summary_stats(tier_summary, fps_summary, output_dir)
+    
+    return tier_summary, fps_summary
+
+def save_summary_stats(tier_summary: pd.DataFrame, fps_summary: pd.DataFrame, output_dir: Path):
+    """Write the tier and FPS summary tables"""
     
     tier_summary.to_csv(output_dir / 'tier_summary.csv')
     print(f"✅ Saved: {output_dir / 'tier_summary.csv'}")
     
-    # Summary by FPS
-    fps_summary = df.groupby('fps').agg({
-        'video_id': 'count',
-        'scene_count': 'mean',
-        'unique_object_count': 'mean',
-        'person_count_mean': 'mean',
-    }).round(2)
-    
     fps_summary.to_csv(output_dir / 'fps_summary.csv')
     print(f"✅ Saved: {output_dir / 'fps_summary.csv'}")
-    
-    return tier_summary, fps_summary
+
+def render_inputs(cube: SummaryCube, stability_df: pd.DataFrame) -> dict:
+    """Shared job inputs: each figure gets just the cube metrics it plots"""
+    return {
+        'signal_by_fps': cube.subset(['scene_count', 'unique_object_count', 'person_count_mean',
+                                      'intensity_mean']),
+        'diminishing_returns': cube.subset(['scene_count', 'unique_object_count', 'person_count_mean']),
+        'tier_comparison': cube.subset(['scene_count', 'unique_object_count', 'intensity_mean']),
+        'summary': cube.subset([c for c in TIER_SUMMARY_AGG if c != 'video_id']),
+        'stability': stability_df,
+    }
+
+def render_jobs() -> list:
+    return [
+        figure_job(plot_signal_by_fps, 'signal_by_fps', outputs=['signal_by_fps.png']),
+        figure_job(plot_diminishing_returns, 'diminishing_returns', outputs=['diminishing_returns.png']),
+        figure_job(plot_stability_heatmap, 'stability', outputs=['stability_heatmap.png']),
+        figure_job(plot_tier_comparison, 'tier_comparison', outputs=['tier_comparison.png']),
+        figure_job(generate_summary_stats, 'summary', outputs=['tier_summary.csv', 'fps_summary.csv']),
+    ]
+
+perf_trace.instrument(globals())
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the FPS signal figures and summary tables")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Render figures in this many processes (0: one after another)")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-render every figure, even if its data and code are unchanged")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write a Chrome trace of this run (see perf_trace.py)")
+    args = parser.parse_args()
+    if args.profile:
+        perf_trace.enable()
+
     print("=" * 60)
     print("GENERATING VISUALIZATIONS")
     print("=" * 60)
@@ -176,20 +235,16 @@ if __name__ == "__main__":
     output_dir = Path("analysis/figures")
     output_dir.mkdir(exist_ok=True)
     
-    df, agg_df, stability_df = load_data()
-    
-    print(f"\nLoaded {len(df)} records")
-    print(f"Tiers: {df['tier'].unique().tolist()}")
-    print(f"FPS levels: {sorted(df['fps'].unique().tolist())}")
+    cube, agg_df, stability_df = load_data()
     
-    print("\n--- Generating Plots ---")
-    plot_signal_by_fps(df, output_dir)
-    plot_diminishing_returns(df, output_dir)
-    plot_stability_heatmap(stability_df, output_dir)
-    plot_tier_comparison(df, output_dir)
+    print(f"\nLoaded {cube.rows.sum()} records")
+    print(f"Tiers: {cube.tiers}")
+    print(f"FPS levels: {cube.fps.tolist()}")
     
-    print("\n--- Generating Summary Stats ---")
-    tier_summary, fps_summary = generate_summary_stats(df, output_dir)
+    print("\n--- Generating Plots and Summary Stats ---")
+    results = render(render_jobs(), render_inputs(cube, stability_df), output_dir,
+                     workers=args.workers, force=args.force)
+    tier_summary, fps_summary = results['generate_summary_stats']
     
     print("\n" + "=" * 60)
     print("VISUALIZATION COMPLETE")
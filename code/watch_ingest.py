@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Live ingestion: watch a results tree and keep the analysis tables current.
+
+An asyncio loop polls the tree, debounces new or modified JSON files until
+they stop changing, parses them on a process pool and applies each row to
+the in-memory dataset. Tier x fps aggregates are updated incrementally
+(add/subtract running sums), and stability is recomputed only for the
+videos that changed. signals_df, metrics_by_fps and signal_stability are
+snapshotted atomically every flush interval, together with a metrics file
+reporting ingestion lag and queue depth.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from process_results import FPS_AGG_FUNCS, compute_signal_stability, extract_metrics, load_result
+
+POLL_INTERVAL = 2.0     # seconds between tree scans
+DEBOUNCE = 3.0          # a file must be unchanged this long before it is parsed
+FLUSH_INTERVAL = 30.0   # seconds between table snapshots
+LAG_WINDOW = 1000       # recent files used for lag percentiles
+
+AGG_METRICS = [c for c in FPS_AGG_FUNCS if c != 'video_id']
+# Column layouts for the tables when every record has been retracted
+SIGNAL_COLUMNS = list(extract_metrics({'metadata': {'tier': '-', 'dataset': '-'}}))
+STABILITY_COLUMNS = ['tier', 'video_id', 'metric', 'cv', 'stable_fps', 'min_value', 'max_value']
+
+def parse_file(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        return extract_metrics(load_result(path))
+    except Exception:
+        return None
+
+def scan_tree(root: str) -> Dict[str, Tuple[int, int]]:
+    """path -> (mtime_ns, size) for every result JSON under root"""
+    found = {}
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(".json"):
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found[path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+class IncrementalAggregates:
+    """Tier x fps running sums that support both adding and retracting a row"""
+
+    def __init__(self, metrics=AGG_METRICS):
+        self.metrics = list(metrics)
+        self.groups: Dict[Tuple[str, float], Dict[str, np.ndarray]] = {}
+
+    def _apply(self, row: Dict[str, Any], sign: int):
+        key = (row['tier'], row['fps'])
+        group = self.groups.setdefault(key, {'rows': 0, 'sums': np.zeros(len(self.metrics)),
+                                             'counts': np.zeros(len(self.metrics))})
+        values = np.array([row.get(m) for m in self.metrics], dtype=float)
+        present = ~np.isnan(values)
+        group['rows'] += sign * (row.get('video_id') is not None)
+        group['sums'] += sign * np.where(present, values, 0.0)
+        group['counts'] += sign * present
+        if group['counts'].max() <= 0 and group['rows'] <= 0:
+            del self.groups[key]
+
+    def add(self, row: Dict[str, Any]):
+        self._apply(row, +1)
+
+    def remove(self, row: Dict[str, Any]):
+        self._apply(row, -1)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Same layout as process_results.compute_fps_aggregates"""
+        rows = []
+        for (tier, fps), group in sorted(self.groups.items()):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = group['sums'] / group['counts']
+            rows.append({'tier': tier, 'fps': fps, **dict(zip(self.metrics, means)),
+                         'video_count': int(group['rows'])})
+        return pd.DataFrame(rows, columns=['tier', 'fps'] + self.metrics + ['video_count'])
+
+class LiveIngestor:
+    """Debounced watch -> parse pool -> incremental tables"""
+
+    def __init__(self, root: str, output_dir: str = "analysis", workers: int = 4,
+                 poll_interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.root = root
+        self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.flush_interval = flush_interval
+
+        self.seen: Dict[str, Tuple[int, int]] = {}        # last ingested signature per path
+        self.pending: Dict[str, Tuple[Tuple[int, int], float]] = {}  # signature, first noticed
+        self.queue: asyncio.Queue = None
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.aggregates = IncrementalAggregates()
+        self.stability: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self.dirty_videos = set()
+        self.dirty = False
+
+        self.scans = 0
+        self.lags = deque(maxlen=LAG_WINDOW)
+        self.ingested = 0
+        self.failed = 0
+        self.removed = 0
+        self.started = time.time()
+
+    # -- watching -----------------------------------------------------------
+
+    async def watch(self, stop: asyncio.Event):
+        while not stop.is_set():
+            snapshot = await asyncio.to_thread(scan_tree, self.root)
+            now = time.time()
+
+            for path, sig in snapshot.items():
+                if self.seen.get(path) == sig:
+                    self.pending.pop(path, None)
+                    continue
+                prev = self.pending.get(path)
+                if prev is None or prev[0] != sig:
+                    self.pending[path] = (sig, now)     # new or still changing: restart debounce
+                elif now - prev[1] >= self.debounce:
+                    del self.pending[path]
+                    self.seen[path] = sig
+                    await self.queue.put((path, sig[0] / 1e9))
+
+            for path in set(self.seen) - set(snapshot):
+                del self.seen[path]
+                self._retract(path)
+            self.scans += 1
+
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # -- applying -----------------------------------------------------------
+
+    def _retract(self, path: str):
+        old = self.records.pop(path, None)
+        if old is not None:
+            self.aggregates.remove(old)
+            self.dirty_videos.add((old['tier'], old['video_id']))
+            self.removed += 1
+            self.dirty = True
+
+    def apply(self, path: str, row: Optional[Dict[str, Any]], landed_at: float):
+        self._retract(path)
+        if row is None:
+            self.failed += 1
+            return
+        self.records[path] = row
+        self.aggregates.add(row)
+        self.dirty_videos.add((row['tier'], row['video_id']))
+        self.ingested += 1
+        self.dirty = True
+        self.lags.append(time.time() - landed_at)
+
+    async def worker(self, pool: ProcessPoolExecutor):
+        loop = asyncio.get_running_loop()
+        while True:
+            path, landed_at = await self.queue.get()
+            try:
+                row = await loop.run_in_executor(pool, parse_file, path)
+                self.apply(path, row, landed_at)
+            finally:
+                self.queue.task_done()
+
+    # -- outputs ------------------------------------------------------------
+
+    def _refresh_stability(self, df: pd.DataFrame, videos: set):
+        for key in videos:
+            self.stability.pop(key, None)
+        if not len(df) or not videos:
+            return
+        changed = pd.MultiIndex.from_frame(df[['tier', 'video_id']]).isin(list(videos))
+        for key, video_df in df[changed].groupby(['tier', 'video_id'], sort=False):
+            self.stability[key] = compute_signal_stability(video_df)
+
+    def metrics(self) -> Dict[str, Any]:
+        lags = np.array(self.lags) if self.lags else np.zeros(1)
+        return {
+            'timestamp': time.time(),
+            'uptime_s': time.time() - self.started,
+            'queue_depth': self.queue.qsize() if self.queue else 0,
+            'debouncing': len(self.pending),
+            'rows': len(self.records),
+            'ingested': self.ingested,
+            'failed': self.failed,
+            'removed': self.removed,
+            'lag_p50_s': float(np.percentile(lags, 50)),
+            'lag_p95_s': float(np.percentile(lags, 95)),
+            'lag_max_s': float(lags.max()),
+        }
+
+    def _write(self, frame: pd.DataFrame, name: str):
+        tmp = self.output_dir / f".{name}.tmp"
+        frame.to_parquet(tmp, index=False)
+        tmp.replace(self.output_dir / name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy the changed state and the metrics on the event loop so writing can happen off it"""
+        tables = None
+        if self.dirty:
+            videos, self.dirty_videos = self.dirty_videos, set()
+            self.dirty = False
+            tables = {'records': list(self.records.values()), 'videos': videos,
+                      'aggregates': self.aggregates.to_frame()}
+        return {'tables': tables, 'metrics': self.metrics()}
+
+    def flush(self, snapshot: Dict[str, Any]):
+        """Write the tables (if anything changed) and the metrics"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tables = snapshot['tables']
+        if tables is not None:
+            df = pd.DataFrame(tables['records'], columns=SIGNAL_COLUMNS)
+            self._refresh_stability(df, tables['videos'])
+            stability = [s for s in self.stability.values() if len(s)]
+            self._write(df, "signals_df.parquet")
+            self._write(tables['aggregates'], "metrics_by_fps.parquet")
+            self._write(pd.concat(stability, ignore_index=True) if stability
+                        else pd.DataFrame(columns=STABILITY_COLUMNS), "signal_stability.parquet")
+
+        metrics = snapshot['metrics']
+        (self.output_dir / "live_metrics.json").write_text(json.dumps(metrics, indent=2))
+        print(f"  rows={metrics['rows']} queue={metrics['queue_depth']} debouncing={metrics['debouncing']} "
+              f"lag p50={metrics['lag_p50_s']:.1f}s p95={metrics['lag_p95_s']:.1f}s "
+              f"failed={metrics['failed']}", flush=True)
+
+    async def flusher(self, stop: asyncio.Event):
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.to_thread(self.flush, self.snapshot())
+
+    async def run(self, once: bool = False):
+        """Watch until interrupted (or, with once, until the current tree is ingested)"""
+        self.queue = asyncio.Queue()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            workers = [asyncio.create_task(self.worker(pool)) for _ in range(self.workers)]
+            tasks = [asyncio.create_task(self.watch(stop)), asyncio.create_task(self.flusher(stop))]
+
+            if once:
+                # Wait for a full scan with nothing left debouncing, then drain (an empty tree exits too)
+                while not stop.is_set():
+                    await asyncio.sleep(self.poll_interval)
+                    if self.scans and not self.pending and self.queue.empty():
+                        await self.queue.join()
+                        stop.set()
+            else:
+                await stop.wait()
+
+            await asyncio.gather(*tasks)
+            await self.queue.join()
+            for w in workers:
+                w.cancel()
+        # --once always leaves the tables it reports, even for an empty tree
+        self.dirty = self.dirty or once
+        self.flush(self.snapshot())
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the analysis tables current while results land")
+    parser.add_argument('--input', default="data/clean_results", help="Results tree to watch")
+    parser.add_argument('--output-dir', default="analysis")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL)
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE)
+    parser.add_argument('--flush-interval', type=float, default=FLUSH_INTERVAL)
+    parser.add_argument('--once', action='store_true', help="Ingest the current tree, write the tables, exit")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("LIVE INGESTION")
+    print("=" * 60)
+    print(f"\nWatching {args.input} (Ctrl-C to stop)\n")
+
+    ingestor = LiveIngestor(args.input, args.output_dir, args.workers, args.poll_interval,
+                            args.debounce, args.flush_interval)
+    asyncio.run(ingestor.run(once=args.once))
+
+    print(f"\n✅ Saved: {args.output_dir}/signals_df.parquet, metrics_by_fps.parquet, "
+          f"signal_stability.parquet ({len(ingestor.records)} rows)")
+    print(f"✅ Saved: {args.output_dir}/live_metrics.json")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,46 +3,254 @@
 Verify completion status of Study 0 and Study 1 signal extraction.
 """
 
+import argparse
+import csv
 import os
+import re
+import sqlite3
 import sys
 import json
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "code"))
+# Study 1 extraction rates (shared with the extraction harness); each clip is also extracted at its native fps
+from process_results import STUDY1_FPS_LEVELS
+STUDY1_BRACKETS = ["120fps", "48-50fps", "60fps"]
+
+# Result files are named {video_id}_{fps}fps.json
+RESULT_NAME = re.compile(r"^(?P<video_id>.+)_(?P<fps>\d+(?:\.\d+)?)fps\.json$")
+
+# Cached scan index, reused across invocations for unchanged files
+INDEX_FILE = ".verify_index.json"
+
+# Fields process_results.extract_metrics relies on
+RESULT_FIELDS = {"video_id": str, "fps": (int, float)}
+SIGNAL_SECTIONS = ["scene_signals", "character_signals", "visual_signals",
+                   "atmosphere_signals", "action_signals", "temporal_signals"]
+
+def validate_result_file(path: str) -> dict:
+    """Parse one result JSON and check it against the schema extract_metrics expects"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return {"valid": False, "error": f"unreadable: {type(e).__name__}"}
+
+    if not isinstance(data, dict):
+        return {"valid": False, "error": "not a JSON object"}
+
+    errors = []
+    for field, types in RESULT_FIELDS.items():
+        if not isinstance(data.get(field), types):
+            errors.append(f"bad {field}")
+    meta = data.get("metadata")
+    if not isinstance(meta, dict) or not meta.get("tier") or not meta.get("dataset"):
+        errors.append("missing metadata.tier/dataset")
+    for section in SIGNAL_SECTIONS:
+        if data.get(section) is not None and not isinstance(data[section], dict):
+            errors.append(f"bad {section}")
+
+    entry = {"valid": not errors, "error": "; ".join(errors) or None}
+    if not errors:
+        entry["video_id"], entry["fps"] = data["video_id"], float(data["fps"])
+    return entry
+
+def _scan(root: Path):
+    """Yield (path, stat) for every file under root, in one scandir walk"""
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path, entry.stat()
+
+class FileIndex:
+    """
+    One scan of the verification trees: path, size, mtime and, for result
+    JSONs, parsed (video_id, fps) plus schema validity. Unchanged files reuse
+    the cached entry from the previous run; new or modified JSONs are
+    validated in parallel.
+    """
+
+    def __init__(self, entries: dict):
+        self.entries = entries
+
+    @classmethod
+    def build(cls, roots: list, index_path: Path = None, workers: int = None,
+              validate_roots: list = None) -> "FileIndex":
+        cached = {}
+        if index_path is not None and index_path.exists():
+            try:
+                with open(index_path) as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                cached = {}
+
+        validate_roots = roots if validate_roots is None else validate_roots
+        entries, todo = {}, []
+        for root in roots:
+            validate = root in validate_roots
+            for path, st in _scan(root):
+                prev = cached.get(path)
+                if prev and prev["size"] == st.st_size and prev["mtime"] == st.st_mtime:
+                    entries[path] = prev
+                    continue
+                entries[path] = {"size": st.st_size, "mtime": st.st_mtime}
+                if validate and path.endswith(".json"):
+                    todo.append(path)
+
+        if len(todo) > 64:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                validated = pool.map(validate_result_file, todo, chunksize=256)
+                for path, entry in zip(todo, validated):
+                    entries[path].update(entry)
+        else:
+            for path in todo:
+                entries[path].update(validate_result_file(path))
+
+        # Canonical file names take precedence over contents for the grid key
+        for path in todo:
+            m = RESULT_NAME.match(os.path.basename(path))
+            if m:
+                entries[path]["video_id"], entries[path]["fps"] = m.group("video_id"), float(m.group("fps"))
+
+        if index_path is not None and (todo or len(entries) != len(cached)):
+            tmp = index_path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(entries, f)
+            tmp.replace(index_path)
+
+        return cls(entries)
+
+    def files(self, root: Path, suffix: str = ".json") -> list:
+        """(path, entry) pairs under root with the given suffix"""
+        prefix = str(root).rstrip(os.sep) + os.sep
+        return [(p, e) for p, e in self.entries.items() if p.startswith(prefix) and p.endswith(suffix)]
+
+    def exists(self, path: Path) -> bool:
+        return str(path) in self.entries
+
+def find_manifest(base_path: Path):
+    """Locate the Study 1 video manifest"""
+    for rel in ["reproduction/study1/video_manifest.csv", "reproduction/video_manifest.csv"]:
+        if (base_path / rel).exists():
+            return base_path / rel
+    return None
+
+def cell(video_id: str, fps: float) -> tuple:
+    """Normalised (video_id, fps) grid key"""
+    return (video_id, round(float(fps), 3))
+
+def expected_grid(manifest_path: Path, fps_levels=STUDY1_FPS_LEVELS, include_native: bool = True) -> dict:
+    """Expected (video_id, fps) cells from the manifest, mapped to their bracket"""
+    grid = {}
+    with open(manifest_path, newline="") as f:
+        for row in csv.DictReader(f):
+            levels = list(fps_levels) + ([float(row["native_fps"])] if include_native else [])
+            for fps in levels:
+                grid[cell(row["video_id"], fps)] = row["bracket"]
+    return grid
+
+def actual_grid(results_path: Path, index: FileIndex = None) -> set:
+    """(video_id, fps) cells that have a valid result file"""
+    index = index or FileIndex.build([results_path])
+    return {cell(e["video_id"], e["fps"]) for _, e in index.files(results_path)
+            if e.get("valid") and "video_id" in e}
+
+def store_cells(store_path: Path) -> list:
+    """(video_id, fps, study_type, dataset) rows from a packed result store index (see code/result_store.py)"""
+    conn = sqlite3.connect(f"file:{store_path / 'index.sqlite'}?mode=ro", uri=True)
+    try:
+        return conn.execute("SELECT video_id, fps, study_type, dataset FROM results").fetchall()
+    finally:
+        conn.close()
+
+def completeness_matrix(expected: dict, actual: set) -> dict:
+    """Missing and unexpected cells plus per-bracket completion counts"""
+    missing = set(expected).difference(actual)
+    unexpected = actual.difference(expected)
+
+    by_bracket = defaultdict(lambda: {"expected": 0, "completed": 0})
+    for key, bracket in expected.items():
+        by_bracket[bracket]["expected"] += 1
+    for key in missing:
+        by_bracket[expected[key]]["completed"] -= 1
+    for stats in by_bracket.values():
+        stats["completed"] += stats["expected"]
+
+    return {
+        "missing": sorted(missing),
+        "unexpected": sorted(unexpected),
+        "by_bracket": dict(by_bracket),
+    }
+
+def write_work_queue(missing: list, expected: dict, path: Path):
+    """Write missing cells as a re-extraction queue (video_id, fps, bracket)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["video_id", "fps", "bracket"])
+        for video_id, fps in missing:
+            writer.writerow([video_id, f"{fps:g}", expected[(video_id, fps)]])
+
+def study_roots(base_path: Path) -> list:
+    """Trees scanned by the verifiers"""
+    return [
+        base_path / "data" / "results",
+        base_path / "experiments" / "analysis" / "study1_results" / "study1",
+        base_path / "experiments" / "analysis" / "output",
+    ]
 
-def verify_study0(base_path: Path) -> dict:
+def verify_study0(base_path: Path, index: FileIndex = None) -> dict:
     """Verify Study 0 signal files."""
     results_path = base_path / "data" / "results"
+    index = index or FileIndex.build([results_path])
 
-    json_files = list(results_path.rglob("*.json"))
+    json_files = index.files(results_path)
+    invalid = sorted(p for p, e in json_files if not e.get("valid"))
 
     # Count by subdirectory
     by_dir = defaultdict(int)
-    for f in json_files:
-        rel = f.relative_to(results_path)
+    for f, _ in json_files:
+        rel = Path(f).relative_to(results_path)
         by_dir[rel.parts[0] if len(rel.parts) > 1 else "root"] += 1
 
+    valid_count = len(json_files) - len(invalid)
+
     return {
         "total_files": len(json_files),
         "expected": 4545,
         "by_directory": dict(by_dir),
-        "status": "PASS" if len(json_files) >= 4500 else "WARN"
+        "invalid": invalid,
+        "status": "PASS" if valid_count >= 4500 and not invalid else "WARN"
     }
 
-def verify_study1(base_path: Path) -> dict:
+def verify_study1(base_path: Path, index: FileIndex = None) -> dict:
     """Verify Study 1 signal files."""
     results_path = base_path / "experiments" / "analysis" / "study1_results" / "study1"
+    index = index or FileIndex.build([results_path])
+
+    manifest_path = find_manifest(base_path)
+    if manifest_path is not None:
+        return verify_study1_grid(results_path, manifest_path, index)
 
     brackets = {}
     total = 0
+    invalid = []
 
-    for bracket in ["120fps", "48-50fps", "60fps"]:
-        bracket_path = results_path / bracket
-        if bracket_path.exists():
-            files = list(bracket_path.rglob("*.json"))
-            brackets[bracket] = len(files)
-            total += len(files)
-        else:
-            brackets[bracket] = 0
+    for bracket in STUDY1_BRACKETS:
+        files = index.files(results_path / bracket)
+        invalid.extend(p for p, e in files if not e.get("valid"))
+        brackets[bracket] = len(files)
+        total += len(files)
 
     expected = {
         "120fps": 152,  # 38 clips × 4 FPS
@@ -50,7 +258,7 @@ def verify_study1(base_path: Path) -> dict:
         "60fps": 582,   # 163 clips × ~3.6 FPS (some timeouts)
     }
 
-    status = "PASS"
+    status = "PASS" if not invalid else "WARN"
     for bracket, count in brackets.items():
         if count < expected.get(bracket, 0) * 0.9:  # Allow 10% tolerance
             status = "WARN"
@@ -60,12 +268,91 @@ def verify_study1(base_path: Path) -> dict:
         "expected": 818,
         "by_bracket": brackets,
         "expected_by_bracket": expected,
+        "invalid": sorted(invalid),
         "status": status
     }
 
-def verify_analysis_outputs(base_path: Path) -> dict:
+def verify_study1_grid(results_path: Path, manifest_path: Path, index: FileIndex = None) -> dict:
+    """Verify Study 1 cell by cell against the manifest x fps grid."""
+    index = index or FileIndex.build([results_path])
+    expected = expected_grid(manifest_path)
+    matrix = completeness_matrix(expected, actual_grid(results_path, index))
+    invalid = sorted(p for p, e in index.files(results_path) if not e.get("valid"))
+
+    brackets = {b: stats["completed"] for b, stats in matrix["by_bracket"].items()}
+    expected_by_bracket = {b: stats["expected"] for b, stats in matrix["by_bracket"].items()}
+
+    status = "PASS" if not invalid and not matrix["unexpected"] else "WARN"
+    for bracket, count in brackets.items():
+        if count < expected_by_bracket[bracket] * 0.9:  # Allow 10% tolerance
+            status = "WARN"
+
+    return {
+        "completed_cells": sum(brackets.values()),
+        "expected": len(expected),
+        "by_bracket": brackets,
+        "expected_by_bracket": expected_by_bracket,
+        "missing_cells": matrix["missing"],
+        "unexpected_cells": matrix["unexpected"],
+        "grid": expected,
+        "invalid": invalid,
+        "status": status
+    }
+
+def verify_store(store_path: Path, base_path: Path) -> dict:
+    """Verify Study 0 and Study 1 from a packed result store's index instead of file trees."""
+    rows = store_cells(store_path)
+    study1 = [(v, f) for v, f, study_type, _ in rows if study_type == "study1"]
+    study0_count = len(rows) - len(study1)
+
+    by_dir = defaultdict(int)
+    for _, _, study_type, dataset in rows:
+        if study_type != "study1":
+            by_dir[dataset or "root"] += 1
+
+    # ResultStore.put rejects records that fail validate_result_file's schema, so every stored cell is valid
+    study0 = {
+        "total_files": study0_count,
+        "expected": 4545,
+        "by_directory": dict(by_dir),
+        "invalid": [],
+        "status": "PASS" if study0_count >= 4500 else "WARN"
+    }
+
+    manifest_path = find_manifest(base_path)
+    if manifest_path is None:
+        return {"Study 0 Signals": study0,
+                "Study 1 Signals": {"status": "WARN", "missing": ["video_manifest.csv"]}}
+
+    expected = expected_grid(manifest_path)
+    matrix = completeness_matrix(expected, {cell(v, f) for v, f in study1})
+    brackets = {b: stats["completed"] for b, stats in matrix["by_bracket"].items()}
+    expected_by_bracket = {b: stats["expected"] for b, stats in matrix["by_bracket"].items()}
+
+    status = "PASS" if not matrix["unexpected"] else "WARN"
+    for bracket, count in brackets.items():
+        if count < expected_by_bracket[bracket] * 0.9:  # Allow 10% tolerance
+            status = "WARN"
+
+    return {
+        "Study 0 Signals": study0,
+        "Study 1 Signals": {
+            "completed_cells": sum(brackets.values()),
+            "expected": len(expected),
+            "by_bracket": brackets,
+            "expected_by_bracket": expected_by_bracket,
+            "missing_cells": matrix["missing"],
+            "unexpected_cells": matrix["unexpected"],
+            "grid": expected,
+            "invalid": [],
+            "status": status
+        },
+    }
+
+def verify_analysis_outputs(base_path: Path, index: FileIndex = None) -> dict:
     """Verify analysis output files exist."""
     output_path = base_path / "experiments" / "analysis" / "output"
+    exists = index.exists if index is not None else Path.exists
 
     required_files = [
         "all_results.csv",
@@ -79,7 +366,7 @@ def verify_analysis_outputs(base_path: Path) -> dict:
     missing = []
 
     for f in required_files:
-        if (output_path / f).exists():
+        if exists(output_path / f):
             found.append(f)
         else:
             missing.append(f)
@@ -141,21 +428,42 @@ def verify_reproduction_materials(base_path: Path) -> dict:
     }
 
 def main():
-    if len(sys.argv) > 1:
-        base_path = Path(sys.argv[1]).resolve()
-    else:
-        base_path = Path.cwd()
+    parser = argparse.ArgumentParser(description="Verify research completion status")
+    parser.add_argument("base_path", nargs="?", default=None)
+    parser.add_argument("--work-queue", default=None,
+                        help="Write missing Study 1 (video_id, fps) cells to this CSV")
+    parser.add_argument("--no-index-cache", action="store_true",
+                        help=f"Rescan and revalidate everything instead of reusing {INDEX_FILE}")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--store", default=None,
+                        help="Verify Study 0/1 from a packed result store (code/result_store.py)")
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path).resolve() if args.base_path else Path.cwd()
 
     print("=" * 60)
     print("Research Completion Verification")
     print("=" * 60)
     print(f"\nBase path: {base_path}\n")
 
+    # One scan (and schema validation) shared by all verifications
+    index_path = None if args.no_index_cache else base_path / INDEX_FILE
+    roots = study_roots(base_path)
+    if args.store:
+        # Only the analysis outputs are on disk; leave the file-tree index cache alone
+        index = FileIndex.build(roots[2:], None, args.workers, validate_roots=[])
+        studies = verify_store(Path(args.store).resolve(), base_path)
+    else:
+        index = FileIndex.build(roots, index_path, args.workers, validate_roots=roots[:2])
+        studies = {
+            "Study 0 Signals": verify_study0(base_path, index),
+            "Study 1 Signals": verify_study1(base_path, index),
+        }
+
     # Run all verifications
     results = {
-        "Study 0 Signals": verify_study0(base_path),
-        "Study 1 Signals": verify_study1(base_path),
-        "Analysis Outputs": verify_analysis_outputs(base_path),
+        **studies,
+        "Analysis Outputs": verify_analysis_outputs(base_path, index),
         "Documentation": verify_documentation(base_path),
         "Reproduction Materials": verify_reproduction_materials(base_path),
     }
@@ -169,12 +477,27 @@ def main():
 
         if "total_files" in result:
             print(f"   Files: {result['total_files']} (expected: {result['expected']})")
+        if "completed_cells" in result:
+            print(f"   Cells: {result['completed_cells']} (expected: {result['expected']})")
 
         if "by_bracket" in result:
             for bracket, count in result["by_bracket"].items():
                 expected = result["expected_by_bracket"].get(bracket, "?")
                 print(f"   - {bracket}: {count}/{expected}")
 
+        if result.get("invalid"):
+            print(f"   Invalid result files: {len(result['invalid'])}")
+            for path in result["invalid"][:10]:
+                print(f"     - {path}")
+
+        if result.get("missing_cells"):
+            print(f"   Missing cells: {len(result['missing_cells'])}")
+
+        if result.get("unexpected_cells"):
+            print(f"   Unexpected cells (not in the manifest x fps grid): {len(result['unexpected_cells'])}")
+            for video_id, fps in result["unexpected_cells"][:10]:
+                print(f"     - {video_id} @ {fps:g} fps")
+
         if "missing" in result and result["missing"]:
             print(f"   Missing: {', '.join(result['missing'])}")
 
@@ -183,6 +506,11 @@ def main():
 
         print()
 
+    study1 = results["Study 1 Signals"]
+    if args.work_queue and "missing_cells" in study1:
+        write_work_queue(study1["missing_cells"], study1["grid"], Path(args.work_queue))
+        print(f"Work queue: {len(study1['missing_cells'])} cells -> {args.work_queue}\n")
+
     # Summary
     print("=" * 60)
     if all_pass:
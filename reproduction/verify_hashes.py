@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Verify the sha256 of every video listed in video_manifest.csv.
+
+Files are hashed in parallel with large memory-mapped reads. Each finished
+file is appended to a progress log, so an interrupted run resumes where it
+stopped (files whose size and mtime are unchanged are not re-hashed).
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+CHUNK_SIZE = 16 * 1024 * 1024
+PROGRESS_FILE = ".sha256_progress.jsonl"
+
+def sha256_file(path: str) -> str:
+    """sha256 of a file via memory-mapped reads in large chunks"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return h.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for offset in range(0, size, CHUNK_SIZE):
+                    h.update(view[offset:offset + CHUNK_SIZE])
+            finally:
+                view.release()
+    return h.hexdigest()
+
+def load_manifest(manifest_path: Path) -> list:
+    with open(manifest_path, newline="") as f:
+        return list(csv.DictReader(f))
+
+def index_videos(video_dir: Path) -> dict:
+    """filename -> path for every file under video_dir (one directory walk)"""
+    found = {}
+    for root, _, files in os.walk(video_dir):
+        for name in files:
+            found.setdefault(name, os.path.join(root, name))
+    return found
+
+def load_progress(progress_path: Path) -> dict:
+    """Completed entries from a previous run, keyed by path"""
+    done = {}
+    if progress_path.exists():
+        with open(progress_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from an interrupted write
+                done[entry["path"]] = entry
+    return done
+
+def verify_hashes(manifest_path: Path, video_dir: Path, progress_path: Path,
+                  workers: int = 4, use_processes: bool = False) -> dict:
+    """Hash all manifest videos, resuming from progress_path; returns a summary"""
+
+    rows = load_manifest(manifest_path)
+    located = index_videos(video_dir)
+    progress = load_progress(progress_path)
+
+    missing, unreadable, todo, results = [], [], [], []
+    for row in rows:
+        path = located.get(row["filename"])
+        if path is None:
+            missing.append(row["filename"])
+            continue
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            unreadable.append(f"{row['filename']}: {e.strerror or e}")
+            continue
+        prev = progress.get(path)
+        if prev and prev["size"] == st.st_size and prev["mtime"] == st.st_mtime:
+            results.append({**prev, "expected": row["sha256"], "resumed": True})
+        else:
+            todo.append((row, path, st))
+
+    hashed, hashed_bytes = 0, 0     # files whose hash completed
+    start = time.perf_counter()
+
+    progress_path.parent.mkdir(parents=True, exist_ok=True)
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool, open(progress_path, "a") as log:
+        futures = {pool.submit(sha256_file, path): (row, path, st) for row, path, st in todo}
+        for i, future in enumerate(as_completed(futures), 1):
+            row, path, st = futures[future]
+            try:
+                digest = future.result()
+            except OSError as e:
+                # One unreadable or vanished file is a failure, not the end of the run
+                unreadable.append(f"{row['filename']}: {e.strerror or e}")
+                print(f"  [{i}/{len(todo)}] {row['filename']} (unreadable)", flush=True)
+                continue
+            entry = {"path": path, "size": st.st_size, "mtime": st.st_mtime, "sha256": digest}
+            log.write(json.dumps(entry) + "\n")
+            log.flush()
+            hashed += 1
+            hashed_bytes += st.st_size
+            results.append({**entry, "expected": row["sha256"], "resumed": False})
+            print(f"  [{i}/{len(todo)}] {row['filename']}", flush=True)
+
+    elapsed = time.perf_counter() - start
+    mismatched = [Path(r["path"]).name for r in results if r["sha256"] != r["expected"]]
+
+    return {
+        "total": len(rows),
+        "verified": len(results) - len(mismatched),
+        "resumed": sum(r["resumed"] for r in results),
+        "hashed": hashed,
+        "mismatched": sorted(mismatched),
+        "missing": sorted(missing),
+        "unreadable": sorted(unreadable),
+        "elapsed_s": elapsed,
+        "mb_per_s": hashed_bytes / 1e6 / elapsed if elapsed > 0 else 0.0,
+        "status": "PASS" if not mismatched and not missing and not unreadable else "FAIL",
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify video_manifest.csv sha256 checksums")
+    parser.add_argument("--manifest", default="reproduction/video_manifest.csv")
+    parser.add_argument("--video-dir", default="data/videos")
+    parser.add_argument("--progress", default=PROGRESS_FILE,
+                        help=f"Progress log (default: ./{PROGRESS_FILE})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads")
+    args = parser.parse_args()
+
+    video_dir = Path(args.video_dir)
+    progress_path = Path(args.progress)
+
+    print("=" * 60)
+    print("Manifest Checksum Verification")
+    print("=" * 60)
+    print(f"\nManifest: {args.manifest}")
+    print(f"Videos:   {video_dir}\n")
+
+    result = verify_hashes(Path(args.manifest), video_dir, progress_path, args.workers, args.processes)
+
+    icon = "✅" if result["status"] == "PASS" else "❌"
+    print(f"\n{icon} Checksums: {result['status']}")
+    print(f"   Verified: {result['verified']}/{result['total']} ({result['resumed']} from previous run)")
+    print(f"   Hashed:   {result['hashed']} files in {result['elapsed_s']:.1f}s ({result['mb_per_s']:.1f} MB/s)")
+    if result["mismatched"]:
+        print(f"   Mismatched: {', '.join(result['mismatched'])}")
+    if result["missing"]:
+        print(f"   Missing: {len(result['missing'])} files")
+        for name in result["missing"]:
+            print(f"     - {name}")
+    if result["unreadable"]:
+        print(f"   Unreadable: {len(result['unreadable'])} files")
+        for error in result["unreadable"]:
+            print(f"     - {error}")
+
+    return 0 if result["status"] == "PASS" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())